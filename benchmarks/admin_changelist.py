@@ -0,0 +1,101 @@
+"""Admin changelist latency on a large table.
+
+Usage (from the repository root):
+
+    python benchmarks/admin_changelist.py --rows 5000000 --target-ms 1000
+
+Missing posts and comments are bulk-inserted into the configured
+database before measuring, so run it against a throwaway database.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'blogicum'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.utils.timezone import now  # noqa: E402
+
+from blog.models import Category, Comment, Post  # noqa: E402
+
+User = get_user_model()
+
+BATCH_SIZE = 10_000
+
+URLS = (
+    '/admin/blog/post/',
+    '/admin/blog/post/?p=100',
+    '/admin/blog/post/?pub_date__year={year}',
+    '/admin/blog/post/?category__id__exact={category}',
+    '/admin/blog/comment/',
+    '/admin/blog/comment/?created_at__year={year}',
+)
+
+
+def populate(model, rows, make):
+    missing = rows - model.objects.count()
+    while missing > 0:
+        size = min(BATCH_SIZE, missing)
+        model.objects.bulk_create(make(i) for i in range(size))
+        missing -= size
+
+
+def measure(client, url, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(url)
+        timings.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, (url, response.status_code)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5_000_000)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--target-ms', type=float, default=1000)
+    args = parser.parse_args()
+
+    settings.DEBUG = False
+    settings.SERVER_TIMING_SAMPLE_RATE = 0
+    settings.ALLOWED_HOSTS = ['testserver']
+    admin, _ = User.objects.get_or_create(
+        username='bench-admin',
+        defaults={'is_staff': True, 'is_superuser': True})
+    category, _ = Category.objects.get_or_create(
+        slug='bench', defaults={'title': 'bench', 'description': 'bench'})
+    populate(Post, args.rows, lambda i: Post(
+        title=f'post {i}', text='text', pub_date=now(),
+        author=admin, category=category))
+    post = Post.objects.first()
+    populate(Comment, args.rows, lambda i: Comment(
+        text=f'comment {i}', author=admin, post=post))
+
+    client = Client()
+    client.force_login(admin)
+    failed = False
+    for url in URLS:
+        url = url.format(year=now().year, category=category.pk)
+        measure(client, url, 1)
+        timings = measure(client, url, args.repeat)
+        p50 = statistics.median(timings)
+        worst = max(timings)
+        status = 'ok' if p50 <= args.target_ms else 'SLOW'
+        failed |= status != 'ok'
+        print(f'{status:4} p50={p50:8.1f}ms max={worst:8.1f}ms {url}')
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
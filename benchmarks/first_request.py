@@ -0,0 +1,82 @@
+"""Boot time and first-request latency of a WSGI worker, with and
+without the warm-up of core.warmup.
+
+Usage (from the repository root, against a generated dataset):
+
+    python benchmarks/first_request.py --runs 10 --url / --url /pages/about/
+
+Every run boots the application in a fresh interpreter with the
+production settings, then requests every URL twice through the WSGI
+application.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'blogicum'
+
+WORKER_CODE = '''
+import io, json, sys, time
+from django.conf import settings
+settings.WARMUP_ON_BOOT = {warm_up}
+settings.ALLOWED_HOSTS = ['testserver']
+settings.SERVER_TIMING_SAMPLE_RATE = 0
+start = time.perf_counter()
+from blogicum.wsgi import application
+result = {{'boot_ms': (time.perf_counter() - start) * 1000}}
+
+
+def request(url):
+    path, _, query = url.partition('?')
+    environ = {{
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': query,
+        'SERVER_NAME': 'testserver', 'SERVER_PORT': '80',
+        'HTTP_HOST': 'testserver', 'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr,
+    }}
+    start = time.perf_counter()
+    body = b''.join(application(environ, lambda status, headers: None))
+    return (time.perf_counter() - start) * 1000, len(body)
+
+
+for url in {urls!r}:
+    result[f'first {{url}}'] = request(url)[0]
+    result[f'second {{url}}'] = request(url)[0]
+print(json.dumps(result))
+'''
+
+
+def run_worker(urls, warm_up):
+    code = WORKER_CODE.format(urls=urls, warm_up=warm_up)
+    output = subprocess.run(
+        [sys.executable, '-c', code], cwd=PROJECT_DIR,
+        env={**os.environ,
+             'DJANGO_SETTINGS_MODULE': 'blogicum.settings_production'},
+        capture_output=True, text=True, check=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--url', action='append', dest='urls')
+    args = parser.parse_args()
+    urls = args.urls or ['/', '/pages/about/']
+
+    results = {}
+    for warm_up in (False, True):
+        runs = [run_worker(urls, warm_up) for _ in range(args.runs)]
+        results[warm_up] = {key: statistics.median(run[key] for run in runs)
+                            for key in runs[0]}
+    print(f"{'median ms':<40} {'cold':>10} {'warm-up':>10}")
+    for key in results[False]:
+        print(f'{key:<40} {results[False][key]:>10.1f} '
+              f'{results[True][key]:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+"""Latency, query count and response size of every project route.
+
+Usage (from the repository root, against a generated dataset):
+
+    python blogicum/manage.py generate_dataset
+    python benchmarks/http_routes.py --output baseline.json
+    python benchmarks/http_routes.py --compare baseline.json
+
+Every route of blog/urls.py, pages/urls.py and user/urls.py is
+requested by an anonymous and by a logged-in user, through the Django
+test client and through a real WSGI server.
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import HTTPRedirectHandler, Request, build_opener
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'blogicum'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+
+from django.core.wsgi import get_wsgi_application  # noqa: E402
+
+application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.models import F  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.urls import URLPattern, reverse  # noqa: E402
+
+from blog import urls as blog_urls  # noqa: E402
+from blog.models import Comment, Post  # noqa: E402
+from pages import urls as pages_urls  # noqa: E402
+from user import urls as user_urls  # noqa: E402
+
+URL_MODULES = (blog_urls, pages_urls, user_urls)
+
+QUERY_COUNT_HEADER = 'X-Query-Count'
+
+
+def route_kwargs():
+    """URL arguments taken from the database: a published post, its
+    category, author and a comment of the author under it."""
+    posts = Post.objects.published().category_is_published().pub_date()
+    comment = (Comment.objects
+               .filter(post__in=posts, author=F('post__author'),
+                       author__username__regex=r'^[-a-zA-Z0-9_]+$')
+               .select_related('post__author', 'post__category')
+               .order_by('pk').first())
+    if comment is None:
+        sys.exit('No published post commented by its author, '
+                 'run generate_dataset.')
+    post = comment.post
+    return post.author, {
+        'post_id': post.pk,
+        'category_slug': post.category.slug,
+        'username': post.author.username,
+        'comment_id': comment.pk,
+        'model_name': 'location',
+    }
+
+
+def routes(kwargs):
+    for module in URL_MODULES:
+        for pattern in module.urlpatterns:
+            if not isinstance(pattern, URLPattern):
+                continue
+            name = f'{module.app_name}:{pattern.name}'
+            names = pattern.pattern.regex.groupindex
+            missing = set(names) - set(kwargs)
+            if missing:
+                sys.exit(f'No benchmark value for {missing} of {name}.')
+            url = reverse(name, kwargs={key: kwargs[key] for key in names})
+            yield name, url
+            if pattern.name in ('index', 'category_posts', 'profile'):
+                yield f'{name}?page=2', f'{url}?page=2'
+
+
+def counting(application):
+    """WSGI wrapper, which reports the number of queries in a header."""
+    def wrapped(environ, start_response):
+        queries = []
+
+        def count(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        def start(status, headers, exc_info=None):
+            headers.append((QUERY_COUNT_HEADER, str(len(queries))))
+            return start_response(status, headers, exc_info)
+
+        with connection.execute_wrapper(count):
+            return application(environ, start)
+    return wrapped
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class NoRedirectHandler(HTTPRedirectHandler):
+    """Measure redirects themselves, as the test client does."""
+
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class ClientRunner:
+    name = 'client'
+
+    def __init__(self, user):
+        self.client = Client()
+        if user is not None:
+            self.client.force_login(user)
+
+    def get(self, url):
+        queries = []
+
+        def count(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count):
+            response = self.client.get(url)
+        return response.status_code, len(response.content), len(queries)
+
+
+class WSGIRunner:
+    name = 'wsgi'
+
+    def __init__(self, user):
+        self.server = make_server('127.0.0.1', 0,
+                                  counting(application),
+                                  handler_class=QuietHandler)
+        threading.Thread(target=self.server.serve_forever,
+                         daemon=True).start()
+        self.base = f'http://127.0.0.1:{self.server.server_port}'
+        self.opener = build_opener(NoRedirectHandler)
+        self.headers = {}
+        if user is not None:
+            client = Client()
+            client.force_login(user)
+            cookie = client.cookies[settings.SESSION_COOKIE_NAME]
+            self.headers['Cookie'] = (
+                f'{settings.SESSION_COOKIE_NAME}={cookie.value}')
+
+    def get(self, url):
+        request = Request(self.base + url, headers=self.headers)
+        try:
+            response = self.opener.open(request)
+        except HTTPError as error:
+            response = error
+        with response:
+            body = response.read()
+            return (response.status, len(body),
+                    int(response.headers.get(QUERY_COUNT_HEADER, 0)))
+
+
+def measure(runner, url, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        status, size, queries = runner.get(url)
+        timings.append((time.perf_counter() - start) * 1000)
+    cuts = statistics.quantiles(timings, n=100, method='inclusive')
+    return {
+        'status': status,
+        'p50_ms': round(cuts[49], 2),
+        'p95_ms': round(cuts[94], 2),
+        'p99_ms': round(cuts[98], 2),
+        'queries': queries,
+        'bytes': size,
+    }
+
+
+def run(args):
+    user, kwargs = route_kwargs()
+    runners = {'client': ClientRunner, 'wsgi': WSGIRunner}
+    modes = list(runners) if args.mode == 'all' else [args.mode]
+    results = {}
+    for mode in modes:
+        for role, role_user in (('anonymous', None), ('user', user)):
+            runner = runners[mode](role_user)
+            for name, url in routes(kwargs):
+                runner.get(url)
+                key = f'{mode} {role} {name}'
+                results[key] = measure(runner, url, args.repeat)
+                print(key, json.dumps(results[key]))
+    return results
+
+
+def compare(results, baseline, threshold, min_delta):
+    """Return descriptions of routes, which became slower by more than
+    `threshold` (and `min_delta` ms), started making more queries or
+    changed status."""
+    regressions = []
+    for key, old in baseline.items():
+        new = results.get(key)
+        if new is None:
+            continue
+        if new['status'] != old['status']:
+            regressions.append(
+                f'{key}: status {old["status"]} -> {new["status"]}')
+        if new['queries'] > old['queries']:
+            regressions.append(
+                f'{key}: queries {old["queries"]} -> {new["queries"]}')
+        for metric in ('p50_ms', 'p95_ms'):
+            if (new[metric] > old[metric] * (1 + threshold)
+                    and new[metric] - old[metric] > min_delta):
+                regressions.append(
+                    f'{key}: {metric} {old[metric]} -> {new[metric]}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mode', choices=('client', 'wsgi', 'all'),
+                        default='all')
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--output', help='Write results as JSON here.')
+    parser.add_argument('--compare', help='Baseline JSON to compare with.')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Allowed relative latency growth.')
+    parser.add_argument('--min-delta-ms', type=float, default=2,
+                        help='Latency growth below this is not reported.')
+    args = parser.parse_args()
+
+    settings.DEBUG = False
+    settings.SERVER_TIMING_SAMPLE_RATE = 0
+    settings.ALLOWED_HOSTS = ['testserver', '127.0.0.1']
+    logging.getLogger('django.request').setLevel(logging.ERROR)
+    results = run(args)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(
+            results, baseline, args.threshold, args.min_delta_ms)
+        for regression in regressions:
+            print('REGRESSION', regression)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
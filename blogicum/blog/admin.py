@@ -1,10 +1,16 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import Group, User
 from django.db import models
+from django.db.models import Count
 from django.forms import Textarea
 
+from blog.forms import PostActionForm
 from blog.models import Category, Location, Post, Comment
+from core.admin import (BoundedRelatedFieldListFilter,
+                        ChunkedActionsMixin,
+                        LargeTableAdminMixin,
+                        StreamingExportMixin)
 
 admin.site.empty_value_display = 'Не задано'
 
@@ -12,6 +18,7 @@ admin.site.empty_value_display = 'Не задано'
 class PostInLine(admin.StackedInline):
     model = Post
     extra = 0
+    autocomplete_fields = ('author', 'location')
 
 
 @admin.register(Category)
@@ -23,10 +30,21 @@ class CategoryAdmin(admin.ModelAdmin):
         'title',
         'description',
     )
+    search_fields = ('^title',)
+
+
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    list_display = (
+        'name',
+        'is_published',
+    )
+    search_fields = ('^name',)
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(ChunkedActionsMixin, StreamingExportMixin,
+                LargeTableAdminMixin, admin.ModelAdmin):
     formfield_overrides = {
         models.TextField: {'widget': Textarea(attrs={'rows': 5, 'cols': 50})},
     }
@@ -45,33 +63,94 @@ class PostAdmin(admin.ModelAdmin):
         'is_published',
     )
     search_fields = ('title', 'text', 'category')
-    list_filter = ('category',)
+    list_filter = (('category', BoundedRelatedFieldListFilter),)
     list_display_links = ('title',)
+    list_select_related = ('author', 'category', 'location')
+    date_hierarchy = 'pub_date'
+    action_form = PostActionForm
+    actions = ChunkedActionsMixin.actions + (
+        'move_to_category',
+        'clear_location',
+    ) + StreamingExportMixin.actions
+    export_fields = (
+        'id',
+        'title',
+        'text',
+        'pub_date',
+        'is_published',
+        'created_at',
+        'author__username',
+        'category__slug',
+        'location__name',
+    )
+    autocomplete_fields = ('category', 'location', 'author')
+
+    @admin.action(description='Перенести выбранные в категорию')
+    def move_to_category(self, request, queryset):
+        form = self.action_form(request.POST)
+        form.fields['action'].choices = self.get_action_choices(request)
+        if not form.is_valid() or not form.cleaned_data['category']:
+            self.message_user(request, 'Выберите категорию.', messages.ERROR)
+            return
+        self.chunked_update(request, queryset,
+                            category=form.cleaned_data['category'])
+
+    @admin.action(description='Убрать местоположение у выбранных')
+    def clear_location(self, request, queryset):
+        self.chunked_update(request, queryset, location=None)
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(ChunkedActionsMixin, StreamingExportMixin,
+                   LargeTableAdminMixin, admin.ModelAdmin):
     list_display = (
         'author',
         'text',
         'post',
         'created_at'
     )
+    list_select_related = ('author', 'post')
+    date_hierarchy = 'created_at'
+    actions = ChunkedActionsMixin.actions + StreamingExportMixin.actions
+    export_fields = (
+        'id',
+        'text',
+        'is_published',
+        'created_at',
+        'author__username',
+        'post_id',
+        'post__title',
+    )
 
 
-class AdminUser(BaseUserAdmin):
+class AdminUser(StreamingExportMixin, BaseUserAdmin):
     list_display = ('username', 'email', 'password', 'is_staff',
                     'posts_count',)
-    search_fields = ('email',)
+    search_fields = ('^username', 'email')
     ordering = ('username',)
     list_display_links = ('username',)
+    export_fields = (
+        'id',
+        'username',
+        'email',
+        'first_name',
+        'last_name',
+        'is_staff',
+        'is_active',
+        'date_joined',
+        'last_login',
+    )
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            posts_count=Count('posts'))
 
-    @admin.display(description='Кол-во постов у пользователя')
+    @admin.display(description='Кол-во постов у пользователя',
+                   ordering='posts_count')
     def posts_count(self, obj):
-        return obj.posts.count()
+        return obj.posts_count
 
 
 admin.site.unregister(Group)
 admin.site.unregister(User)
-admin.site.register(Location)
 admin.site.register(User, AdminUser)
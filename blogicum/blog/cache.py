@@ -0,0 +1,262 @@
+"""Caches of rendered post cards, long post bodies and lookups of
+missing objects.
+
+A card is cached under the versions of the post, its author, category
+and location. Signals in blog/signals.py replace a version when the
+object changes, which makes every card showing it stale. Versions are
+kept in the default cache, so it has to be shared by the workers
+(e.g. Memcached or Redis) for the invalidation to reach all of them.
+
+Lookups of posts, categories and users by the values in URLs go
+through an ExistenceFilter of the values in every worker, so requests
+for random values are answered with 404 without a query. The filter is
+a Bloom filter built from the table and updated from a log of the
+saved values in the lookups cache. Values in the filter are looked up
+without reading the cache. Others are looked up only if they were
+saved lately, which is marked in the lookups cache with EXISTS until
+every worker applies them from the log.
+"""
+import hashlib
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.http import Http404
+from django.template.defaultfilters import linebreaksbr
+from django.utils.safestring import mark_safe
+
+from blog.constants import (BODY_HTML_CACHE_MIN_LENGTH,
+                            BODY_HTML_CACHE_TIMEOUT,
+                            EXISTENCE_FILTER_ERROR_RATE,
+                            EXISTENCE_FILTER_MIN_CAPACITY,
+                            EXISTENCE_FILTER_REBUILD_INTERVAL,
+                            EXISTENCE_LOG_POLL_INTERVAL, EXISTS_CACHE_TIMEOUT,
+                            LOOKUPS_CACHE, POST_CARD_CACHE_TIMEOUT)
+from blog.models import Category, Post
+from core.bloom import BloomFilter
+
+POST_CARD_TEMPLATE = 'includes/post_card.html'
+
+EXISTS = 'exists'
+# Logged instead of a value, which has no spaces.
+REBUILD = ' rebuild'
+
+# Fields looked up by the views with lookup_or_404().
+LOOKUP_FIELDS = {Post: 'pk', Category: 'slug', get_user_model(): 'username'}
+
+
+def version_key(model, pk):
+    return f'version:{model._meta.label_lower}:{pk}'
+
+
+def new_version():
+    return uuid.uuid4().hex[:12]
+
+
+def get_versions(objects):
+    """Return the versions of `objects`, creating missing ones."""
+    keys = [version_key(type(obj), obj.pk) for obj in objects]
+    versions = cache.get_many(keys)
+    missing = {key: new_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def bump_versions(model, pks):
+    cache.set_many({version_key(model, pk): new_version() for pk in pks},
+                   None)
+
+
+def related_objects(post):
+    return [obj for obj in (post, post.author, post.category, post.location)
+            if obj is not None]
+
+
+def post_card_key(post, versions):
+    """Key of the card of `post` under the `versions` of its related
+    objects. Cards show nothing specific to the viewer."""
+    # created_at tells apart rows, which reused the pk of a deleted one.
+    return ':'.join([
+        'post_card', str(post.pk), str(post.created_at.timestamp()),
+        *versions,
+        str(int(post.category is not None and post.category.is_published)),
+        str(int(post.location is not None and post.location.is_published)),
+        str(getattr(post, 'comment_count', '')),
+    ])
+
+
+def render_post_cards(context, posts):
+    """HTML of the cards of `posts` with two reads of the cache for the
+    whole page: the versions and then the cards."""
+    posts = list(posts)
+    related = [related_objects(post) for post in posts]
+    versions = iter(get_versions(
+        [obj for objects in related for obj in objects]))
+    keys = [post_card_key(post, [next(versions) for _ in objects])
+            for post, objects in zip(posts, related)]
+    cards = cache.get_many(keys)
+    rendered = {}
+    for post, key in zip(posts, keys):
+        if key not in cards:
+            template = context.template.engine.get_template(
+                POST_CARD_TEMPLATE)
+            with context.push(post=post):
+                rendered[key] = str(template.render(context))
+    if rendered:
+        cache.set_many(rendered, POST_CARD_CACHE_TIMEOUT)
+        cards.update(rendered)
+    return [cards[key] for key in keys]
+
+
+def body_key(text):
+    return f'body_html:{hashlib.sha1(text.encode()).hexdigest()}'
+
+
+def cache_body_html(text):
+    """Render `text` like the linebreaksbr filter and cache the result
+    under the hash of the text, so equal texts share one entry."""
+    html = str(linebreaksbr(text, autoescape=True))
+    cache.set(body_key(text), html, BODY_HTML_CACHE_TIMEOUT)
+    return html
+
+
+def body_html(text):
+    if len(text) < BODY_HTML_CACHE_MIN_LENGTH:
+        return linebreaksbr(text, autoescape=True)
+    html = cache.get(body_key(text))
+    if html is None:
+        html = cache_body_html(text)
+    return mark_safe(html)
+
+
+class ExistenceFilter:
+    """Values of `field` of all rows of `model`, known to this worker.
+
+    The filter is built from the table at boot by the warm-up, or else by
+    the first lookup. A saved value is appended to the log in the lookups
+    cache after the commit, and the worker applies the new entries of the
+    log at most every EXISTENCE_LOG_POLL_INTERVAL seconds; meanwhile the
+    value is found by its EXISTS entry. Rows written in bulk are logged
+    as REBUILD, and the filter is built again, like when the log is lost
+    or the filter is full, but at most every
+    EXISTENCE_FILTER_REBUILD_INTERVAL seconds. Deleted values stay in the
+    filter and are looked up.
+    """
+
+    def __init__(self, model, field):
+        self.model = model
+        self.field = field
+        self.log_key = f'existing:{model._meta.label_lower}:{field}'
+        # (Bloom filter, applied entries of the log).
+        self.state = None
+        self.built_at = None
+        self.polled_at = None
+
+    def entry_key(self, number):
+        return f'{self.log_key}:{number}'
+
+    def log(self, value):
+        lookups = caches[LOOKUPS_CACHE]
+        try:
+            number = lookups.incr(self.log_key)
+        except ValueError:
+            # The log is lost, the filters are built again anyway.
+            return
+        lookups.set(self.entry_key(number), str(value), EXISTS_CACHE_TIMEOUT)
+
+    def reset(self):
+        """Make every worker build the filter again, e.g. after rows were
+        written in bulk without post_save."""
+        self.log(REBUILD)
+
+    def build(self):
+        self.built_at = self.polled_at = time.monotonic()
+        lookups = caches[LOOKUPS_CACHE]
+        lookups.add(self.log_key, 0, None)
+        # Read before the table, so the entries logged meanwhile are
+        # applied later, even if the rows are already in the filter.
+        applied = lookups.get(self.log_key, 0)
+        values = self.model._base_manager.values_list(self.field, flat=True)
+        bloom = BloomFilter(
+            max(2 * values.count(), EXISTENCE_FILTER_MIN_CAPACITY),
+            EXISTENCE_FILTER_ERROR_RATE)
+        # Streamed, so a large table isn't held in memory at once.
+        for value in values.iterator():
+            bloom.add(value)
+        self.state = (bloom, applied)
+
+    def rebuild(self):
+        if (self.built_at is None or time.monotonic() - self.built_at
+                >= EXISTENCE_FILTER_REBUILD_INTERVAL):
+            self.build()
+
+    def update(self):
+        if self.state is None:
+            return self.rebuild()
+        self.polled_at = time.monotonic()
+        bloom, applied = self.state
+        logged = caches[LOOKUPS_CACHE].get(self.log_key)
+        if logged is None or logged < applied or bloom.full:
+            return self.rebuild()
+        if logged == applied:
+            return
+        keys = [self.entry_key(number)
+                for number in range(applied + 1, logged + 1)]
+        values = caches[LOOKUPS_CACHE].get_many(keys)
+        # Entries missing were evicted, or not written yet by the worker,
+        # which saved them.
+        if len(values) < len(keys) or REBUILD in values.values():
+            return self.rebuild()
+        for value in values.values():
+            bloom.add(value)
+        self.state = (bloom, logged)
+
+    def __contains__(self, value):
+        """False only if `value` is surely missing. Values in the filter
+        are answered without reading the log."""
+        value = str(value)
+        if self.state is not None and value in self.state[0]:
+            return True
+        if (self.polled_at is None or time.monotonic() - self.polled_at
+                >= EXISTENCE_LOG_POLL_INTERVAL):
+            self.update()
+        return self.state is None or value in self.state[0]
+
+
+existence_filters = {}
+
+
+def existence_filter(model, field):
+    key = (model, field)
+    if key not in existence_filters:
+        existence_filters[key] = ExistenceFilter(model, field)
+    return existence_filters[key]
+
+
+def build_existence_filters():
+    """Warm-up primer, so no request waits for the filters."""
+    for model, field in LOOKUP_FIELDS.items():
+        existence_filter(model, field).build()
+
+
+def lookup_key(model, field, value):
+    digest = hashlib.md5(str(value).encode()).hexdigest()
+    return f'lookup:{model._meta.label_lower}:{field}:{digest}'
+
+
+def lookup_or_404(model, field, value, lookup):
+    """Return `lookup()` unless `value` of `field` is surely missing:
+    it isn't in the existence filter and wasn't saved lately."""
+    if value not in existence_filter(model, field) and caches[
+            LOOKUPS_CACHE].get(lookup_key(model, field, value)) != EXISTS:
+        raise Http404()
+    return lookup()
+
+
+def mark_existing(model, field, values):
+    caches[LOOKUPS_CACHE].set_many(
+        {lookup_key(model, field, value): EXISTS for value in values},
+        EXISTS_CACHE_TIMEOUT)
@@ -0,0 +1,136 @@
+"""Validators of the blog pages for conditional GET.
+
+Every model shown on the pages has a version and the time of its last
+change in the default cache. Signals in blog/signals.py replace them
+when an object is saved, deleted or bulk updated, so validators cost
+no queries. When the cache is empty the time is seeded from the
+indexed MAX(updated_at) of the table.
+
+A scheduled post appears on the pages without any write, so the time
+of the next publication is cached too. Once it has passed, the state
+of Post is replaced as if the post was changed at its pub_date.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from blog.cache import new_version
+from blog.models import Category, Comment, Location, Post
+from core.utils import first_values
+
+PAGE_MODELS = (Post, Comment, Category, Location, get_user_model())
+SCHEDULED_KEY = 'scheduled:blog.post'
+
+
+def state_key(model):
+    return f'changed:{model._meta.label_lower}'
+
+
+def mark_changed(model):
+    cache.set(state_key(model), (new_version(), timezone.now()), None)
+    if model is Post:
+        cache.delete(SCHEDULED_KEY)
+
+
+def updated_at_field(model):
+    return next((field for field in model._meta.concrete_fields
+                 if field.name == 'updated_at'), None)
+
+
+def read_states(models, scheduled, now):
+    """Time of the last change of every model of `models`, not later
+    than now, and the next pub_date after now when `scheduled`, read
+    with one query. Models without `updated_at` are considered changed
+    now."""
+    fields = [updated_at_field(model) for model in models]
+    querysets = [
+        field.model._base_manager.order_by(f'-{field.name}').values_list(
+            field.name) for field in fields if field is not None]
+    if scheduled:
+        querysets.append(Post._base_manager.filter(
+            pub_date__gt=now).order_by('pub_date').values_list('pub_date'))
+    values = (first_values(querysets, router.db_for_read(Post))
+              if querysets else [])
+    changed = []
+    for field in fields:
+        value = values.pop(0) if field is not None else None
+        changed.append(min(value or now, now))
+    return changed, values[0] if scheduled else None
+
+
+def page_states(request):
+    """(version, changed at) of every model of PAGE_MODELS, read once
+    per request."""
+    if hasattr(request, 'page_states'):
+        return request.page_states
+    now = timezone.now()
+    keys = [state_key(model) for model in PAGE_MODELS]
+    states = cache.get_many([*keys, SCHEDULED_KEY])
+    missing = [model for model, key in zip(PAGE_MODELS, keys)
+               if key not in states]
+    # False when no post is scheduled.
+    published = states.pop(SCHEDULED_KEY, None)
+    passed = bool(published) and published <= now
+    if missing or published is None or passed:
+        scheduled = published is None or passed
+        changed, next_published = read_states(missing, scheduled, now)
+        seeded = {state_key(model): (new_version(), changed_at)
+                  for model, changed_at in zip(missing, changed)}
+        if passed:
+            # The scheduled post appeared on the pages at its pub_date.
+            seeded[state_key(Post)] = (new_version(), published)
+        if scheduled:
+            seeded[SCHEDULED_KEY] = next_published or False
+        cache.set_many(seeded, None)
+        states.update(seeded)
+    request.page_states = [states[key] for key in keys]
+    return request.page_states
+
+
+def page_etag(request, *args, **kwargs):
+    parts = [request.get_full_path()]
+    if not request.shared_page:
+        # Pages differ per user and embed a CSRF token bound to the cookie.
+        parts += [str(request.user.pk),
+                  request.COOKIES.get(settings.CSRF_COOKIE_NAME, '')]
+    parts.extend(version for version, _ in page_states(request))
+    return hashlib.md5('\n'.join(parts).encode()).hexdigest()
+
+
+def page_last_modified(request, *args, **kwargs):
+    return max(changed_at for _, changed_at in page_states(request))
+
+
+def conditional_page(shared=False):
+    """Answer 304 Not Modified to a request with current ETag or
+    Last-Modified before the view runs. Responses must be revalidated,
+    so browsers don't show a stale page guessing its freshness from
+    Last-Modified.
+
+    `shared` pages are the same for every user when HOLE_PUNCHING is
+    on, so their ETag doesn't depend on the user and shared caches can
+    revalidate them. A view marks a page, which is shown only to some
+    users, with `request.private_page` before dispatch.
+    """
+    def decorator(view):
+        conditional_view = condition(
+            etag_func=page_etag,
+            last_modified_func=page_last_modified)(view)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            request.shared_page = (
+                shared and settings.HOLE_PUNCHING
+                and not getattr(request, 'private_page', False))
+            response = conditional_view(request, *args, **kwargs)
+            patch_cache_control(response, no_cache=True)
+            return response
+        return wrapper
+    return decorator
@@ -5,3 +5,33 @@ STRING_MAX_LENGTH = 256
 TITLE_MAX_LENGTH = 30
 
 PAGINATION_VALUE = 10
+
+FEED_ORDERING = ('-pub_date', '-id')
+
+FEED_FRAGMENT_MAX_AGE = 60
+
+AUTOCOMPLETE_LIMIT = 20
+
+COMMENTS_PER_PAGE = 20
+
+POST_CARD_CACHE_TIMEOUT = 60 * 60
+
+EXCERPT_WORDS = 10
+
+BODY_HTML_CACHE_TIMEOUT = 7 * 24 * 60 * 60
+# Shorter texts are rendered faster than they are fetched from the cache.
+BODY_HTML_CACHE_MIN_LENGTH = 4096
+
+# Saved values are found by their entries in the lookups cache until
+# every worker applies them from the log of the existence filters.
+EXISTS_CACHE_TIMEOUT = 10 * 60
+EXISTENCE_LOG_POLL_INTERVAL = 5
+# A build reads the whole table, so a worker repeats it at most this
+# often; until then rows written in bulk are answered with 404.
+EXISTENCE_FILTER_REBUILD_INTERVAL = 60
+EXISTENCE_FILTER_ERROR_RATE = 0.01
+# Tiny filters err more often than their error rate and fill up fast.
+EXISTENCE_FILTER_MIN_CAPACITY = 1024
+# Alias of the cache of lookups, kept apart from the default cache, so
+# bots requesting random URLs don't evict post cards and page states.
+LOOKUPS_CACHE = 'lookups'
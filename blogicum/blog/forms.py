@@ -1,7 +1,9 @@
 from django import forms
+from django.contrib.admin.helpers import ActionForm
 from django.contrib.auth import get_user_model
 
-from blog.models import Post, Comment
+from blog.models import Category, Post, Comment
+from blog.widgets import AutocompleteSelect
 
 User = get_user_model()
 
@@ -13,7 +15,10 @@ class PostForm(forms.ModelForm):
         widgets = {
             'pub_date': forms.DateTimeInput(format='%Y-%m-%d %H:%M', attrs={
                 'type': 'datetime-local',
-            })}
+            }),
+            'category': AutocompleteSelect('category'),
+            'location': AutocompleteSelect('location'),
+        }
 
 
 class CommentForm(forms.ModelForm):
@@ -34,3 +39,11 @@ class UserForm(forms.ModelForm):
             'password': forms.PasswordInput()
 
         }
+
+
+class PostActionForm(ActionForm):
+    category = forms.ModelChoiceField(
+        queryset=Category.objects.all(),
+        required=False,
+        label='Категория'
+    )
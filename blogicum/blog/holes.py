@@ -0,0 +1,39 @@
+from blog.forms import CommentForm
+from blog.models import Comment, Post
+from core.holes import Hole, register
+
+
+@register
+class HeaderUserHole(Hole):
+    name = 'header-user'
+    template_name = 'includes/holes/header_user.html'
+
+
+@register
+class PostActionsHole(Hole):
+    name = 'post-actions'
+    template_name = 'includes/holes/post_actions.html'
+    models = (Post,)
+
+    def get_context(self, request, post):
+        return {'post': post}
+
+
+@register
+class CommentFormHole(Hole):
+    name = 'comment-form'
+    template_name = 'includes/holes/comment_form.html'
+    models = (Post,)
+
+    def get_context(self, request, post):
+        return {'post': post, 'form': CommentForm()}
+
+
+@register
+class CommentActionsHole(Hole):
+    name = 'comment-actions'
+    template_name = 'includes/holes/comment_actions.html'
+    models = (Comment,)
+
+    def get_context(self, request, comment):
+        return {'comment': comment}
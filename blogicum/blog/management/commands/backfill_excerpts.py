@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from blog.models import Post, count_words, make_excerpt
+
+
+class Command(BaseCommand):
+    help = ('Fills Post.excerpt and Post.word_count of posts saved '
+            'without them, e.g. before the fields were added.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Recompute every post, not only posts without excerpt.')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of posts read and updated at once.')
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help='Nominates a database to backfill.')
+
+    def handle(self, *args, **options):
+        queryset = Post._base_manager.using(options['database'])
+        if not options['all']:
+            queryset = queryset.filter(excerpt='')
+        queryset = queryset.only('pk', 'text').order_by('pk')
+        last_pk, updated = 0, 0
+        while True:
+            batch = list(
+                queryset.filter(pk__gt=last_pk)[:options['batch_size']])
+            if not batch:
+                break
+            for post in batch:
+                post.excerpt = make_excerpt(post.text)
+                post.word_count = count_words(post.text)
+            with transaction.atomic(using=options['database']):
+                Post._base_manager.using(options['database']).bulk_update(
+                    batch, ('excerpt', 'word_count'))
+            last_pk = batch[-1].pk
+            updated += len(batch)
+            self.stdout.write(f'Обновлено постов: {updated}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово, обновлено постов: {updated}.'))
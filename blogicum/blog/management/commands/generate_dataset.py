@@ -0,0 +1,296 @@
+import random
+from datetime import datetime, timezone
+from itertools import accumulate
+from multiprocessing import cpu_count, get_context
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from faker import Faker
+from PIL import Image
+
+from blog.models import (Category, Comment, Location, Post, User,
+                         count_words, make_excerpt)
+from core.signals import bulk_inserted
+from core.utils import insert_rows
+
+DAY = 24 * 60 * 60
+
+IMAGE_DIR = 'posts/dataset'
+
+POST_FIELDS = ('title', 'text', 'excerpt', 'word_count', 'pub_date',
+               'created_at', 'updated_at', 'author', 'location', 'category',
+               'image', 'is_published')
+
+COMMENT_FIELDS = ('text', 'post', 'author', 'created_at', 'updated_at',
+                  'is_published')
+
+# State shared with the worker processes, set by init_worker().
+context = {}
+
+
+def zipf_cum_weights(size, exponent):
+    return list(accumulate(1 / rank ** exponent
+                           for rank in range(1, size + 1)))
+
+
+def batch_random(kind, index):
+    return random.Random(f'{context["seed"]}:{kind}:{index}')
+
+
+def db_datetime(timestamp):
+    return context['ops'].adapt_datetimefield_value(
+        datetime.fromtimestamp(timestamp, tz=timezone.utc))
+
+
+def make_posts(batch):
+    """Return field values of one batch of posts.
+
+    Every batch has its own seed, so the result doesn't depend on the
+    number of workers.
+    """
+    index, size = batch
+    rng = batch_random('posts', index)
+    ctx = context
+    authors = rng.choices(ctx['users'], cum_weights=ctx['user_weights'],
+                          k=size)
+    rows = []
+    for author in authors:
+        if rng.random() < ctx['future_share']:
+            pub_date = ctx['now'] + rng.random() * ctx['future_days'] * DAY
+        else:
+            pub_date = ctx['now'] - rng.random() * ctx['days'] * DAY
+        text = ' '.join(rng.choices(
+            ctx['sentences'], k=max(1, int(rng.lognormvariate(2, 1)))))
+        created_at = db_datetime(min(pub_date, ctx['now']))
+        rows.append((
+            rng.choice(ctx['titles']),
+            text,
+            make_excerpt(text),
+            count_words(text),
+            db_datetime(pub_date),
+            created_at,
+            created_at,
+            author,
+            (rng.choice(ctx['locations'])
+             if rng.random() < ctx['location_share'] else None),
+            rng.choice(ctx['categories']),
+            (rng.choice(ctx['images'])
+             if rng.random() < ctx['image_share'] else ''),
+            rng.random() >= ctx['unpublished_share'],
+        ))
+    return rows
+
+
+def make_comments(batch):
+    index, size = batch
+    rng = batch_random('comments', index)
+    ctx = context
+    posts = rng.choices(ctx['posts'], cum_weights=ctx['post_weights'],
+                        k=size)
+    authors = rng.choices(ctx['users'], cum_weights=ctx['user_weights'],
+                          k=size)
+    rows = []
+    for (post_id, pub_date), author in zip(posts, authors):
+        created_at = db_datetime(
+            pub_date + rng.random() * max(ctx['now'] - pub_date, DAY))
+        rows.append((
+            ' '.join(rng.choices(ctx['sentences'], k=rng.randint(1, 3))),
+            post_id,
+            author,
+            created_at,
+            created_at,
+            rng.random() >= ctx['unpublished_share'],
+        ))
+    return rows
+
+
+def init_worker(state):
+    context.update(state)
+    context['ops'] = connections[state['using']].ops
+
+
+class Command(BaseCommand):
+    help = ('Fills the database with a large synthetic dataset of users, '
+            'categories, locations, posts and comments.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=30)
+        parser.add_argument('--locations', type=int, default=1000)
+        parser.add_argument('--posts', type=int, default=100_000)
+        parser.add_argument('--comments', type=int, default=1_000_000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--workers', type=int, default=cpu_count())
+        parser.add_argument(
+            '--zipf-exponent', type=float, default=1.1,
+            help='Skew of posts per author and comments per post.')
+        parser.add_argument('--days', type=int, default=3 * 365,
+                            help='Posts are spread over this many days.')
+        parser.add_argument('--future-share', type=float, default=0.05,
+                            help='Share of scheduled posts.')
+        parser.add_argument('--unpublished-share', type=float, default=0.05)
+        parser.add_argument('--location-share', type=float, default=0.7)
+        parser.add_argument('--image-share', type=float, default=0.1)
+        parser.add_argument('--images', type=int, default=10,
+                            help='Number of distinct image files.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        try:
+            self.generate(options)
+        finally:
+            # Rows are inserted past save(), see core.signals.
+            for model in (Category, Location, User, Post, Comment):
+                bulk_inserted.send(sender=model)
+
+    def generate(self, options):
+        self.options = options
+        self.using = options['database']
+        seed = options['seed']
+        self.rng = random.Random(seed)
+        self.fake = Faker('ru_RU')
+        self.fake.seed_instance(seed)
+        state = {
+            'seed': seed,
+            'using': self.using,
+            'now': datetime.now(tz=timezone.utc).timestamp(),
+            'days': options['days'],
+            'future_days': 30,
+            'future_share': options['future_share'],
+            'unpublished_share': options['unpublished_share'],
+            'location_share': options['location_share'],
+            'image_share': options['image_share'],
+            'sentences': [self.fake.sentence(nb_words=12)
+                          for _ in range(5000)],
+            'titles': [self.fake.sentence(nb_words=4)[:-1]
+                       for _ in range(2000)],
+            'images': self.make_images(),
+            'categories': self.make_categories(),
+            'locations': self.make_locations(),
+        }
+        state['users'] = self.make_users()
+        state['user_weights'] = zipf_cum_weights(
+            len(state['users']), options['zipf_exponent'])
+        init_worker(state)
+        connection = connections[self.using]
+        if connection.vendor == 'sqlite' and not connection.in_atomic_block:
+            # Durability is not needed for a throwaway dataset.
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA synchronous = OFF')
+        posts = Post.objects.using(self.using).order_by('pk')
+        if options['posts']:
+            # Comments go to the posts of this run only.
+            last_post = posts.values_list('pk', flat=True).last()
+            posts = posts.filter(pk__gt=last_post or 0)
+        self.run(state, make_posts, options['posts'], self.save_posts)
+        state['posts'] = [
+            (pk, pub_date.timestamp()) for pk, pub_date in
+            posts.values_list('pk', 'pub_date').iterator()]
+        if not state['posts']:
+            return
+        self.rng.shuffle(state['posts'])
+        state['post_weights'] = zipf_cum_weights(
+            len(state['posts']), options['zipf_exponent'])
+        init_worker(state)
+        self.run(state, make_comments, options['comments'],
+                 self.save_comments)
+
+    def run(self, state, make, total, save):
+        """Generate `total` rows with `make` in worker processes and
+        save them from this process batch by batch."""
+        if not total:
+            return
+        size = self.options['batch_size']
+        batches = [(index, min(size, total - start))
+                   for index, start in enumerate(range(0, total, size))]
+        workers = self.options['workers']
+        if workers > 1:
+            # Workers are forked, so they share the configured Django.
+            with get_context('fork').Pool(
+                    workers, init_worker, (state,)) as pool:
+                self.save_all(pool.imap(make, batches), save, total)
+        else:
+            self.save_all(map(make, batches), save, total)
+
+    def save_all(self, batches, save, total):
+        done = 0
+        for rows in batches:
+            with transaction.atomic(using=self.using):
+                save(rows)
+            done += len(rows)
+            self.stdout.write(f'{save.__name__}: {done}/{total}')
+
+    def save_posts(self, rows):
+        insert_rows(Post, POST_FIELDS, rows, self.using)
+
+    def save_comments(self, rows):
+        insert_rows(Comment, COMMENT_FIELDS, rows, self.using)
+
+    def published(self):
+        return self.rng.random() >= self.options['unpublished_share']
+
+    def created_at(self):
+        return self.fake.date_time_between(
+            f'-{self.options["days"]}d', tzinfo=timezone.utc)
+
+    def make_categories(self):
+        manager = Category.objects.using(self.using)
+        offset = manager.count()
+        categories = manager.bulk_create(
+            Category(
+                title=self.fake.word().capitalize(),
+                description=self.fake.paragraph(),
+                slug=f'dataset-{offset + index}',
+                is_published=self.published(),
+            ) for index in range(self.options['categories']))
+        return self.created_pks(Category, categories)
+
+    def make_locations(self):
+        locations = Location.objects.using(self.using).bulk_create(
+            Location(name=self.fake.city(), is_published=self.published())
+            for _ in range(self.options['locations']))
+        return self.created_pks(Location, locations)
+
+    def make_users(self):
+        password = make_password('password')
+        manager = User.objects.using(self.using)
+        offset = manager.count()
+        users = manager.bulk_create(
+            User(
+                username=f'{self.fake.user_name()}_{offset + index}',
+                first_name=self.fake.first_name(),
+                last_name=self.fake.last_name(),
+                email=self.fake.email(),
+                password=password,
+                date_joined=self.created_at(),
+            ) for index in range(self.options['users']))
+        pks = self.created_pks(User, users)
+        self.rng.shuffle(pks)
+        return pks
+
+    def created_pks(self, model, objs):
+        """Primary keys of `objs`, for backends, which don't return
+        them from bulk_create()."""
+        if all(obj.pk is not None for obj in objs):
+            return [obj.pk for obj in objs]
+        return list(model.objects.using(self.using).order_by('-pk')
+                    .values_list('pk', flat=True)[:len(objs)])
+
+    def make_images(self):
+        directory = Path(settings.MEDIA_ROOT) / IMAGE_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        names = []
+        for index in range(self.options['images']):
+            name = f'{IMAGE_DIR}/{index}.jpg'
+            path = Path(settings.MEDIA_ROOT) / name
+            # Drawn for every image, so the rest of the dataset doesn't
+            # depend on the images left by a previous run.
+            color = tuple(self.rng.randrange(256) for _ in range(3))
+            if not path.exists():
+                Image.new('RGB', (320, 240), color).save(path)
+            names.append(name)
+        return names
@@ -0,0 +1,28 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_alter_post_managers'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='post',
+            managers=[
+            ],
+        ),
+        migrations.AlterField(
+            model_name='category',
+            name='title',
+            field=models.CharField(db_index=True, max_length=256, verbose_name='Заголовок'),
+        ),
+        migrations.AlterField(
+            model_name='location',
+            name='name',
+            field=models.CharField(db_index=True, max_length=256, verbose_name='Название места'),
+        ),
+    ]
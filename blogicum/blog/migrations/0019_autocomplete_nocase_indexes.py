@@ -0,0 +1,32 @@
+# Generated by Django 3.2.16 on 2026-10-19 10:22
+
+from django.db import migrations, models
+import django.db.models.functions.comparison
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0018_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='category',
+            name='title',
+            field=models.CharField(max_length=256, verbose_name='Заголовок'),
+        ),
+        migrations.AlterField(
+            model_name='location',
+            name='name',
+            field=models.CharField(max_length=256, verbose_name='Название места'),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(django.db.models.functions.comparison.Collate('title', 'NOCASE'), name='blog_category_title_nocase'),
+        ),
+        migrations.AddIndex(
+            model_name='location',
+            index=models.Index(django.db.models.functions.comparison.Collate('name', 'NOCASE'), name='blog_location_name_nocase'),
+        ),
+    ]
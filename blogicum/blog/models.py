@@ -1,15 +1,26 @@
 from django.contrib.auth import get_user_model
 from django.db import models
 from django.db.models import Count
+from django.db.models.functions import Collate
 from django.urls import reverse
+from django.utils.text import Truncator
 from django.utils.timezone import now
 
-from blog.constants import STRING_MAX_LENGTH, TITLE_MAX_LENGTH
+from blog.constants import EXCERPT_WORDS, STRING_MAX_LENGTH, TITLE_MAX_LENGTH
 from core.models import PublishedCreatedModel
 
 User = get_user_model()
 
 
+def make_excerpt(text):
+    """The output of the `truncatewords` filter, which listings used."""
+    return Truncator(text).words(EXCERPT_WORDS, truncate=' …')
+
+
+def count_words(text):
+    return len(text.split())
+
+
 class PostQueryset(models.QuerySet):
 
     def annotated(self):
@@ -32,12 +43,16 @@ class PostQueryset(models.QuerySet):
     def pub_date(self):
         return self.filter(pub_date__lte=now())
 
+    def without_text(self):
+        return self.defer('text')
+
 
 class Post(PublishedCreatedModel):
     title = models.CharField('Заголовок', max_length=STRING_MAX_LENGTH)
     text = models.TextField('Текст')
     pub_date = models.DateTimeField(
         'Дата и время публикации',
+        db_index=True,
         help_text='Если установить дату и время в будущем — можно делать '
                   'отложенные публикации.'
     )
@@ -64,6 +79,9 @@ class Post(PublishedCreatedModel):
         upload_to='posts/',
         blank=True
     )
+    excerpt = models.TextField('Начало текста', blank=True, editable=False)
+    word_count = models.PositiveIntegerField(
+        'Количество слов', default=0, editable=False)
     objects = PostQueryset.as_manager()
 
     class Meta(PublishedCreatedModel.Meta):
@@ -78,6 +96,15 @@ class Post(PublishedCreatedModel):
     def get_absolute_url(self):
         return reverse('blog:post_detail', kwargs={'post_id': self.pk})
 
+    def save(self, *args, **kwargs):
+        self.excerpt = make_excerpt(self.text)
+        self.word_count = count_words(self.text)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'text' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'excerpt',
+                                       'word_count'}
+        super().save(*args, **kwargs)
+
 
 class Category(PublishedCreatedModel):
     title = models.CharField('Заголовок', max_length=STRING_MAX_LENGTH)
@@ -91,6 +118,10 @@ class Category(PublishedCreatedModel):
     class Meta(PublishedCreatedModel.Meta):
         verbose_name = 'категория'
         verbose_name_plural = 'Категории'
+        # Case-insensitive prefix search of the autocomplete, a SQLite LIKE
+        # uses only an index of the same collation.
+        indexes = (models.Index(Collate('title', 'NOCASE'),
+                                name='blog_category_title_nocase'),)
 
     def __str__(self):
         return self.title[:TITLE_MAX_LENGTH]
@@ -102,6 +133,8 @@ class Location(PublishedCreatedModel):
     class Meta(PublishedCreatedModel.Meta):
         verbose_name = 'местоположение'
         verbose_name_plural = 'Местоположения'
+        indexes = (models.Index(Collate('name', 'NOCASE'),
+                                name='blog_location_name_nocase'),)
 
     def __str__(self):
         return self.name[:TITLE_MAX_LENGTH]
@@ -122,6 +155,8 @@ class Comment(PublishedCreatedModel):
 
     class Meta:
         ordering = ('created_at',)
+        indexes = (models.Index(fields=('created_at',)),
+                   models.Index(fields=('post', 'created_at', 'id')))
         default_related_name = 'comments'
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
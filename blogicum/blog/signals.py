@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from blog.cache import (LOOKUP_FIELDS, bump_versions, cache_body_html,
+                        existence_filter, mark_existing)
+from blog.conditional import PAGE_MODELS, mark_changed
+from blog.constants import BODY_HTML_CACHE_MIN_LENGTH
+from blog.models import Category, Comment, Location, Post
+from core.signals import bulk_inserted, bulk_updated
+
+CARD_MODELS = (Post, Category, Location, get_user_model())
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_post_cards(sender, instance, **kwargs):
+    if sender in CARD_MODELS:
+        bump_versions(sender, [instance.pk])
+
+
+@receiver(bulk_updated)
+def invalidate_bulk_updated_cards(sender, pks, **kwargs):
+    if sender in CARD_MODELS:
+        bump_versions(sender, pks)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Comment)
+def cache_rendered_body(sender, instance, raw=False, **kwargs):
+    if not raw and len(instance.text) >= BODY_HTML_CACHE_MIN_LENGTH:
+        cache_body_html(instance.text)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def mark_page_model_changed(sender, update_fields=None, **kwargs):
+    # Logins save only last_login, which no page shows.
+    if sender in PAGE_MODELS and update_fields != frozenset({'last_login'}):
+        mark_changed(sender)
+
+
+@receiver(bulk_updated)
+@receiver(bulk_inserted)
+def mark_bulk_written_model_changed(sender, **kwargs):
+    if sender in PAGE_MODELS:
+        mark_changed(sender)
+
+
+@receiver(post_save)
+def forget_missing_lookups(sender, instance, using, **kwargs):
+    field = LOOKUP_FIELDS.get(sender)
+    if field is not None:
+        value = getattr(instance, field)
+        mark_existing(sender, field, [value])
+        # Other workers read the table for the logged values, so the
+        # value is logged once the row is visible to them.
+        transaction.on_commit(
+            lambda: existence_filter(sender, field).log(value), using=using)
+
+
+@receiver(bulk_updated)
+@receiver(bulk_inserted)
+def rebuild_existence_filters(sender, values=None, **kwargs):
+    # Rows written in bulk send no post_save, so their values aren't
+    # logged one by one.
+    field = LOOKUP_FIELDS.get(sender)
+    if field is not None and (values is None or field in values):
+        existence_filter(sender, field).reset()
@@ -0,0 +1,43 @@
+(function () {
+  'use strict';
+
+  var DELAY = 250;
+
+  function setOptions(select, results) {
+    var chosen = select.options[select.selectedIndex];
+    var keep = chosen && chosen.value ? chosen : null;
+    select.innerHTML = '';
+    select.appendChild(new Option('---------', ''));
+    if (keep) {
+      select.appendChild(keep);
+    }
+    results.forEach(function (item) {
+      if (!keep || String(item.id) !== keep.value) {
+        select.appendChild(new Option(item.text, item.id));
+      }
+    });
+  }
+
+  function bind(select) {
+    var search = document.createElement('input');
+    var timer = null;
+    search.type = 'search';
+    search.className = 'form-control mb-1';
+    search.placeholder = 'Начните вводить название';
+    select.parentNode.insertBefore(search, select);
+    search.addEventListener('input', function () {
+      clearTimeout(timer);
+      timer = setTimeout(function () {
+        var url = select.dataset.autocompleteUrl +
+          '?term=' + encodeURIComponent(search.value);
+        fetch(url, {credentials: 'same-origin'})
+          .then(function (response) { return response.json(); })
+          .then(function (data) { setOptions(select, data.results); });
+      }, DELAY);
+    });
+  }
+
+  document.addEventListener('DOMContentLoaded', function () {
+    document.querySelectorAll('select[data-autocomplete-url]').forEach(bind);
+  });
+}());
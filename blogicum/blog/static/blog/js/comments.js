@@ -0,0 +1,35 @@
+(function () {
+  'use strict';
+
+  // Replace the "load more" link with the next page of comments, which
+  // brings its own link when there are more of them.
+  document.addEventListener('click', function (event) {
+    var link = event.target.closest('a[data-load-more]');
+    if (!link) {
+      return;
+    }
+    event.preventDefault();
+    if (link.classList.contains('disabled')) {
+      return;
+    }
+    link.classList.add('disabled');
+    fetch(link.dataset.loadMore, {credentials: 'same-origin'})
+      .then(function (response) {
+        if (!response.ok) {
+          throw new Error(response.statusText);
+        }
+        return response.text();
+      })
+      .then(function (html) {
+        var list = link.parentNode;
+        link.insertAdjacentHTML('beforebegin', html);
+        link.remove();
+        if (window.fillHoles) {
+          window.fillHoles(list);
+        }
+      })
+      .catch(function () {
+        window.location = link.href;
+      });
+  });
+}());
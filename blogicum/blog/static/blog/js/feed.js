@@ -0,0 +1,46 @@
+(function () {
+  'use strict';
+
+  // Infinite scroll: when the end of the feed becomes visible, append
+  // the next fragment of post cards, which ends with its own marker.
+  function load(marker, observer) {
+    observer.unobserve(marker);
+    fetch(marker.dataset.feedNext, {credentials: 'same-origin'})
+      .then(function (response) {
+        if (!response.ok) {
+          throw new Error(response.statusText);
+        }
+        return response.text();
+      })
+      .then(function (html) {
+        var feed = marker.parentNode;
+        marker.insertAdjacentHTML('beforebegin', html);
+        marker.remove();
+        var next = feed.querySelector('[data-feed-next]');
+        if (next) {
+          observer.observe(next);
+        }
+      })
+      .catch(function () {
+        document.querySelectorAll('[data-paginator]').forEach(
+          function (paginator) { paginator.hidden = false; });
+      });
+  }
+
+  document.addEventListener('DOMContentLoaded', function () {
+    var marker = document.querySelector('[data-feed] [data-feed-next]');
+    if (!marker || !('IntersectionObserver' in window)) {
+      return;
+    }
+    document.querySelectorAll('[data-paginator]').forEach(
+      function (paginator) { paginator.hidden = true; });
+    var observer = new IntersectionObserver(function (entries) {
+      entries.forEach(function (entry) {
+        if (entry.isIntersecting) {
+          load(entry.target, observer);
+        }
+      });
+    }, {rootMargin: '800px'});
+    observer.observe(marker);
+  });
+}());
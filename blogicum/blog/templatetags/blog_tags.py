@@ -0,0 +1,20 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from blog.cache import body_html, render_post_cards
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def post_cards(context, posts):
+    """Render includes/post_card.html for every post of `posts` through
+    the cache."""
+    return [mark_safe(html) for html in render_post_cards(context, posts)]
+
+
+@register.filter(is_safe=True)
+def cached_linebreaksbr(text):
+    """`linebreaksbr` with autoescaping, cached by the hash of text
+    for texts of BODY_HTML_CACHE_MIN_LENGTH characters and longer."""
+    return body_html(text)
@@ -7,13 +7,22 @@ app_name = 'blog'
 urlpatterns = [
     path('', views.BlogListView.as_view(),
          name='index'),
+    path('feed/', views.BlogListFragmentView.as_view(),
+         name='index_feed'),
     path('posts/<int:post_id>/', views.PostDetailView.as_view(),
          name='post_detail'),
+    path('posts/<int:post_id>/comments/', views.PostCommentsView.as_view(),
+         name='post_comments'),
     path('category/<slug:category_slug>/',
          views.BlogCategoryView.as_view(),
          name='category_posts'),
+    path('category/<slug:category_slug>/feed/',
+         views.BlogCategoryFragmentView.as_view(),
+         name='category_feed'),
     path('profile/<slug:username>/', views.UserDetailView.as_view(),
          name='profile'),
+    path('profile/<slug:username>/feed/', views.UserFeedFragmentView.as_view(),
+         name='profile_feed'),
     path('profile/<slug:username>/edit/', views.UserUpdateView.as_view(),
          name='edit_profile'),
     path('posts/create/', views.PostCreateView.as_view(),
@@ -30,4 +39,6 @@ urlpatterns = [
     path('posts/<int:post_id>/delete_comment/<int:comment_id>/',
          views.CommentDeleteView.as_view(),
          name='delete_comment'),
+    path('autocomplete/<slug:model_name>/', views.AutocompleteView.as_view(),
+         name='autocomplete'),
 ]
@@ -1,19 +1,29 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import PermissionDenied
 from django.core.paginator import Paginator
-from django.http import Http404
+from django.db.models.functions import Collate
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect
+from django.template.response import TemplateResponse
 from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.utils.decorators import method_decorator
 from django.views.generic import (CreateView,
                                   DeleteView,
                                   DetailView,
                                   ListView,
-                                  UpdateView)
+                                  UpdateView,
+                                  View)
 from django.views.generic.list import MultipleObjectMixin
 
-from blog.constants import PAGINATION_VALUE
+from blog.cache import lookup_or_404
+from blog.conditional import conditional_page
+from blog.constants import (AUTOCOMPLETE_LIMIT, COMMENTS_PER_PAGE,
+                            FEED_FRAGMENT_MAX_AGE, FEED_ORDERING,
+                            PAGINATION_VALUE)
 from blog.forms import PostForm, CommentForm, UserForm
-from blog.models import Category, Post, Comment, User
+from blog.models import Category, Location, Post, Comment, User
+from core.pagination import InvalidCursor, cursor_for, keyset_page
 
 
 class DeleteMixin():
@@ -23,36 +33,105 @@ class DeleteMixin():
         return super().dispatch(request, *args, **kwargs)
 
 
-class BlogListView(ListView):
+class FeedMixin:
+    """Feed of posts, which is continued by `fragment_url_name` view.
+    The views define `get_posts()`, which returns the posts of the feed
+    for FeedFragmentMixin."""
+
+    fragment_url_name = None
+
+    def get_feed_next(self, cursor):
+        if cursor is None:
+            return None
+        url = reverse(self.fragment_url_name, kwargs=self.kwargs)
+        return f'{url}?after={cursor}'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = context['page_obj']
+        context['feed_next'] = self.get_feed_next(
+            cursor_for(page[-1], FEED_ORDERING)
+            if page.has_next() else None)
+        return context
+
+
+class FeedFragmentMixin:
+    """Posts of the feed following the `after` cursor, rendered as cards
+    without the page around them, for the infinite scroll.
+
+    The cursor of the next fragment is returned in the `X-Next-Cursor`
+    header and in the `data-feed-next` URL at the end of the fragment.
+    """
+
+    template_name = 'includes/post_feed.html'
+
+    def get(self, request, *args, **kwargs):
+        try:
+            page = keyset_page(self.get_posts(), FEED_ORDERING,
+                               request.GET.get('after'), PAGINATION_VALUE)
+        except InvalidCursor:
+            raise Http404()
+        response = TemplateResponse(request, self.template_name, {
+            'posts': page, 'feed_next': self.get_feed_next(page.next_cursor)})
+        if page.has_next:
+            response['X-Next-Cursor'] = page.next_cursor
+        patch_cache_control(response, max_age=FEED_FRAGMENT_MAX_AGE)
+        return response
+
+
+@method_decorator(conditional_page(shared=True), name='dispatch')
+class BlogListView(FeedMixin, ListView):
     model = Post
     paginate_by = 10
     template_name = 'blog/index.html'
+    fragment_url_name = 'blog:index_feed'
 
-    def get_queryset(self):
+    def get_posts(self):
         return (Post.objects.prefetched().select_relatable().
                 annotated().category_is_published().published()
-                .pub_date().order_by('-pub_date'))
+                .pub_date().without_text().order_by(*FEED_ORDERING))
+
+    def get_queryset(self):
+        return self.get_posts()
+
 
+class BlogListFragmentView(FeedFragmentMixin, BlogListView):
+    pass
 
-class BlogCategoryView(ListView):
+
+@method_decorator(conditional_page(shared=True), name='dispatch')
+class BlogCategoryView(FeedMixin, ListView):
     model = Post
     template_name = 'blog/category.html'
+    fragment_url_name = 'blog:category_feed'
+
+    def get_category(self):
+        slug = self.kwargs['category_slug']
+        return lookup_or_404(
+            Category, 'slug', slug,
+            lambda: get_object_or_404(Category, is_published=True, slug=slug))
+
+    def get_posts(self, category=None):
+        category = category or self.get_category()
+        return (category.posts.select_relatable().prefetched().annotated()
+                .order_by(*FEED_ORDERING).published().pub_date()
+                .without_text())
 
     def get_context_data(self, *args, **kwargs):
         page_number = self.request.GET.get('page')
-        category = get_object_or_404(
-            Category,
-            is_published=True,
-            slug=self.kwargs['category_slug'])
+        category = self.get_category()
         post_list = Paginator(
-            category.posts.prefetched().annotated().order_by(
-                '-pub_date').published().pub_date(),
+            self.get_posts(category),
             PAGINATION_VALUE).get_page(page_number)
         context = super(BlogCategoryView, self).get_context_data(
             category=category, page_obj=post_list, **kwargs)
         return context
 
 
+class BlogCategoryFragmentView(FeedFragmentMixin, BlogCategoryView):
+    pass
+
+
 class PostCreateView(LoginRequiredMixin, CreateView):
     form_class = PostForm
     model = Post
@@ -69,21 +148,56 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         )
 
 
+@method_decorator(conditional_page(shared=True), name='dispatch')
 class PostDetailView(DetailView):
     model = Post
     pk_url_kwarg = 'post_id'
 
+    def get_object(self, queryset=None):
+        return lookup_or_404(
+            Post, 'pk', self.kwargs[self.pk_url_kwarg],
+            lambda: super(PostDetailView, self).get_object(queryset))
+
+    def get_comments(self):
+        """Page of comments following the `after` cursor."""
+        try:
+            return keyset_page(
+                self.object.comments.select_related('author'),
+                ('created_at', 'id'), self.request.GET.get('after'),
+                COMMENTS_PER_PAGE)
+        except InvalidCursor:
+            raise Http404()
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         return dict(**context,
-                    comments=self.object.comments.select_related('author'),
+                    comments=self.get_comments(),
                     form=CommentForm())
 
-    def dispatch(self, request, *args, **kwargs):
-        if (self.get_object().author != self.request.user
-                and not self.get_object().is_published):
-            raise Http404()
-        return super().dispatch(request, *args, **kwargs)
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        # Checked before the conditional GET in dispatch, which would
+        # answer 304 to anybody sending the validators of the page. The
+        # user is checked only for unpublished posts, so published ones
+        # don't depend on the session.
+        self.object = self.get_object()
+        if not self.object.is_published:
+            if self.object.author_id != request.user.pk:
+                raise Http404()
+            request.private_page = True
+
+    def get(self, request, *args, **kwargs):
+        return self.render_to_response(
+            self.get_context_data(object=self.object))
+
+
+class PostCommentsView(PostDetailView):
+    """Next page of comments of a post for the "load more" button."""
+
+    template_name = 'includes/comment_list.html'
+
+    def get_context_data(self, **kwargs):
+        return dict(post=self.object, comments=self.get_comments())
 
 
 class PostUpdateView(LoginRequiredMixin, UpdateView):
@@ -107,28 +221,42 @@ class PostDeleteView(LoginRequiredMixin, DeleteMixin, DeleteView):
         return reverse('blog:index')
 
 
-class UserDetailView(DetailView, MultipleObjectMixin):
+@method_decorator(conditional_page(), name='dispatch')
+class UserDetailView(FeedMixin, DetailView, MultipleObjectMixin):
     model = User
     template_name = 'blog/profile.html'
     slug_url_kwarg = 'username'
     slug_field = 'username'
     paginate_by = PAGINATION_VALUE
+    fragment_url_name = 'blog:profile_feed'
 
-    def get_context_data(self, **kwargs):
-        profile = self.get_object()
+    def get_object(self, queryset=None):
+        return lookup_or_404(
+            User, 'username', self.kwargs[self.slug_url_kwarg],
+            lambda: super(UserDetailView, self).get_object(queryset))
+
+    def get_posts(self, profile=None):
+        profile = profile or self.get_object()
         object_list = (
-            Post.objects.select_relatable().prefetched().annotated().order_by(
-                '-pub_date').filter(
-                author=profile))
+            Post.objects.select_relatable().prefetched().annotated()
+            .without_text().order_by(*FEED_ORDERING).filter(author=profile))
         if self.request.user != profile:
             object_list = (object_list.published().
                            category_is_published().pub_date())
+        return object_list
+
+    def get_context_data(self, **kwargs):
+        profile = self.get_object()
         context = super(UserDetailView, self).get_context_data(
-            object_list=object_list,
+            object_list=self.get_posts(profile),
             profile=profile, **kwargs)
         return context
 
 
+class UserFeedFragmentView(FeedFragmentMixin, UserDetailView):
+    pass
+
+
 class UserUpdateView(LoginRequiredMixin, UpdateView):
     model = User
     template_name = 'blog/user.html'
@@ -177,3 +305,28 @@ class CommentDeleteView(LoginRequiredMixin, DeleteMixin, DeleteView):
     def get_success_url(self):
         return reverse('blog:post_detail',
                        kwargs={'post_id': self.get_object().post.pk})
+
+
+class AutocompleteView(View):
+    lookups = {
+        'category': (Category, 'title'),
+        'location': (Location, 'name'),
+    }
+
+    def get(self, request, *args, **kwargs):
+        try:
+            model, field = self.lookups[self.kwargs['model_name']]
+        except KeyError:
+            raise Http404()
+        term = request.GET.get('term', '').strip()
+        rows = list(
+            model.objects.filter(
+                is_published=True,
+                **{f'{field}__istartswith': term}
+            ).order_by(Collate(field, 'NOCASE')).values_list('pk', field)[
+                :AUTOCOMPLETE_LIMIT + 1])
+        return JsonResponse({
+            'results': [{'id': pk, 'text': text}
+                        for pk, text in rows[:AUTOCOMPLETE_LIMIT]],
+            'more': len(rows) > AUTOCOMPLETE_LIMIT,
+        })
@@ -0,0 +1,49 @@
+from django import forms
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+
+
+class AutocompleteSelect(forms.Select):
+    """Select, which renders only chosen options.
+
+    The rest are loaded from the `blog:autocomplete` endpoint by
+    `blog/js/autocomplete.js`, so the page doesn't contain every row
+    of the related table.
+    """
+
+    class Media:
+        js = ('blog/js/autocomplete.js',)
+
+    def __init__(self, model_name, attrs=None):
+        super().__init__(attrs)
+        self.model_name = model_name
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs['data-autocomplete-url'] = reverse(
+            'blog:autocomplete', kwargs={'model_name': self.model_name})
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        default = (None, [], 0)
+        field = self.choices.field
+        to_python = field.queryset.model._meta.pk.to_python
+        selected = set()
+        # An invalid form is rendered again with the submitted values.
+        for v in value:
+            try:
+                pk = to_python(v)
+            except (ValidationError, ValueError):
+                continue
+            if pk not in field.empty_values:
+                selected.add(pk)
+        if not self.is_required or not selected:
+            default[1].append(
+                self.create_option(name, '', field.empty_label or '',
+                                   not selected, 0))
+        for obj in field.queryset.filter(pk__in=selected):
+            default[1].append(
+                self.create_option(name, str(obj.pk),
+                                   field.label_from_instance(obj), True,
+                                   len(default[1])))
+        return [default]
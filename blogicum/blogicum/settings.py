@@ -1,3 +1,5 @@
+import os
+import tempfile
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -27,11 +29,16 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.ServerTimingMiddleware',
+    'core.middleware.SlowQueryMiddleware',
+    'core.middleware.MemoryProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'debug_toolbar.middleware.DebugToolbarMiddleware'
@@ -97,6 +104,8 @@ STATICFILES_DIRS = [
     BASE_DIR / 'templates/static'
 ]
 
+STATIC_ROOT = BASE_DIR / 'static'
+
 INTERNAL_IPS = [
     '127.0.0.1',
 ]
@@ -118,3 +127,95 @@ MEDIA_ROOT = BASE_DIR / 'media'
 MEDIA_URL = 'media/'
 
 AUTHENTICATION_BACKENDS = ('user.utils.EmailBackend',)
+
+# Invalidated by the worker, which changes an object, so production
+# needs a cache shared by all workers, see core.checks.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Lookups of posts, categories and users, see blog.cache.
+    'lookups': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'lookups',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+# Share of requests measured by core.middleware.ServerTimingMiddleware.
+SERVER_TIMING_SAMPLE_RATE = 1.0 if DEBUG else 0.01
+
+# Shared by the worker processes, see core.metrics.
+METRICS_DIR = Path(tempfile.gettempdir()) / 'blogicum_metrics'
+
+# `/metrics` answers only requests with the
+# `Authorization: Bearer <METRICS_TOKEN>` header, when the token is set,
+# and requests from these addresses. Behind a reverse proxy every request
+# comes from its address, so list only addresses of direct scrapers.
+METRICS_ALLOWED_IPS = []
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+# Profiles of requests made with the X-Profile header by staff users.
+PROFILES_DIR = Path(tempfile.gettempdir()) / 'blogicum_profiles'
+
+# Queries of these URL namespaces slower than the threshold are logged
+# to SLOW_QUERY_LOG, see core.slow_queries.
+SLOW_QUERY_THRESHOLD_MS = 100
+SLOW_QUERY_NAMESPACES = ('blog', 'user', 'admin')
+SLOW_QUERY_LOG = Path(tempfile.gettempdir()) / 'blogicum_slow_queries.log'
+
+# Trace allocations of every request, see core.memory. Slows requests
+# down several times, turn it on only to measure memory. Every worker
+# logs its report each MEMORY_REPORT_EVERY measured requests.
+MEMORY_PROFILING = False
+MEMORY_REPORT_EVERY = 100
+
+# Compile templates and URLconfs when a WSGI worker boots and call the
+# WARMUP_PRIMERS functions (dotted paths) to fill hot caches.
+WARMUP_ON_BOOT = False
+WARMUP_PRIMERS = []
+
+# Render user-specific parts of shared pages as placeholders filled by
+# a per-user request, so the pages can be cached for everyone, see
+# core.holes.
+HOLE_PUNCHING = False
+
+# Serve the static and error pages from files built by
+# `manage.py prerender_pages`, see pages.prerendered.
+PRERENDERED_PAGES = False
+PRERENDERED_DIR = BASE_DIR / 'prerendered'
+
+# Serve STATIC_ROOT from the application, precompressed and with hashed
+# names cached for STATIC_MAX_AGE seconds, see core.views.static_file.
+# The files are collected by core.storage.CompressedManifestStaticFilesStorage.
+SERVE_STATIC = False
+STATIC_MAX_AGE = 365 * 24 * 60 * 60
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+        # Written by all the workers, so the file is rotated externally,
+        # e.g. by logrotate, and reopened when it's moved away.
+        'slow_queries': {
+            'class': 'logging.handlers.WatchedFileHandler',
+            'filename': SLOW_QUERY_LOG,
+            'encoding': 'utf-8',
+            'delay': True,
+        },
+    },
+    'loggers': {
+        'core': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+        'core.slow_queries': {
+            'handlers': ['slow_queries'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
@@ -0,0 +1,78 @@
+"""Settings for production workers.
+
+Use with DJANGO_SETTINGS_MODULE=blogicum.settings_production. Compared
+to the development settings, this drops DEBUG together with the apps
+and middleware which are only needed while developing, so that workers
+import less code at boot.
+"""
+import os
+
+from blogicum.settings import *  # noqa: F401,F403
+from blogicum.settings import INSTALLED_APPS, MIDDLEWARE, TEMPLATES
+
+DEBUG = False
+
+DEV_APPS = ('debug_toolbar',)
+
+DEV_MIDDLEWARE = ('debug_toolbar.middleware.DebugToolbarMiddleware',)
+
+# Admin modules are imported with the URLconf instead of when the apps
+# are loaded, see blogicum/urls.py. The warm-up below loads every
+# URLconf at boot, so they are imported then, as the first request
+# would do otherwise; without WARMUP_ON_BOOT they wait for it.
+INSTALLED_APPS = [
+    'django.contrib.admin.apps.SimpleAdminConfig'
+    if app == 'django.contrib.admin' else app
+    for app in INSTALLED_APPS if app not in DEV_APPS
+]
+
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if middleware not in DEV_MIDDLEWARE
+]
+
+SERVER_TIMING_SAMPLE_RATE = 0.01
+
+# Shared by the workers, so invalidation made by one reaches all of them.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'LOCATION': os.environ.get('MEMCACHED_LOCATION', '127.0.0.1:11211'),
+    },
+    # A separate instance, so random URLs requested by bots don't evict
+    # the entries of the default cache.
+    'lookups': {
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'LOCATION': os.environ.get('MEMCACHED_LOOKUPS_LOCATION',
+                                   '127.0.0.1:11212'),
+    },
+}
+
+# Templates are compiled once per worker, see core.warmup.
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],
+        'loaders': [(
+            'django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ],
+        )],
+    },
+}]
+
+WARMUP_ON_BOOT = True
+# The existence filters read whole tables, which no request should wait for.
+WARMUP_PRIMERS = ['blog.cache.build_existence_filters']
+
+HOLE_PUNCHING = True
+
+PRERENDERED_PAGES = True
+
+# Run `manage.py collectstatic` and then `manage.py prerender_pages` on
+# deploy, the pages link the hashed names of the static files.
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+
+SERVE_STATIC = True
@@ -1,8 +1,13 @@
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
 
+from core.views import holes, metrics, static_file
+
+# A no-op with the default AdminConfig, imports admin modules when the
+# settings use SimpleAdminConfig.
+admin.autodiscover()
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -10,9 +15,15 @@ urlpatterns = [
     path('pages/', include('pages.urls')),
     path('user/', include('user.urls')),
     path('auth/', include('django.contrib.auth.urls')),
+    path('metrics', metrics, name='metrics'),
+    path('holes/', holes, name='holes'),
 
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
+if settings.SERVE_STATIC:
+    static_prefix = settings.STATIC_URL.lstrip('/')
+    urlpatterns += (re_path(rf'^{static_prefix}(?P<path>.+)$', static_file),)
+
 if settings.DEBUG:
     import debug_toolbar
 
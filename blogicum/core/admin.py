@@ -0,0 +1,301 @@
+import csv
+import json
+import logging
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from itertools import chain
+from hashlib import md5
+
+from django.contrib import admin, messages
+from django.contrib.admin.views.main import ChangeList
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.core.paginator import Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from core.signals import bulk_updated
+
+logger = logging.getLogger(__name__)
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator, which doesn't run COUNT(*) over the whole table
+    on every changelist request.
+
+    Unfiltered counts on PostgreSQL are taken from the planner
+    statistics; all other counts are cached for `cache_timeout` seconds.
+    """
+
+    cache_timeout = 60
+    estimate_threshold = 100_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+        if not queryset.query.where:
+            estimate = self.estimate(queryset)
+            if estimate > self.estimate_threshold:
+                return estimate
+        key = 'admin-count:' + md5(
+            f'{queryset.db}:{sql}:{params}'.encode()).hexdigest()
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, self.cache_timeout)
+        return count
+
+    @staticmethod
+    def estimate(queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return 0
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+                [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+        return row[0] if row else 0
+
+
+class BoundedRelatedFieldListFilter(admin.RelatedFieldListFilter):
+    """Related filter, which shows at most `choices_limit` choices
+    instead of every row of the related table."""
+
+    choices_limit = 50
+
+    def field_choices(self, field, request, model_admin):
+        ordering = self.field_admin_ordering(field, request, model_admin)
+        queryset = field.related_model._default_manager.all()
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        choices = [(obj.pk, str(obj))
+                   for obj in queryset[:self.choices_limit]]
+        if self.lookup_val and all(
+                str(pk) != self.lookup_val for pk, _ in choices):
+            try:
+                choices += [(obj.pk, str(obj))
+                            for obj in queryset.filter(pk=self.lookup_val)]
+            except (ValueError, ValidationError):
+                pass
+        return choices
+
+
+class InstanceAutocompleteSelect(AutocompleteSelect):
+    """Autocomplete widget, which takes the chosen option from
+    `selected_object` instead of querying it for every row."""
+
+    selected_object = None
+
+    def optgroups(self, name, value, attrs=None):
+        obj = self.selected_object
+        if obj is None or [str(obj.pk)] != [str(v) for v in value if v]:
+            return super().optgroups(name, value, attrs)
+        options = []
+        if not self.is_required:
+            options.append(self.create_option(name, '', '', False, 0))
+        options.append(self.create_option(
+            name, obj.pk, self.choices.field.label_from_instance(obj),
+            True, len(options)))
+        return [(None, options, 0)]
+
+
+def period_start(value, kind):
+    if kind == 'year':
+        return date(value.year, 1, 1)
+    if kind == 'month':
+        return date(value.year, value.month, 1)
+    return date(value.year, value.month, value.day)
+
+
+def next_period(start, kind):
+    if kind == 'year':
+        return start.replace(year=start.year + 1)
+    if kind == 'month':
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+class IndexedDatesQuerySetMixin:
+    """Builds `date_hierarchy` choices with one EXISTS probe per period
+    over the date index instead of DISTINCT over every row."""
+
+    def dates(self, field_name, kind, order='ASC'):
+        return self.probe_periods(field_name, kind, order, aware=False)
+
+    def datetimes(self, field_name, kind, order='ASC', tzinfo=None,
+                  is_dst=None):
+        return self.probe_periods(field_name, kind, order, aware=True)
+
+    def probe_periods(self, field_name, kind, order, aware):
+        values = self.exclude(**{f'{field_name}__isnull': True}).values_list(
+            field_name, flat=True)
+        first = values.order_by(field_name).first()
+        last = values.order_by(f'-{field_name}').first()
+        if first is None:
+            return []
+        if aware:
+            first, last = timezone.localtime(first), timezone.localtime(last)
+
+        def bound(day):
+            if not aware:
+                return day
+            return timezone.make_aware(datetime.combine(day, time.min))
+
+        periods = []
+        start = period_start(first, kind)
+        while start <= period_start(last, kind):
+            end = next_period(start, kind)
+            if values.filter(**{f'{field_name}__gte': bound(start),
+                                f'{field_name}__lt': bound(end)}).exists():
+                periods.append(bound(start))
+            start = end
+        return periods[::-1] if order == 'DESC' else periods
+
+
+@lru_cache(maxsize=None)
+def indexed_dates_queryset_class(queryset_class):
+    return type(f'IndexedDates{queryset_class.__name__}',
+                (IndexedDatesQuerySetMixin, queryset_class), {})
+
+
+class IndexedDatesChangeList(ChangeList):
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        queryset.__class__ = indexed_dates_queryset_class(queryset.__class__)
+        return queryset
+
+
+class LargeTableAdminMixin:
+    """Changelist settings for tables with millions of rows."""
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_changelist(self, request, **kwargs):
+        return IndexedDatesChangeList
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if ('widget' not in kwargs
+                and db_field.name in self.get_autocomplete_fields(request)):
+            kwargs['widget'] = InstanceAutocompleteSelect(
+                db_field, self.admin_site, using=kwargs.get('using'))
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def get_changelist_formset(self, request, **kwargs):
+        formset = super().get_changelist_formset(request, **kwargs)
+
+        class ChangeListFormSet(formset):
+            def _construct_form(self, i, **kwargs):
+                form = super()._construct_form(i, **kwargs)
+                for name, field in form.fields.items():
+                    widget = getattr(field.widget, 'widget', field.widget)
+                    if isinstance(widget, InstanceAutocompleteSelect):
+                        widget.selected_object = getattr(
+                            form.instance, name, None)
+                return form
+
+        return ChangeListFormSet
+
+
+def chunked_update(queryset, batch_size, **values):
+    """Update `queryset` with `values` by primary key batches.
+
+    Every batch is a single UPDATE in its own transaction, followed by
+    one `bulk_updated` signal. `auto_now` fields are set like `save()`
+    does. Returns the number of updated rows.
+    """
+    model = queryset.model
+    now = timezone.now()
+    values = {**{field.name: now for field in model._meta.concrete_fields
+                 if getattr(field, 'auto_now', False)}, **values}
+    pks = queryset.order_by('pk').values_list('pk', flat=True)
+    manager = model._default_manager.db_manager(queryset.db)
+    updated = 0
+    last_pk = None
+    while True:
+        batch_pks = pks if last_pk is None else pks.filter(pk__gt=last_pk)
+        batch = list(batch_pks[:batch_size])
+        if not batch:
+            break
+        with transaction.atomic(using=queryset.db):
+            updated += manager.filter(pk__in=batch).update(**values)
+        bulk_updated.send(sender=model, pks=batch, values=values)
+        last_pk = batch[-1]
+        logger.info('%s: %d rows updated', model._meta.label, updated)
+    return updated
+
+
+class ChunkedActionsMixin:
+    """Publish/unpublish actions, which don't load selected objects."""
+
+    actions = ('publish', 'unpublish')
+    batch_size = 1000
+
+    def chunked_update(self, request, queryset, **values):
+        updated = chunked_update(queryset, self.batch_size, **values)
+        self.message_user(
+            request, f'Обновлено записей: {updated}.', messages.SUCCESS)
+        return updated
+
+    @admin.action(description='Опубликовать выбранные')
+    def publish(self, request, queryset):
+        self.chunked_update(request, queryset, is_published=True)
+
+    @admin.action(description='Снять с публикации выбранные')
+    def unpublish(self, request, queryset):
+        self.chunked_update(request, queryset, is_published=False)
+
+
+class Echo:
+    """File-like object for `csv.writer`, which returns written lines."""
+
+    def write(self, value):
+        return value
+
+
+class StreamingExportMixin:
+    """CSV and JSON Lines export actions with constant memory usage.
+
+    `export_fields` may contain related lookups such as
+    `author__username`, they are fetched with a join.
+    """
+
+    actions = ('export_csv', 'export_jsonl')
+    export_fields = ()
+    export_chunk_size = 2000
+
+    def export_rows(self, queryset):
+        return queryset.values_list(*self.export_fields).iterator(
+            chunk_size=self.export_chunk_size)
+
+    def export_response(self, content, content_type, extension):
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response['Content-Disposition'] = (
+            f'attachment; filename="{self.model._meta.model_name}'
+            f'.{extension}"')
+        return response
+
+    @admin.action(description='Выгрузить выбранные в CSV')
+    def export_csv(self, request, queryset):
+        writer = csv.writer(Echo())
+        content = (writer.writerow(row) for row in chain(
+            (self.export_fields,), self.export_rows(queryset)))
+        return self.export_response(content, 'text/csv', 'csv')
+
+    @admin.action(description='Выгрузить выбранные в JSON Lines')
+    def export_jsonl(self, request, queryset):
+        content = (
+            json.dumps(dict(zip(self.export_fields, row)),
+                       cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+            for row in self.export_rows(queryset))
+        return self.export_response(
+            content, 'application/x-ndjson', 'jsonl')
@@ -0,0 +1,39 @@
+"""Bloom filter: a set, which can answer that a value was added when it
+wasn't, with the error rate it was sized for, but never answers that
+an added value is missing."""
+import hashlib
+import math
+
+
+class BloomFilter:
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = max(capacity, 1)
+        size = math.ceil(-self.capacity * math.log(error_rate)
+                         / math.log(2) ** 2)
+        self.size = max(size // 8 + 1, 1) * 8
+        self.hashes = max(round(self.size / self.capacity * math.log(2)), 1)
+        self.bits = bytearray(self.size // 8)
+        self.count = 0
+
+    def positions(self, value):
+        # Double hashing: the k positions are combined from two hashes.
+        digest = hashlib.blake2b(str(value).encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + index * second) % self.size
+                for index in range(self.hashes)]
+
+    def add(self, value):
+        for position in self.positions(value):
+            self.bits[position // 8] |= 1 << position % 8
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(self.bits[position // 8] & 1 << position % 8
+                   for position in self.positions(value))
+
+    @property
+    def full(self):
+        """Holds more values than it was sized for, so errs more often."""
+        return self.count > self.capacity
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# Post card versions, page states and lookups of missing objects are
+# invalidated through these caches by the worker, which saved an object.
+SHARED_CACHES = ('default', 'lookups')
+PROCESS_LOCAL_BACKENDS = ('django.core.cache.backends.locmem.LocMemCache',)
+
+
+@register(Tags.caches)
+def check_shared_caches(app_configs, **kwargs):
+    """Without DEBUG the application runs in several worker processes,
+    which must share the invalidated caches."""
+    if settings.DEBUG:
+        return []
+    return [
+        Error(f'The {alias!r} cache is local to the worker process, other '
+              'workers keep serving stale pages after an object changes.',
+              hint='Use a shared backend, e.g. Memcached.',
+              id='core.E001')
+        for alias in SHARED_CACHES
+        if settings.CACHES.get(alias, {}).get('BACKEND')
+        in PROCESS_LOCAL_BACKENDS
+    ]
@@ -0,0 +1,80 @@
+"""Hole punching: user-specific parts of pages shared by all users.
+
+With the HOLE_PUNCHING setting on, `{% hole %}` renders a placeholder
+instead of its content, so the page neither reads the session nor
+embeds a CSRF token and can be stored by shared caches. holes.js fills
+all placeholders of the page with HTML of the `holes` view, which
+renders them for the current user in one request. With the setting
+off holes are rendered inline.
+"""
+from collections import defaultdict
+
+from django.core.exceptions import ValidationError
+from django.template import Engine, RequestContext
+
+MAX_HOLES = 200
+
+registry = {}
+
+
+class Hole:
+    """Template fragment, which depends on the user and the objects of
+    `models` passed as arguments."""
+
+    name = None
+    template_name = None
+    models = ()
+
+    def get_context(self, request, *objects):
+        return {}
+
+    def render(self, context, *objects):
+        template = context.template.engine.get_template(self.template_name)
+        with context.push(self.get_context(context.request, *objects)):
+            return template.render(context)
+
+
+def register(hole_class):
+    registry[hole_class.name] = hole_class()
+    return hole_class
+
+
+def hole_key(name, objects):
+    return ':'.join([name, *(str(obj.pk) for obj in objects)])
+
+
+def parse_key(key):
+    """Return the hole and the primary keys of its objects."""
+    name, *pks = key.split(':')
+    hole = registry[name]
+    if len(pks) != len(hole.models):
+        raise ValueError(key)
+    return hole, [model._meta.pk.to_python(pk)
+                  for model, pk in zip(hole.models, pks)]
+
+
+def render_holes(request, keys):
+    """Render holes `keys` for the user of `request`, loading their
+    objects with one query per model. Unknown keys and keys of missing
+    objects are skipped."""
+    holes, pks = [], defaultdict(set)
+    for key in keys[:MAX_HOLES]:
+        try:
+            hole, hole_pks = parse_key(key)
+        except (KeyError, ValueError, ValidationError):
+            continue
+        holes.append((key, hole, hole_pks))
+        for model, pk in zip(hole.models, hole_pks):
+            pks[model].add(pk)
+    objects = {model: model._default_manager.in_bulk(model_pks)
+               for model, model_pks in pks.items()}
+    context = RequestContext(request)
+    # The context has to be bound to a template, see Hole.render().
+    with context.bind_template(Engine.get_default().from_string('')):
+        rendered = {}
+        for key, hole, hole_pks in holes:
+            found = [objects[model].get(pk)
+                     for model, pk in zip(hole.models, hole_pks)]
+            if None not in found:
+                rendered[key] = hole.render(context, *found)
+    return rendered
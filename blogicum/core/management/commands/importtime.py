@@ -0,0 +1,92 @@
+import os
+import re
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+IMPORT_LINE = re.compile(
+    r'^import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \| '
+    r'(?P<indent> *)(?P<name>\S+)$')
+BOOT_CODE = ('import sys; sys.path.insert(0, {path!r}); '
+             'from {module} import application')
+
+
+class ImportNode:
+
+    def __init__(self, name, self_us=0, cumulative_us=0):
+        self.name = name
+        self.self_us = self_us
+        self.cumulative_us = cumulative_us
+        self.children = []
+
+
+def parse_importtime(lines):
+    """Build the import tree of `python -X importtime` output.
+
+    A module is printed after all modules it imported, one level of
+    nesting is two spaces of indent.
+    """
+    root = ImportNode('<boot>')
+    pending = {}
+    for line in lines:
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        level = len(match['indent']) // 2
+        node = ImportNode(match['name'], int(match['self']),
+                          int(match['cumulative']))
+        node.children = pending.pop(level + 1, [])
+        pending.setdefault(level, []).append(node)
+    root.children = pending.pop(0, [])
+    root.cumulative_us = sum(node.cumulative_us for node in root.children)
+    return root
+
+
+def count_modules(node):
+    return len(node.children) + sum(
+        count_modules(child) for child in node.children)
+
+
+class Command(BaseCommand):
+    help = ('Boots the WSGI application in a new interpreter with '
+            '`-X importtime` and prints the import tree.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-ms', type=float, default=5,
+            help='Hide imports whose cumulative time is below this.')
+        parser.add_argument(
+            '--depth', type=int, default=6,
+            help='Maximum depth of the printed tree.')
+
+    def handle(self, *args, min_ms, depth, **options):
+        module = settings.WSGI_APPLICATION.rpartition('.')[0]
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c',
+             BOOT_CODE.format(path=str(settings.BASE_DIR), module=module)],
+            env={**os.environ,
+                 'DJANGO_SETTINGS_MODULE': os.environ.get(
+                     'DJANGO_SETTINGS_MODULE', 'blogicum.settings')},
+            capture_output=True, text=True)
+        if result.returncode:
+            raise CommandError(result.stderr.strip().splitlines()[-1])
+        root = parse_importtime(result.stderr.splitlines())
+        self.stdout.write(
+            f'{count_modules(root)} modules imported in '
+            f'{root.cumulative_us / 1000:.1f} ms')
+        self.write_tree(root, min_ms * 1000, depth, level=0)
+
+    def write_tree(self, node, min_us, depth, level):
+        if level >= depth:
+            return
+        for child in sorted(node.children,
+                            key=lambda child: -child.cumulative_us):
+            if child.cumulative_us < min_us:
+                break
+            self.stdout.write(
+                f'{child.cumulative_us / 1000:>9.1f} ms '
+                f'{child.self_us / 1000:>8.1f} ms  '
+                f"{'  ' * level}{child.name}")
+            self.write_tree(child, min_us, depth, level + 1)
@@ -0,0 +1,41 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+
+from core.memory import stats
+
+
+class Command(BaseCommand):
+    help = ('Requests the given URLs with memory profiling turned on and '
+            'prints peak and retained allocations per URL name.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='*', metavar='url', default=['/'])
+        parser.add_argument(
+            '--repeat', type=int, default=3,
+            help='Number of requests to every URL.')
+        parser.add_argument(
+            '--user', help='Username to make the requests as.')
+        parser.add_argument(
+            '--limit', type=int, default=10,
+            help='Number of URL names to print.')
+        parser.add_argument(
+            '--sites', type=int, default=5,
+            help='Number of allocation sites to print per URL name.')
+
+    def handle(self, *args, urls, repeat, user, limit, sites, **options):
+        client = Client()
+        if user:
+            try:
+                client.force_login(
+                    get_user_model().objects.get(username=user))
+            except get_user_model().DoesNotExist:
+                raise CommandError(f'Пользователь {user} не найден.')
+        stats.reset()
+        # Without DEBUG, so debug_toolbar does not keep its panels.
+        with override_settings(DEBUG=False, MEMORY_PROFILING=True,
+                               ALLOWED_HOSTS=['testserver']):
+            for _ in range(repeat):
+                for url in urls:
+                    client.get(url)
+        self.stdout.write(stats.report(limit, sites))
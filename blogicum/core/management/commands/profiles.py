@@ -0,0 +1,75 @@
+import pstats
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.profiling import list_profiles, load_stats, profiles_dir
+
+METRICS = {'tottime': 1, 'cumtime': 2}
+
+
+class Command(BaseCommand):
+    help = ('Lists, shows and compares request profiles stored by '
+            'ProfilingMiddleware.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'action', nargs='?', default='list',
+            choices=('list', 'show', 'diff'),
+            help='list: all profiles; show ID: the slowest functions; '
+                 'diff ID ID: functions whose time changed the most.')
+        parser.add_argument('profile_ids', nargs='*', metavar='id')
+        parser.add_argument(
+            '--sort', default='cumtime', choices=tuple(METRICS),
+            help='Function time to sort by.')
+        parser.add_argument(
+            '--limit', type=int, default=25,
+            help='Number of functions to print.')
+
+    def handle(self, *args, action, profile_ids, **options):
+        expected = {'list': 0, 'show': 1, 'diff': 2}[action]
+        if len(profile_ids) != expected:
+            raise CommandError(
+                f'{action} принимает идентификаторов профилей: {expected}.')
+        try:
+            getattr(self, action)(*profile_ids, **options)
+        except FileNotFoundError as error:
+            raise CommandError(error)
+
+    def list(self, **options):
+        profiles = list_profiles()
+        if not profiles:
+            self.stdout.write(f'Профилей в {profiles_dir()} нет.')
+        for meta in profiles:
+            self.stdout.write(
+                f"{meta['id']}  {meta['duration_ms']:>9.2f} ms  "
+                f"{meta['status']}  {meta['method']} {meta['path']}  "
+                f"({meta['view']}, {meta['user']})")
+
+    def show(self, profile_id, sort, limit, **options):
+        stats = load_stats(profile_id)
+        index = METRICS[sort]
+        self.stdout.write(f"{'calls':>9} {'tottime':>10} {'cumtime':>10}")
+        for func, values in sorted(
+                stats.items(), key=lambda item: -item[1][index])[:limit]:
+            calls, tottime, cumtime = values
+            self.stdout.write(
+                f'{calls:>9} {tottime * 1000:>10.2f} {cumtime * 1000:>10.2f}'
+                f'  {pstats.func_std_string(func)}')
+
+    def diff(self, before_id, after_id, sort, limit, **options):
+        before, after = load_stats(before_id), load_stats(after_id)
+        index = METRICS[sort]
+        missing = (0, 0.0, 0.0)
+        deltas = sorted(
+            ((after.get(func, missing)[index]
+              - before.get(func, missing)[index], func)
+             for func in before.keys() | after.keys()),
+            key=lambda item: -abs(item[0]))
+        self.stdout.write(
+            f"{'delta':>10} {'before':>10} {'after':>10} {'calls':>15}")
+        for delta, func in deltas[:limit]:
+            old, new = before.get(func, missing), after.get(func, missing)
+            self.stdout.write(
+                f'{delta * 1000:>+10.2f} {old[index] * 1000:>10.2f} '
+                f'{new[index] * 1000:>10.2f} {old[0]:>7}->{new[0]:<7}'
+                f'  {pstats.func_std_string(func)}')
@@ -0,0 +1,52 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+from core.slow_queries import read_entries
+
+
+class Command(BaseCommand):
+    help = ('Groups the slow query log by normalized query fingerprint '
+            'and prints the groups with the largest total time.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--log',
+            help='Slow query log to read instead of SLOW_QUERY_LOG.')
+        parser.add_argument(
+            '--limit', type=int, default=10,
+            help='Number of query groups to print.')
+
+    def handle(self, *args, log, limit, **options):
+        groups = defaultdict(list)
+        for entry in read_entries(log):
+            groups[entry['fingerprint']].append(entry)
+        if not groups:
+            self.stdout.write('Медленных запросов нет.')
+        ranked = sorted(
+            groups.items(),
+            key=lambda item: -sum(entry['duration_ms'] for entry in item[1]))
+        for fingerprint, entries in ranked[:limit]:
+            self.write_group(fingerprint, entries)
+
+    def write_group(self, fingerprint, entries):
+        durations = [entry['duration_ms'] for entry in entries]
+        slowest = max(entries, key=lambda entry: entry['duration_ms'])
+        views = sorted({entry['view'] for entry in entries})
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'{fingerprint}: {len(entries)} x, '
+            f'total {sum(durations):.1f} ms, '
+            f'avg {sum(durations) / len(durations):.1f} ms, '
+            f'max {max(durations):.1f} ms'))
+        self.stdout.write(f"  views: {', '.join(views)}")
+        self.stdout.write(f"  sql: {slowest['sql']}")
+        if slowest['template']:
+            self.stdout.write(f"  template: {slowest['template']}")
+        for frame in slowest['stack']:
+            self.stdout.write(f'  at {frame}')
+        for row in slowest['plan']:
+            # A full scan instead of an index search hints at an index.
+            style = (self.style.WARNING if ' SCAN ' in f' {row} '
+                     else self.style.SQL_KEYWORD)
+            self.stdout.write(style(f'  plan: {row}'))
+        self.stdout.write('')
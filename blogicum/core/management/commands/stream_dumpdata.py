@@ -0,0 +1,88 @@
+import json
+from itertools import islice
+
+from django.apps import apps
+from django.core import serializers
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS
+
+
+class Command(BaseCommand):
+    help = ('Outputs the contents of the database as a JSON fixture, '
+            'reading rows with a server-side iterator.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'args', metavar='app_label', nargs='*',
+            help='Restricts dumped data to the specified app_label or '
+                 'app_label.ModelName.')
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help='Nominates a specific database to dump fixtures from.')
+        parser.add_argument(
+            '--indent', type=int,
+            help='Specifies the indent level to use when pretty-printing '
+                 'output.')
+        parser.add_argument(
+            '--batch-size', type=int, default=2000,
+            help='Number of rows fetched and serialized at once.')
+        parser.add_argument(
+            '-o', '--output',
+            help='Specifies file to which the output is written.')
+
+    def get_models(self, labels):
+        if not labels:
+            app_list = [(config, None) for config in apps.get_app_configs()
+                        if config.models_module is not None]
+        else:
+            app_list = []
+            for label in labels:
+                app_label, _, model_name = label.partition('.')
+                try:
+                    config = apps.get_app_config(app_label)
+                    models = ([config.get_model(model_name)]
+                              if model_name else None)
+                except LookupError as error:
+                    raise CommandError(error)
+                app_list.append((config, models))
+        return [model for model in serializers.sort_dependencies(app_list)
+                if model._meta.managed and not model._meta.proxy]
+
+    def iter_objects(self, model, using, batch_size):
+        serializer = serializers.get_serializer('python')()
+        rows = model._base_manager.using(using).order_by('pk').iterator(
+            chunk_size=batch_size)
+        while True:
+            chunk = list(islice(rows, batch_size))
+            if not chunk:
+                return
+            yield from serializer.serialize(chunk)
+
+    def handle(self, *app_labels, **options):
+        output = options['output']
+        if output:
+            stream = open(output, 'w', encoding='utf-8')
+        else:
+            # Like in dumpdata, so writes don't end with a newline.
+            self.stdout.ending = None
+            stream = self.stdout
+        try:
+            self.dump(stream, self.get_models(app_labels), options)
+        finally:
+            if output:
+                stream.close()
+
+    def dump(self, stream, models, options):
+        indent = options['indent']
+        separator = '\n' if indent is not None else ''
+        stream.write('[')
+        first = True
+        for model in models:
+            for obj in self.iter_objects(
+                    model, options['database'], options['batch_size']):
+                stream.write(separator if first else ',' + separator)
+                stream.write(json.dumps(obj, cls=DjangoJSONEncoder,
+                                        ensure_ascii=False, indent=indent))
+                first = False
+        stream.write(separator + ']' + separator)
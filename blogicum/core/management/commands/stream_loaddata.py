@@ -0,0 +1,165 @@
+import json
+from collections import defaultdict
+
+from django.core import serializers
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from core.signals import bulk_inserted, bulk_updated
+from core.utils import raw_bulk_insert
+
+READ_SIZE = 1 << 16
+# Larger undecodable rest of the buffer means malformed JSON, which
+# would otherwise be read up to the end of the file.
+MAX_ITEM_SIZE = 1 << 24
+
+SEPARATORS = ' \t\r\n,'
+
+
+def decode_items(decoder, buffer):
+    """Decode complete array items at the start of `buffer`.
+
+    Returns the items, the position of the undecoded rest and whether
+    the end of the array was reached.
+    """
+    items = []
+    pos = 0
+    while True:
+        while pos < len(buffer) and buffer[pos] in SEPARATORS:
+            pos += 1
+        if pos == len(buffer):
+            return items, pos, False
+        if buffer[pos] == ']':
+            return items, pos, True
+        try:
+            item, pos = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            return items, pos, False
+        items.append(item)
+
+
+def iter_json_array(stream, read_size=READ_SIZE,
+                    max_item_size=MAX_ITEM_SIZE):
+    """Yield items of a top-level JSON array without reading the whole
+    document into memory. An item may take up to `max_item_size`
+    characters."""
+    decoder = json.JSONDecoder()
+    buffer = stream.read(read_size).lstrip()
+    if not buffer.startswith('['):
+        raise CommandError('Fixture must be a JSON array.')
+    buffer = buffer[1:]
+    while True:
+        items, pos, finished = decode_items(decoder, buffer)
+        yield from items
+        if finished:
+            return
+        chunk = stream.read(read_size)
+        if not chunk:
+            raise CommandError('Unexpected end of fixture.')
+        buffer = buffer[pos:]
+        if len(buffer) > max_item_size:
+            raise CommandError(
+                f'Malformed fixture or an object longer than '
+                f'{max_item_size} characters.')
+        buffer += chunk
+
+
+class Command(BaseCommand):
+    help = ('Installs the named JSON fixtures in the database with '
+            'bulk inserts, reading them incrementally.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('args', nargs='+', metavar='fixture')
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help='Nominates a specific database to load fixtures into.')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of objects of one model inserted at once.')
+        parser.add_argument(
+            '-i', '--ignorenonexistent', action='store_true',
+            help='Ignores entries in the serialized data for fields that '
+                 'do not currently exist on the model.')
+
+    def handle(self, *fixtures, **options):
+        self.using = options['database']
+        self.batch_size = options['batch_size']
+        self.ignore = options['ignorenonexistent']
+        self.models = set()
+        self.inserted = set()
+        self.updated = defaultdict(list)
+        self.loaded = 0
+        connection = connections[self.using]
+        with transaction.atomic(using=self.using):
+            with connection.constraint_checks_disabled():
+                for fixture in fixtures:
+                    self.load(fixture)
+            connection.check_constraints(
+                table_names=[model._meta.db_table for model in self.models])
+            sequence_sql = connection.ops.sequence_reset_sql(
+                no_style(), self.models)
+            with connection.cursor() as cursor:
+                for line in sequence_sql:
+                    cursor.execute(line)
+        self.send_signals()
+        self.stdout.write(
+            f'Installed {self.loaded} object(s) from '
+            f'{len(fixtures)} fixture(s)')
+
+    def load(self, fixture):
+        pending = defaultdict(list)
+        with open(fixture, encoding='utf-8') as stream:
+            objects = serializers.deserialize(
+                'python', iter_json_array(stream), using=self.using,
+                ignorenonexistent=self.ignore)
+            for obj in objects:
+                model = type(obj.object)
+                pending[model].append(obj)
+                if len(pending[model]) >= self.batch_size:
+                    self.flush(model, pending.pop(model))
+        for model, batch in pending.items():
+            self.flush(model, batch)
+
+    def flush(self, model, batch):
+        """Insert new and update already existing objects of `batch`.
+
+        New rows are inserted in raw mode, like `loaddata` does, so
+        `auto_now` and `auto_now_add` values come from the fixture.
+        """
+        self.models.add(model)
+        manager = model._base_manager.using(self.using)
+        instances = [obj.object for obj in batch]
+        existing = set(manager.filter(
+            pk__in=[instance.pk for instance in instances]
+        ).values_list('pk', flat=True))
+        new = [instance for instance in instances
+               if instance.pk not in existing]
+        raw_bulk_insert(model, new, self.using)
+        if new:
+            self.inserted.add(model)
+        self.updated[model].extend(existing)
+        update_fields = [field.name
+                         for field in model._meta.local_concrete_fields
+                         if not field.primary_key]
+        if existing and update_fields:
+            manager.bulk_update(
+                [instance for instance in instances
+                 if instance.pk in existing],
+                update_fields, batch_size=self.batch_size)
+        for obj in batch:
+            for name, values in obj.m2m_data.items():
+                if values:
+                    getattr(obj.object, name).set(values)
+        self.loaded += len(batch)
+
+    def send_signals(self):
+        """Rows are written past save(), so the caches are invalidated
+        like after bulk updates of the admin."""
+        for model, pks in self.updated.items():
+            for start in range(0, len(pks), self.batch_size):
+                bulk_updated.send(
+                    sender=model, pks=pks[start:start + self.batch_size],
+                    values=None)
+        for model in self.inserted:
+            bulk_inserted.send(sender=model)
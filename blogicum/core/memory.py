@@ -0,0 +1,87 @@
+"""Memory allocated by views, measured by MemoryProfilingMiddleware.
+
+tracemalloc traces the whole process, so run the measured worker with
+a single thread, otherwise allocations of concurrent requests are
+attributed to each other. Every worker keeps its own statistics and
+logs the report every MEMORY_REPORT_EVERY measured requests.
+"""
+import tracemalloc
+from collections import Counter, defaultdict
+
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+SITES_PER_REQUEST = 10
+# Allocation sites kept per view, the smallest ones are dropped.
+MAX_SITES = 50
+
+
+def kib(size):
+    return size / 1024
+
+
+class ViewMemory:
+
+    def __init__(self):
+        self.requests = 0
+        self.peak_total = 0
+        self.peak_max = 0
+        self.retained_total = 0
+        self.sites = Counter()
+
+    def record(self, peak, retained, sites):
+        self.requests += 1
+        self.peak_total += peak
+        self.peak_max = max(self.peak_max, peak)
+        self.retained_total += retained
+        self.sites.update(sites)
+        if len(self.sites) > 2 * MAX_SITES:
+            self.sites = Counter(dict(self.sites.most_common(MAX_SITES)))
+
+
+class MemoryStats:
+    """Peak and retained allocations aggregated per URL name."""
+
+    def __init__(self):
+        self.views = defaultdict(ViewMemory)
+        self.requests = 0
+
+    def record(self, view, peak, retained, before, after):
+        self.requests += 1
+        differences = after.filter_traces(SNAPSHOT_FILTERS).compare_to(
+            before.filter_traces(SNAPSHOT_FILTERS), 'lineno')
+        sites = {
+            str(difference.traceback): difference.size_diff
+            for difference in differences[:SITES_PER_REQUEST]
+            if difference.size_diff > 0
+        }
+        self.views[view].record(peak, retained, sites)
+
+    def reset(self):
+        self.views.clear()
+        self.requests = 0
+
+    def report(self, limit=10, sites=5):
+        """Views with the largest average peak and their allocation sites
+        with the largest retained size."""
+        ranked = sorted(
+            self.views.items(),
+            key=lambda item: -item[1].peak_total / item[1].requests)
+        lines = [f"{'view':<32} {'requests':>8} {'avg peak KiB':>13} "
+                 f"{'max peak KiB':>13} {'avg retained KiB':>17}"]
+        for view, memory in ranked[:limit]:
+            lines.append(
+                f'{view:<32} {memory.requests:>8} '
+                f'{kib(memory.peak_total / memory.requests):>13.1f} '
+                f'{kib(memory.peak_max):>13.1f} '
+                f'{kib(memory.retained_total / memory.requests):>17.1f}')
+            for site, size in memory.sites.most_common(sites):
+                lines.append(
+                    f'    {kib(size / memory.requests):>10.1f} KiB  {site}')
+        return '\n'.join(lines)
+
+
+stats = MemoryStats()
@@ -0,0 +1,274 @@
+"""Prometheus metrics shared by all worker processes.
+
+Every thread of every process writes its values only to its own
+memory-mapped file `METRICS_DIR/metrics_<pid>_<thread>.db`, so
+increments take no locks. The files are summed up when `/metrics` is
+scraped. Clear METRICS_DIR
+when the application is deployed, otherwise counters of previous runs
+are summed up too.
+"""
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+
+HEADER = struct.Struct('Q')
+KEY_LENGTH = struct.Struct('I')
+VALUE = struct.Struct('d')
+
+DEFAULT_BUCKETS = (.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10,
+                   math.inf)
+
+
+def aligned(size):
+    return size + -size % 8
+
+
+class ValuesFile:
+    """Append-only file of (key, float) entries.
+
+    An entry is written before the used size in the header is updated,
+    so a reader never sees a half-written entry.
+    """
+
+    initial_size = 1 << 16
+
+    def __init__(self, path):
+        self.path = path
+        self.positions = {}
+        self._file = open(path, 'a+b')
+        if os.fstat(self._file.fileno()).st_size < self.initial_size:
+            self._file.truncate(self.initial_size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self._used = HEADER.unpack_from(self._map)[0] or HEADER.size
+        for key, position in iter_entries(self._map, self._used):
+            self.positions[key] = position
+
+    def inc(self, key, amount):
+        position = self.positions.get(key)
+        if position is None:
+            position = self._allocate(key)
+        value, = VALUE.unpack_from(self._map, position)
+        VALUE.pack_into(self._map, position, value + amount)
+
+    def _allocate(self, key):
+        encoded = key.encode()
+        position = self._used + aligned(KEY_LENGTH.size + len(encoded))
+        used = position + VALUE.size
+        if used > len(self._map):
+            self._grow(used)
+        KEY_LENGTH.pack_into(self._map, self._used, len(encoded))
+        self._map[self._used + KEY_LENGTH.size:
+                  self._used + KEY_LENGTH.size + len(encoded)] = encoded
+        VALUE.pack_into(self._map, position, 0.0)
+        self._used = used
+        HEADER.pack_into(self._map, 0, used)
+        self.positions[key] = position
+        return position
+
+    def _grow(self, size):
+        new_size = len(self._map)
+        while new_size < size:
+            new_size *= 2
+        self._map.close()
+        self._file.truncate(new_size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+def iter_entries(data, used):
+    """Yield (key, position of the value) of the entries in `data`."""
+    offset = HEADER.size
+    while offset < used:
+        length, = KEY_LENGTH.unpack_from(data, offset)
+        start = offset + KEY_LENGTH.size
+        position = offset + aligned(KEY_LENGTH.size + length)
+        yield bytes(data[start:start + length]).decode(), position
+        offset = position + VALUE.size
+
+
+def read_values(path):
+    data = Path(path).read_bytes()
+    if len(data) < HEADER.size:
+        return
+    used, = HEADER.unpack_from(data)
+    for key, position in iter_entries(data, used):
+        yield key, VALUE.unpack_from(data, position)[0]
+
+
+class ThreadValues(threading.local):
+    """Values file of the current thread, reopened after a fork or when
+    METRICS_DIR changes. A thread started later with the same ident
+    continues the file of the finished one."""
+
+    def __init__(self):
+        self._file = None
+        self._owner = None
+
+    def inc(self, key, amount=1.0):
+        owner = (os.getpid(), threading.get_ident(),
+                 str(settings.METRICS_DIR))
+        if self._owner != owner:
+            self._open(owner)
+        self._file.inc(key, amount)
+
+    def _open(self, owner):
+        if self._file is not None and self._owner[0] == owner[0]:
+            self._file.close()
+        pid, thread, directory = owner
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        self._file = ValuesFile(
+            Path(directory) / f'metrics_{pid}_{thread}.db')
+        self._owner = owner
+
+
+values = ThreadValues()
+registry = []
+
+
+def make_key(name, labels):
+    return encode_key(name, tuple(sorted(labels.items())))
+
+
+@lru_cache(maxsize=4096)
+def encode_key(name, labels):
+    return json.dumps([name, labels], ensure_ascii=False)
+
+
+class Metric:
+    """Base of the metric types, which define `samples(collected)`
+    returning (name, labels, value) for the exposition."""
+
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        registry.append(self)
+
+    def _labels(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f'{self.name} expects labels {self.labelnames}, '
+                f'got {tuple(labels)}.')
+        return {name: str(value) for name, value in labels.items()}
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        values.inc(make_key(self.name, self._labels(labels)), amount)
+
+    def samples(self, collected):
+        return [(self.name, labels, value)
+                for labels, value in collected.get(self.name, [])]
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(),
+                 buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+
+    def observe(self, amount, **labels):
+        labels = self._labels(labels)
+        bucket = next(bound for bound in self.buckets if amount <= bound)
+        values.inc(make_key(f'{self.name}_bucket',
+                            {**labels, 'le': format_float(bucket)}))
+        values.inc(make_key(f'{self.name}_sum', labels), amount)
+        values.inc(make_key(f'{self.name}_count', labels))
+
+    def samples(self, collected):
+        # Buckets are stored separately and made cumulative here.
+        per_labels = defaultdict(dict)
+        for labels, value in collected.get(f'{self.name}_bucket', []):
+            le = labels.pop('le')
+            per_labels[tuple(sorted(labels.items()))][le] = value
+        samples = []
+        for labels, counts in sorted(per_labels.items()):
+            total = 0
+            for bound in self.buckets:
+                total += counts.get(format_float(bound), 0)
+                samples.append((f'{self.name}_bucket',
+                                {**dict(labels), 'le': format_float(bound)},
+                                total))
+        for suffix in ('_sum', '_count'):
+            samples.extend(
+                (self.name + suffix, labels, value)
+                for labels, value in collected.get(self.name + suffix, []))
+        return samples
+
+
+def format_float(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value))
+
+
+def collect():
+    """Sum up the values files of all processes."""
+    totals = defaultdict(float)
+    for path in sorted(Path(settings.METRICS_DIR).glob('metrics_*.db')):
+        for key, value in read_values(path):
+            totals[key] += value
+    collected = defaultdict(list)
+    for key, value in totals.items():
+        name, labels = json.loads(key)
+        collected[name].append((dict(labels), value))
+    return collected
+
+
+def escape(value):
+    return (value.replace('\\', r'\\').replace('\n', r'\n')
+            .replace('"', r'\"'))
+
+
+def exposition():
+    """Render all registered metrics in the Prometheus text format."""
+    collected = collect()
+    lines = []
+    for metric in registry:
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.type}')
+        for name, labels, value in metric.samples(collected):
+            rendered = ','.join(f'{label}="{escape(label_value)}"'
+                                for label, label_value in labels.items())
+            lines.append(f'{name}{{{rendered}}} {format_float(value)}'
+                         if rendered else f'{name} {format_float(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+REQUESTS = Counter(
+    'blogicum_http_requests_total', 'Processed HTTP requests.',
+    ('view', 'method', 'status'))
+REQUEST_DURATION = Histogram(
+    'blogicum_http_request_duration_seconds', 'HTTP request latency.',
+    ('view',))
+DB_QUERIES = Counter(
+    'blogicum_db_queries_total', 'Executed SQL queries.', ('alias',))
+DB_QUERY_DURATION = Histogram(
+    'blogicum_db_query_duration_seconds', 'SQL query duration.',
+    ('alias',), buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1,
+                         .25, .5, 1, math.inf))
+CACHE_REQUESTS = Counter(
+    'blogicum_cache_requests_total', 'Cache lookups by result.',
+    ('alias', 'result'))
+SESSION_LOOKUPS = Counter(
+    'blogicum_session_lookups_total', 'Requests which loaded a session.')
+AUTH_LOOKUPS = Counter(
+    'blogicum_auth_lookups_total', 'Requests which resolved request.user.',
+    ('result',))
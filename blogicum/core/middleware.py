@@ -0,0 +1,304 @@
+import cProfile
+import logging
+import os
+import random
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+from functools import partial, wraps
+from types import MethodType
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.utils.functional import SimpleLazyObject, empty
+
+from core import metrics
+from core.memory import stats as memory_stats
+from core.profiling import save_profile
+from core.slow_queries import SlowQueryRecorder
+
+logger = logging.getLogger(__name__)
+
+CACHE_METHODS = ('get', 'set', 'add', 'delete', 'touch', 'incr', 'decr',
+                 'has_key', 'get_many', 'set_many', 'delete_many', 'clear')
+
+
+class RequestTimer:
+    """Accumulates self time per metric name: time of a nested
+    measurement (e.g. a query run while rendering a template) is
+    subtracted from the enclosing one."""
+
+    def __init__(self):
+        self.durations = defaultdict(float)
+        self.counts = Counter()
+        self._children = [0.0]
+
+    @contextmanager
+    def measure(self, name):
+        self._children.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._children.pop()
+            self._children[-1] += elapsed
+            self.durations[name] += elapsed - children
+            self.counts[name] += 1
+
+    def wrap(self, name, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.measure(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        with self.measure('db'):
+            return execute(sql, params, many, context)
+
+
+@contextmanager
+def patched_cache_methods(methods, decorate):
+    """Replace `methods` of every configured cache of the current thread
+    with `decorate(alias, name, method)` and restore them afterwards."""
+    patched = []
+    for alias in settings.CACHES:
+        cache = caches[alias]
+        for method in methods:
+            patched.append((cache, method, vars(cache).get(method)))
+            wrapper = decorate(alias, method, getattr(cache, method))
+            # Bound like the original method, since the debug_toolbar
+            # cache panel expects `__func__` on the methods it patches.
+            setattr(cache, method, MethodType(
+                lambda _, *args, wrapper=wrapper, **kwargs:
+                    wrapper(*args, **kwargs),
+                cache))
+    try:
+        yield
+    finally:
+        for cache, method, previous in reversed(patched):
+            if previous is None:
+                delattr(cache, method)
+            else:
+                setattr(cache, method, previous)
+
+
+class ServerTimingMiddleware:
+    """Measure time spent in the application, the database, templates
+    and caches for a sample of requests.
+
+    Sampled responses get a `Server-Timing` header and one logfmt line
+    is logged per request. The share of sampled requests is set by the
+    SERVER_TIMING_SAMPLE_RATE setting; unsampled requests are not
+    instrumented at all.
+    """
+
+    metrics = (('app', 'Application'), ('db', 'Database'),
+               ('tpl', 'Templates'), ('cache', 'Cache'))
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.SERVER_TIMING_SAMPLE_RATE:
+            return self.get_response(request)
+        timer = request.timer = RequestTimer()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(
+                    connection.execute_wrapper(timer.execute_wrapper))
+            stack.enter_context(patched_cache_methods(
+                CACHE_METHODS,
+                lambda alias, name, method: timer.wrap('cache', method)))
+            with timer.measure('app'):
+                response = self.get_response(request)
+        response['Server-Timing'] = self.server_timing(timer)
+        logger.info(self.log_line(request, response, timer))
+        return response
+
+    def process_template_response(self, request, response):
+        timer = getattr(request, 'timer', None)
+        if timer is not None:
+            response.render = timer.wrap('tpl', response.render)
+        return response
+
+    def server_timing(self, timer):
+        entries = [
+            f'{name};dur={timer.durations[name] * 1000:.2f};desc="{desc}"'
+            for name, desc in self.metrics
+        ]
+        total = sum(timer.durations.values())
+        entries.append(f'total;dur={total * 1000:.2f}')
+        return ', '.join(entries)
+
+    def log_line(self, request, response, timer):
+        match = request.resolver_match
+        fields = {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else '-',
+            'status': response.status_code,
+            'total_ms': f'{sum(timer.durations.values()) * 1000:.2f}',
+        }
+        for name, _ in self.metrics:
+            fields[f'{name}_ms'] = f'{timer.durations[name] * 1000:.2f}'
+        fields['queries'] = timer.counts['db']
+        fields['cache_calls'] = timer.counts['cache']
+        return ' '.join(f'{key}={value}' for key, value in fields.items())
+
+
+class MetricsMiddleware:
+    """Collect the metrics of `core.metrics` for every request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.local = threading.local()
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(
+                    partial(self.record_query, connection.alias)))
+            stack.enter_context(patched_cache_methods(
+                ('get', 'get_many'), self.count_cache_lookups))
+            response = self.get_response(request)
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        metrics.REQUESTS.inc(view=view, method=request.method,
+                             status=response.status_code)
+        metrics.REQUEST_DURATION.observe(time.perf_counter() - start,
+                                         view=view)
+        session = getattr(request, 'session', None)
+        if session is not None and session.accessed:
+            metrics.SESSION_LOOKUPS.inc()
+        user = getattr(request, 'user', None)
+        if isinstance(user, SimpleLazyObject) and user._wrapped is not empty:
+            metrics.AUTH_LOOKUPS.inc(
+                result='authenticated' if user.is_authenticated
+                else 'anonymous')
+        return response
+
+    @staticmethod
+    def record_query(alias, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            metrics.DB_QUERIES.inc(alias=alias)
+            metrics.DB_QUERY_DURATION.observe(time.perf_counter() - start,
+                                              alias=alias)
+
+    def count_cache_lookups(self, alias, name, method):
+        # BaseCache.get_many() calls get(), count only the outer call.
+        @wraps(method)
+        def wrapper(keys_or_key, *args, **kwargs):
+            if getattr(self.local, 'counting', False):
+                return method(keys_or_key, *args, **kwargs)
+            if name == 'get_many':
+                keys_or_key = list(keys_or_key)
+            self.local.counting = True
+            try:
+                result = method(keys_or_key, *args, **kwargs)
+            finally:
+                self.local.counting = False
+            if name == 'get_many':
+                hits = len(result)
+                misses = len(keys_or_key) - hits
+            else:
+                default = args[0] if args else kwargs.get('default')
+                hits = int(result is not default)
+                misses = 1 - hits
+            if hits:
+                metrics.CACHE_REQUESTS.inc(hits, alias=alias, result='hit')
+            if misses:
+                metrics.CACHE_REQUESTS.inc(misses, alias=alias,
+                                           result='miss')
+            return result
+        return wrapper
+
+
+class ProfilingMiddleware:
+    """Profile a single request of a staff user with cProfile.
+
+    The request is profiled when it has the `X-Profile` header or the
+    `_profile` query parameter. The id of the stored profile is returned
+    in the `X-Profile-Id` header, see `manage.py profiles`.
+    """
+
+    header = 'HTTP_X_PROFILE'
+    parameter = '_profile'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not self.requested(request):
+            return self.get_response(request)
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        response = profiler.runcall(self.get_response, request)
+        duration = time.perf_counter() - start
+        response['X-Profile-Id'] = save_profile(
+            profiler, request, response, duration)
+        return response
+
+    def requested(self, request):
+        return ((self.header in request.META
+                 or self.parameter in request.GET)
+                and request.user.is_staff)
+
+
+class SlowQueryMiddleware:
+    """Log queries slower than SLOW_QUERY_THRESHOLD_MS, which are made
+    by views of the SLOW_QUERY_NAMESPACES URL namespaces."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = SlowQueryRecorder(request,
+                                     settings.SLOW_QUERY_THRESHOLD_MS,
+                                     settings.SLOW_QUERY_NAMESPACES)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            return self.get_response(request)
+
+
+class MemoryProfilingMiddleware:
+    """Measure memory allocated by each request with tracemalloc, when
+    the MEMORY_PROFILING setting is on. The report of the worker is
+    logged every MEMORY_REPORT_EVERY requests, see also
+    `manage.py memory_report`.
+
+    Peak is the largest amount of memory traced during the request and
+    retained is what is still allocated after it, both relative to the
+    start of the request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.MEMORY_PROFILING:
+            return self.get_response(request)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        response = self.get_response(request)
+        current, peak = tracemalloc.get_traced_memory()
+        match = request.resolver_match
+        memory_stats.record(match.view_name if match else 'unresolved',
+                            peak - start, current - start,
+                            before, tracemalloc.take_snapshot())
+        if memory_stats.requests % settings.MEMORY_REPORT_EVERY == 0:
+            logger.info('memory report of worker %d:\n%s', os.getpid(),
+                        memory_stats.report())
+        return response
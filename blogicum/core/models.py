@@ -8,6 +8,8 @@ class PublishedCreatedModel(models.Model):
                                                  ' чтобы скрыть публикацию.')
     created_at = models.DateTimeField(auto_now_add=True,
                                       verbose_name='Добавлено')
+    updated_at = models.DateTimeField(auto_now=True, db_index=True,
+                                      verbose_name='Изменено')
 
     class Meta:
         ordering = ('-created_at',)
@@ -0,0 +1,96 @@
+"""Keyset pagination.
+
+A page is selected by the values of the ordering fields of the last
+row of the previous page instead of an OFFSET, so reading any page
+costs the same as reading the first one and rows inserted meanwhile
+don't shift the pages. The last field of the ordering has to be
+unique, e.g. the primary key.
+"""
+import base64
+import json
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(
+        json.dumps(values).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, count):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(
+            cursor + '=' * (-len(cursor) % 4)))
+    except ValueError as error:
+        raise InvalidCursor(cursor) from error
+    if not isinstance(values, list) or len(values) != count:
+        raise InvalidCursor(cursor)
+    return values
+
+
+class KeysetPage:
+
+    def __init__(self, object_list, next_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def keyset_page(queryset, ordering, cursor, size):
+    """Return the page of `size` rows of `queryset` ordered by
+    `ordering`, which follows the row `cursor` points at.
+
+    Raise InvalidCursor when `cursor` can't be decoded.
+    """
+    fields = [(name.lstrip('-'), name.startswith('-')) for name in ordering]
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        values = decode_cursor(cursor, len(fields))
+        try:
+            values = [queryset.model._meta.get_field(name).to_python(value)
+                      for (name, _), value in zip(fields, values)]
+        except ValidationError as error:
+            raise InvalidCursor(cursor) from error
+        queryset = queryset.filter(after(fields, values))
+    rows = list(queryset[:size + 1])
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        next_cursor = cursor_for(rows[-1], ordering)
+    return KeysetPage(rows, next_cursor)
+
+
+def cursor_for(obj, ordering):
+    """Cursor of the rows following `obj` in `ordering`."""
+    opts = obj._meta
+    return encode_cursor([opts.get_field(name.lstrip('-')).value_to_string(obj)
+                          for name in ordering])
+
+
+def after(fields, values):
+    """Q of the rows following `values` in the order of `fields`:
+    (a > x) OR (a = x AND b > y) OR ..."""
+    conditions = []
+    for index, (name, descending) in enumerate(fields):
+        equal = {field: value for (field, _), value
+                 in zip(fields[:index], values[:index])}
+        lookup = 'lt' if descending else 'gt'
+        conditions.append(
+            Q(**equal, **{f'{name}__{lookup}': values[index]}))
+    return reduce(or_, conditions)
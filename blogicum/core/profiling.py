@@ -0,0 +1,53 @@
+"""Storage of per-request profiles written by ProfilingMiddleware.
+
+Every profile is a `<id>.prof` file of pstats data, which snakeviz,
+flameprof or gprof2dot turn into a flame graph, and a `<id>.json` file
+with the request it was taken for.
+"""
+import json
+import pstats
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+
+def profiles_dir():
+    return Path(settings.PROFILES_DIR)
+
+
+def save_profile(profiler, request, response, duration):
+    directory = profiles_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    match = request.resolver_match
+    profile_id = (f'{timezone.now():%Y%m%d-%H%M%S}-'
+                  f'{uuid.uuid4().hex[:8]}')
+    profiler.dump_stats(directory / f'{profile_id}.prof')
+    meta = {
+        'id': profile_id,
+        'method': request.method,
+        'path': request.get_full_path(),
+        'view': match.view_name if match else None,
+        'status': response.status_code,
+        'user': request.user.get_username(),
+        'duration_ms': round(duration * 1000, 2),
+    }
+    (directory / f'{profile_id}.json').write_text(
+        json.dumps(meta, ensure_ascii=False))
+    return profile_id
+
+
+def list_profiles():
+    return [json.loads(path.read_text())
+            for path in sorted(profiles_dir().glob('*.json'))]
+
+
+def load_stats(profile_id):
+    """Return {(file, line, function): (calls, tottime, cumtime)}."""
+    path = profiles_dir() / f'{profile_id}.prof'
+    if not path.exists():
+        raise FileNotFoundError(f'Профиль {profile_id} не найден.')
+    stats = pstats.Stats(str(path)).stats
+    return {func: (calls, tottime, cumtime)
+            for func, (_, calls, tottime, cumtime, _) in stats.items()}
@@ -0,0 +1,10 @@
+from django.dispatch import Signal
+
+# Sent once per batch of a set-based UPDATE instead of post_save for
+# every row. Arguments: sender (model), pks, values (None when the rows
+# got different values).
+bulk_updated = Signal()
+
+# Sent once per model by commands, which insert rows in bulk instead of
+# saving them, after the commit. Arguments: sender (model).
+bulk_inserted = Signal()
@@ -0,0 +1,124 @@
+"""Log of SQL queries slower than SLOW_QUERY_THRESHOLD_MS.
+
+Queries are written as JSON lines to the `core.slow_queries` logger,
+which LOGGING sends to the file SLOW_QUERY_LOG. Every entry has the
+call site in the project code, the template line being rendered and
+the query plan, see `manage.py slow_queries`.
+
+The worker processes append to the same file, so it's rotated outside
+of the application, e.g. by logrotate with numbered backups
+(SLOW_QUERY_LOG.1, ...), which are read too. The handler reopens the
+file, when it's moved away.
+"""
+import hashlib
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.template.base import Node
+from django.utils import timezone
+
+from core.utils import normalize_sql
+
+logger = logging.getLogger(__name__)
+
+STACK_DEPTH = 5
+# Instrumentation frames, which are not the call site of a query.
+SKIPPED_FILES = {__file__, str(Path(__file__).with_name('middleware.py'))}
+
+
+def fingerprint(sql):
+    return hashlib.md5(normalize_sql(sql).encode()).hexdigest()[:12]
+
+
+def call_site(frame):
+    """Return the innermost project frames and the template line, which
+    is being rendered, of the stack starting at `frame`."""
+    project = str(settings.BASE_DIR)
+    stack, template = [], None
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (len(stack) < STACK_DEPTH and filename.startswith(project)
+                and filename not in SKIPPED_FILES):
+            stack.append(f'{filename[len(project) + 1:]}:{frame.f_lineno}'
+                         f' in {frame.f_code.co_name}')
+        node = frame.f_locals.get('self')
+        if (template is None and isinstance(node, Node)
+                and getattr(node, 'token', None) and node.origin):
+            template = f'{node.origin.template_name}:{node.token.lineno}'
+        frame = frame.f_back
+    return stack, template
+
+
+def explain(connection, sql, params):
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return []
+    # A cursor of the backend, so execute wrappers are not called again.
+    cursor = connection.create_cursor()
+    try:
+        cursor.execute(
+            f'{connection.ops.explain_query_prefix()} {sql}', params)
+        # SQLite prepends ids of the plan nodes to the description.
+        return [str(row[-1]) for row in cursor.fetchall()]
+    except Exception as error:
+        return [f'EXPLAIN failed: {error}']
+    finally:
+        cursor.close()
+
+
+class SlowQueryRecorder:
+    """Execute wrapper, which logs slow queries of the request's view."""
+
+    def __init__(self, request, threshold_ms, namespaces):
+        self.request = request
+        self.threshold = threshold_ms / 1000
+        self.namespaces = set(namespaces)
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            if duration >= self.threshold and self.watched():
+                self.record(sql, params, many, context['connection'],
+                            duration)
+
+    def watched(self):
+        match = self.request.resolver_match
+        return match is not None and bool(
+            self.namespaces.intersection(match.namespaces))
+
+    def record(self, sql, params, many, connection, duration):
+        stack, template = call_site(sys._getframe(2))
+        logger.warning(json.dumps({
+            'time': timezone.now().isoformat(),
+            'duration_ms': round(duration * 1000, 2),
+            'view': self.request.resolver_match.view_name,
+            'path': self.request.path,
+            'fingerprint': fingerprint(sql),
+            'sql': sql,
+            'params': [repr(value) for value in params or ()][:50],
+            'stack': stack,
+            'template': template,
+            'plan': [] if many else explain(connection, sql, params),
+        }, ensure_ascii=False))
+
+
+def read_entries(path=None):
+    """Yield the entries of the log and its rotated backups."""
+    path = Path(path or settings.SLOW_QUERY_LOG)
+    backups = sorted(
+        (backup for backup in path.parent.glob(f'{path.name}.*')
+         if backup.suffix[1:].isdigit()),
+        key=lambda backup: -int(backup.suffix[1:]))
+    for log_file in backups + [path]:
+        if not log_file.exists():
+            continue
+        with open(log_file, encoding='utf-8') as lines:
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
@@ -0,0 +1,29 @@
+(function () {
+  'use strict';
+
+  var url = document.currentScript.dataset.holesUrl;
+
+  // Replace placeholders of user-specific parts under `root` with their
+  // HTML for the current user, fetched in one request.
+  function fillHoles(root) {
+    var placeholders = root.querySelectorAll('[data-hole]');
+    if (!placeholders.length) {
+      return Promise.resolve();
+    }
+    var query = Array.prototype.map.call(placeholders, function (element) {
+      return 'h=' + encodeURIComponent(element.dataset.hole);
+    }).join('&');
+    return fetch(url + '?' + query, {credentials: 'same-origin'})
+      .then(function (response) { return response.json(); })
+      .then(function (holes) {
+        placeholders.forEach(function (element) {
+          element.outerHTML = holes[element.dataset.hole] || '';
+        });
+      });
+  }
+
+  window.fillHoles = fillHoles;
+  document.addEventListener('DOMContentLoaded', function () {
+    fillHoles(document);
+  });
+}());
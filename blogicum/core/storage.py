@@ -0,0 +1,48 @@
+"""Storage of the collected static files.
+
+collectstatic copies every file under a name with the hash of its
+content, so the files never change and are cached by browsers for good,
+see core.views.static_file. Text files additionally get gzip and brotli
+variants next to them, so they aren't compressed on every request.
+"""
+import gzip
+
+import brotli
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+from django.utils.functional import cached_property
+
+COMPRESSED_EXTENSIONS = ('.css', '.js', '.map', '.svg', '.ico', '.json',
+                         '.txt', '.html', '.xml')
+ENCODINGS = {
+    '.br': brotli.compress,
+    '.gz': lambda content: gzip.compress(content, compresslevel=9, mtime=0),
+}
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        names = set(paths) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if name.endswith(COMPRESSED_EXTENSIONS):
+                self.compress(name)
+
+    def compress(self, name):
+        with self.open(name) as file:
+            content = file.read()
+        for suffix, encode in ENCODINGS.items():
+            encoded = encode(content)
+            if len(encoded) >= len(content):
+                continue
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(encoded))
+
+    @cached_property
+    def immutable_names(self):
+        """Hashed names, which are served with far-future caching."""
+        return frozenset(self.hashed_files.values())
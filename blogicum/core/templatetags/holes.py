@@ -0,0 +1,29 @@
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.urls import reverse
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from core.holes import hole_key, registry
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def hole(context, name, *objects):
+    """Render the hole `name` inline, or its placeholder when the
+    HOLE_PUNCHING setting is on."""
+    if settings.HOLE_PUNCHING:
+        return format_html('<span data-hole="{}"></span>',
+                           hole_key(name, objects))
+    return mark_safe(registry[name].render(context, *objects))
+
+
+@register.simple_tag
+def holes_script():
+    if not settings.HOLE_PUNCHING:
+        return ''
+    return format_html('<script src="{}" data-holes-url="{}" defer>'
+                       '</script>', static('core/js/holes.js'),
+                       reverse('holes'))
@@ -0,0 +1,69 @@
+import re
+
+from django.db import connections
+
+
+def raw_bulk_insert(model, objs, using):
+    """Insert `objs` with multi-row INSERTs in raw mode.
+
+    Unlike `bulk_create`, values of `auto_now` and `auto_now_add`
+    fields are written as they are set on the objects. Primary keys
+    are written only when they are set.
+    """
+    if not objs:
+        return
+    fields = [field for field in model._meta.local_concrete_fields
+              if not (field.primary_key and objs[0].pk is None)]
+    manager = model._base_manager.db_manager(using)
+    size = max(connections[using].ops.bulk_batch_size(fields, objs), 1)
+    for start in range(0, len(objs), size):
+        manager._insert(objs[start:start + size], fields=fields,
+                        using=using, raw=True)
+
+
+def insert_rows(model, field_names, rows, using):
+    """Insert `rows` of values, already prepared for the database,
+    with a single executemany() and no model instances."""
+    connection = connections[using]
+    quote_name = connection.ops.quote_name
+    columns = [model._meta.get_field(name).column for name in field_names]
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        quote_name(model._meta.db_table),
+        ', '.join(quote_name(column) for column in columns),
+        ', '.join(['%s'] * len(columns)))
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+def normalize_sql(sql):
+    """Replace literals and placeholders, so queries which differ only
+    in values get the same text."""
+    sql = re.sub(r"'(?:[^']|'')*'", '?', sql)
+    sql = re.sub(r'\b\d+(?:\.\d+)?\b', '?', sql)
+    sql = sql.replace('%s', '?')
+    return re.sub(r'\((?:\?, )+\?\)', '(...)', sql)
+
+
+def first_values(querysets, using):
+    """Return the value of the first row of every one-column queryset of
+    `querysets`, which may belong to different models, or None for an
+    empty one, read with a single query of scalar subqueries."""
+    connection = connections[using]
+    parts, params, fields = [], [], []
+    for queryset in querysets:
+        sql, query_params = queryset[:1].query.get_compiler(using).as_sql()
+        parts.append(f'({sql})')
+        params.extend(query_params)
+        fields.append(
+            queryset.model._meta.get_field(queryset.query.values_select[0]))
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT {}'.format(', '.join(parts)), params)
+        row = cursor.fetchone()
+    values = []
+    for field, value in zip(fields, row):
+        column = field.get_col(field.model._meta.db_table)
+        for converter in (connection.ops.get_db_converters(column)
+                          + column.get_db_converters(connection)):
+            value = converter(value, column, connection)
+        values.append(value)
+    return values
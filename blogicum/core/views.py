@@ -0,0 +1,93 @@
+import hmac
+import posixpath
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import (Http404, HttpResponse, HttpResponseForbidden,
+                         JsonResponse)
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.static import serve
+
+from core.holes import render_holes
+from core.metrics import exposition
+
+
+def metrics_allowed(request):
+    if request.META.get('REMOTE_ADDR') in settings.METRICS_ALLOWED_IPS:
+        return True
+    token = settings.METRICS_TOKEN
+    return bool(token) and hmac.compare_digest(
+        request.META.get('HTTP_AUTHORIZATION', '').encode(),
+        f'Bearer {token}'.encode())
+
+
+def metrics(request):
+    if not metrics_allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(exposition(),
+                        content_type='text/plain; version=0.0.4; '
+                                     'charset=utf-8')
+
+
+def holes(request):
+    """HTML of the holes `h` of a shared page for the current user."""
+    response = JsonResponse(render_holes(request, request.GET.getlist('h')))
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+# Precompressed variants of the static files, in the order of preference.
+STATIC_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def accepted_encodings(header):
+    """Quality values of the codings in an Accept-Encoding header."""
+    qualities = {}
+    for item in header.split(','):
+        coding, *params = [part.strip() for part in item.split(';')]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    return qualities
+
+
+def preferred_encodings(header):
+    """Encodings of STATIC_ENCODINGS acceptable to the client, the ones
+    with higher quality first."""
+    qualities = accepted_encodings(header)
+    default = qualities.get('*', 0.0)
+    acceptable = [(encoding, suffix) for encoding, suffix in STATIC_ENCODINGS
+                  if qualities.get(encoding, default) > 0]
+    return sorted(acceptable,
+                  key=lambda item: -qualities.get(item[0], default))
+
+
+def static_file(request, path):
+    """Serve a collected static file, precompressed when the client
+    accepts it. Hashed names never change, so they are cached by
+    browsers without revalidation, see core.storage."""
+    name = posixpath.normpath(path).lstrip('/')
+    for encoding, suffix in preferred_encodings(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')):
+        try:
+            response = serve(request, name + suffix, settings.STATIC_ROOT)
+            break
+        except Http404:
+            pass
+    else:
+        response = serve(request, name, settings.STATIC_ROOT)
+    patch_vary_headers(response, ('Accept-Encoding',))
+    if name in getattr(staticfiles_storage, 'immutable_names', ()):
+        patch_cache_control(response, public=True, immutable=True,
+                            max_age=settings.STATIC_MAX_AGE)
+    else:
+        patch_cache_control(response, public=True, no_cache=True)
+    return response
@@ -0,0 +1,68 @@
+"""Work done once per worker at boot instead of on its first request."""
+import logging
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.template import TemplateSyntaxError, engines
+from django.template.utils import get_app_template_dirs
+from django.urls import URLResolver, get_resolver
+from django.utils import translation
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+def project_template_dirs():
+    """Template directories of the project, without third-party apps."""
+    base_dir = Path(settings.BASE_DIR)
+    dirs = [Path(directory) for engine in settings.TEMPLATES
+            for directory in engine.get('DIRS', [])]
+    dirs += [Path(directory) for directory in get_app_template_dirs(
+        'templates') if base_dir in Path(directory).parents]
+    return dirs
+
+
+def preload_templates():
+    """Compile the project templates, so the cached template loader
+    keeps them for every request."""
+    count = 0
+    for engine in engines.all():
+        for directory in project_template_dirs():
+            for path in sorted(directory.rglob('*.html')):
+                name = path.relative_to(directory).as_posix()
+                try:
+                    engine.get_template(name)
+                except TemplateSyntaxError as error:
+                    logger.warning('Шаблон %s не скомпилирован: %s',
+                                   name, error)
+                    continue
+                count += 1
+    return count
+
+
+def populate_resolvers(resolver=None):
+    """Import every URLconf and fill the reverse lookup tables."""
+    resolver = resolver or get_resolver()
+    resolver.reverse_dict
+    count = 1
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            count += populate_resolvers(pattern)
+    return count
+
+
+def warm_up():
+    start = time.perf_counter()
+    with translation.override(settings.LANGUAGE_CODE):
+        resolvers = populate_resolvers()
+        templates = preload_templates()
+    for primer in settings.WARMUP_PRIMERS:
+        # Caches left cold are filled by the requests, so the worker
+        # starts anyway.
+        try:
+            import_string(primer)()
+        except Exception:
+            logger.exception('Прогрев %s не выполнен', primer)
+    logger.info('Warm-up: %s URL resolvers, %s templates, %.1f ms',
+                resolvers, templates, (time.perf_counter() - start) * 1000)
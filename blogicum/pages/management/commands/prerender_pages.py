@@ -0,0 +1,48 @@
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.staticfiles.storage import (ManifestFilesMixin,
+                                                staticfiles_storage)
+from django.core.management.base import BaseCommand, CommandError
+from django.template.loader import render_to_string
+from django.test import RequestFactory, override_settings
+from django.urls import resolve, reverse
+
+from pages.prerendered import PAGES, REQUESTED_URL
+
+
+class Command(BaseCommand):
+    help = ('Renders the static and error pages to PRERENDERED_DIR. Run '
+            'it on deploy after collectstatic, the pages link the hashed '
+            'names of the static files.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', type=Path,
+                            default=settings.PRERENDERED_DIR)
+
+    def handle(self, *args, **options):
+        if (isinstance(staticfiles_storage, ManifestFilesMixin)
+                and not staticfiles_storage.hashed_files):
+            raise CommandError('Static files are not collected, run '
+                               'collectstatic first.')
+        directory = options['output']
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, (template_name, url_name) in PAGES.items():
+            path = directory / name
+            # Replaced at once, so workers never read a half written page.
+            temporary = path.with_name(f'.{name}.tmp')
+            temporary.write_text(self.render(template_name, url_name),
+                                 encoding='utf-8')
+            os.replace(temporary, path)
+            self.stdout.write(f'{template_name} -> {path}')
+
+    def render(self, template_name, url_name):
+        path = reverse(url_name) if url_name else '/'
+        request = RequestFactory().get(path)
+        request.user = AnonymousUser()
+        request.resolver_match = resolve(path) if url_name else None
+        with override_settings(HOLE_PUNCHING=True):
+            return render_to_string(
+                template_name, {'requested_url': REQUESTED_URL}, request)
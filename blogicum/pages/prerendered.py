@@ -0,0 +1,59 @@
+"""Pages rendered to static files at deploy time.
+
+`manage.py prerender_pages` writes the pages of PAGES to PRERENDERED_DIR.
+With the PRERENDERED_PAGES setting on, their views answer with these
+bytes without rendering templates or touching the database and the
+session. A worker reads a page once and again when prerender_pages
+replaces the file, so no restart is needed after a deploy. The header
+is rendered with HOLE_PUNCHING on, so it's filled in for the user by
+holes.js.
+"""
+import os
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.html import escape
+
+# File name: (template, URL name of the page).
+PAGES = {
+    'about.html': ('pages/about.html', 'pages:about'),
+    'rules.html': ('pages/rules.html', 'pages:rules'),
+    '404.html': ('pages/404.html', None),
+    '403csrf.html': ('pages/403csrf.html', None),
+    '500.html': ('pages/500.html', None),
+}
+
+# Rendered instead of the requested URL on the 404 page.
+REQUESTED_URL = '__requested_url__'
+
+
+# Path: (stat of the file, content) of the loaded pages.
+loaded = {}
+
+
+def load(path):
+    """Content of the file at `path` or None when it's missing. Missing
+    files aren't remembered, so a page is served once it's built."""
+    try:
+        stat = os.stat(path)
+        version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if path not in loaded or loaded[path][0] != version:
+            with open(path, 'rb') as page:
+                loaded[path] = (version, page.read())
+    except FileNotFoundError:
+        loaded.pop(path, None)
+        return None
+    return loaded[path][1]
+
+
+def prerendered_response(name, status=200, requested_url=''):
+    """Response with the prerendered page `name`, or None when the
+    setting is off or the page wasn't built."""
+    if not settings.PRERENDERED_PAGES:
+        return None
+    content = load(str(settings.PRERENDERED_DIR / name))
+    if content is None:
+        return None
+    content = content.replace(REQUESTED_URL.encode(),
+                              escape(requested_url).encode())
+    return HttpResponse(content, status=status)
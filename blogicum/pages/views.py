@@ -1,22 +1,40 @@
 from django.shortcuts import render
 from django.views.generic import TemplateView
 
+from pages.prerendered import prerendered_response
 
-class About(TemplateView):
+
+class PrerenderedMixin:
+    """Answer with the page built by `manage.py prerender_pages`."""
+
+    prerendered_name = None
+
+    def get(self, request, *args, **kwargs):
+        return (prerendered_response(self.prerendered_name)
+                or super().get(request, *args, **kwargs))
+
+
+class About(PrerenderedMixin, TemplateView):
     template_name = 'pages/about.html'
+    prerendered_name = 'about.html'
 
 
-class Rules(TemplateView):
+class Rules(PrerenderedMixin, TemplateView):
     template_name = 'pages/rules.html'
+    prerendered_name = 'rules.html'
 
 
 def page_not_found(request, *args, **kwargs):
-    return render(request, 'pages/404.html', status=404)
+    return (prerendered_response('404.html', 404,
+                                 request.build_absolute_uri())
+            or render(request, 'pages/404.html', status=404))
 
 
 def csrf_failure(request, *args, **kwargs):
-    return render(request, 'pages/403csrf.html', status=403)
+    return (prerendered_response('403csrf.html', 403)
+            or render(request, 'pages/403csrf.html', status=403))
 
 
 def internal_error(request, *args, **kwargs):
-    return render(request, 'pages/500.html', status=500)
+    return (prerendered_response('500.html', 500)
+            or render(request, 'pages/500.html', status=500))
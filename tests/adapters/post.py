@@ -26,6 +26,7 @@ class PostModelAdapter(StudentModelAdapter):
         return [
             "id",
             "created_at",
+            "updated_at",
             "is_published",
             "title",
             "text",
@@ -0,0 +1,83 @@
+import time
+from collections import defaultdict
+from typing import List, NamedTuple, Optional
+
+import pytest
+from django.db import connection
+
+from core.utils import normalize_sql
+
+RecordedQuery = NamedTuple(
+    "RecordedQuery", [("sql", str), ("duration", float)]
+)
+
+
+class QueryRecorder:
+    """`connection.execute_wrapper` callable, which records queries."""
+
+    def __init__(self):
+        self.queries: List[RecordedQuery] = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                RecordedQuery(sql, time.perf_counter() - start)
+            )
+
+    @property
+    def duration_ms(self) -> float:
+        return sum(query.duration for query in self.queries) * 1000
+
+
+def format_query_groups(queries: List[RecordedQuery]) -> str:
+    groups = defaultdict(list)
+    for query in queries:
+        groups[normalize_sql(query.sql)].append(query.duration)
+    lines = [
+        f"  {len(durations):>4} x {sum(durations) * 1000:8.2f} ms  {sql}"
+        for sql, durations in sorted(
+            groups.items(), key=lambda item: -len(item[1])
+        )
+    ]
+    return "\n".join(lines)
+
+
+def record_queries(client, url: str, **extra):
+    recorder = QueryRecorder()
+    with connection.execute_wrapper(recorder):
+        response = client.get(url, **extra)
+    return response, recorder
+
+
+@pytest.fixture
+def assert_query_budget():
+    """Request `url` and fail, printing query groups, when it makes
+    more than `max_queries` queries or they take more than `max_ms`."""
+
+    def check(
+            client, url: str, max_queries: int,
+            max_ms: Optional[float] = None
+    ) -> QueryRecorder:
+        response, recorder = record_queries(client, url)
+        assert response.status_code < 500, (
+            f"Страница {url} вернула ошибку {response.status_code}."
+        )
+        count = len(recorder.queries)
+        if count > max_queries:
+            pytest.fail(
+                f"Страница {url} выполняет {count} SQL-запросов,"
+                f" бюджет - {max_queries}:\n"
+                + format_query_groups(recorder.queries)
+            )
+        if max_ms is not None and recorder.duration_ms > max_ms:
+            pytest.fail(
+                f"SQL-запросы страницы {url} заняли"
+                f" {recorder.duration_ms:.1f} мс, бюджет - {max_ms} мс:\n"
+                + format_query_groups(recorder.queries)
+            )
+        return recorder
+
+    return check
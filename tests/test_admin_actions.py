@@ -0,0 +1,67 @@
+import pytest
+from mixer.backend.django import Mixer
+
+from core.admin import chunked_update
+from core.signals import bulk_updated
+
+
+@pytest.mark.django_db
+def test_chunked_update_sends_signal_per_batch(
+        mixer: Mixer, user, published_category
+):
+    posts = mixer.cycle(5).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+    )
+    batches = []
+
+    def receiver(sender, pks, values, **kwargs):
+        batches.append(pks)
+
+    bulk_updated.connect(receiver)
+    try:
+        PostModel = type(posts[0])
+        updated = chunked_update(
+            PostModel.objects.all(), batch_size=2, is_published=False)
+    finally:
+        bulk_updated.disconnect(receiver)
+    assert updated == 5
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert not PostModel.objects.filter(is_published=True).exists()
+
+
+@pytest.mark.django_db
+def test_move_to_category_action(
+        mixer: Mixer, client, user, published_category, another_category
+):
+    admin_user = mixer.blend(
+        "auth.User", is_staff=True, is_superuser=True)
+    client.force_login(admin_user)
+    posts = mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category)
+    client.post("/admin/blog/post/", {
+        "action": "move_to_category",
+        "index": "0",
+        "_selected_action": [post.pk for post in posts],
+        "category": another_category.pk,
+    })
+    assert another_category.posts.count() == 3
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("action", ["export_csv", "export_jsonl"])
+def test_export_is_streamed(mixer: Mixer, client, user, action):
+    admin_user = mixer.blend(
+        "auth.User", is_staff=True, is_superuser=True)
+    client.force_login(admin_user)
+    posts = mixer.cycle(3).blend("blog.Post", author=user)
+    response = client.post("/admin/blog/post/", {
+        "action": action,
+        "index": "0",
+        "_selected_action": [post.pk for post in posts],
+    })
+    assert response.streaming
+    content = b"".join(response.streaming_content).decode("utf-8")
+    for post in posts:
+        assert post.title in content
+    assert user.username in content
@@ -0,0 +1,87 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+from blog.constants import AUTOCOMPLETE_LIMIT
+
+
+@pytest.mark.django_db
+def test_autocomplete_prefix(mixer: Mixer, client):
+    mixer.blend("blog.Location", name="Москва", is_published=True)
+    mixer.blend("blog.Location", name="Минск", is_published=True)
+    mixer.blend("blog.Location", name="Мурманск", is_published=False)
+    mixer.blend("blog.Location", name="Осло", is_published=True)
+    response = client.get("/autocomplete/location/", {"term": "М"})
+    assert response.status_code == HTTPStatus.OK
+    names = [item["text"] for item in response.json()["results"]]
+    assert names == ["Минск", "Москва"], (
+        "Убедитесь, что автодополнение возвращает только опубликованные"
+        " местоположения, название которых начинается с введённой строки."
+    )
+
+
+@pytest.mark.django_db
+def test_autocomplete_limit(mixer: Mixer, client):
+    mixer.cycle(AUTOCOMPLETE_LIMIT + 1).blend(
+        "blog.Category", title=mixer.sequence("Категория {0}"),
+        is_published=True,
+    )
+    data = client.get("/autocomplete/category/", {"term": "Кат"}).json()
+    assert len(data["results"]) == AUTOCOMPLETE_LIMIT
+    assert data["more"]
+
+
+@pytest.mark.django_db
+def test_autocomplete_unknown_model(client):
+    response = client.get("/autocomplete/post/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_post_form_renders_only_selected_options(
+        user_client, published_locations
+):
+    response = user_client.get("/posts/create/")
+    content = response.content.decode("utf-8")
+    for location in published_locations:
+        assert location.name not in content, (
+            "Убедитесь, что форма создания публикации не выводит все"
+            " местоположения в выпадающем списке."
+        )
+    assert "/autocomplete/location/" in content
+
+
+@pytest.mark.django_db
+def test_invalid_choice_rerendered(user_client):
+    response = user_client.post("/posts/create/", {
+        "title": "Заголовок", "text": "Текст",
+        "pub_date": "2023-01-01 10:00", "category": "abc", "location": "1x",
+    })
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что форма с неверным значением связанного поля "
+        "выводится заново с ошибкой."
+    )
+    assert response.context["form"].errors["category"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("model_name, index", [
+    ("category", "blog_category_title_nocase"),
+    ("location", "blog_location_name_nocase"),
+])
+def test_autocomplete_uses_prefix_index(client, model_name, index):
+    with CaptureQueriesContext(connection) as queries:
+        client.get(f"/autocomplete/{model_name}/", {"term": "Мо"})
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {queries[-1]['sql']}")
+        plan = " ".join(row[-1] for row in cursor.fetchall())
+    assert f"SEARCH blog_{model_name} USING INDEX {index}" in plan, (
+        "Убедитесь, что автодополнение ищет по префиксу с помощью индекса,"
+        f" а не просматривает таблицу целиком: {plan}"
+    )
+    assert "TEMP B-TREE" not in plan, (
+        "Убедитесь, что результаты автодополнения упорядочены по индексу."
+    )
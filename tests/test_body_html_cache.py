@@ -0,0 +1,74 @@
+import pytest
+from django.core.cache import cache
+from django.template.defaultfilters import linebreaksbr
+
+from blog.cache import body_html, body_key
+from blog.constants import BODY_HTML_CACHE_MIN_LENGTH
+
+LONG_TEXT = 'Длинный <i>текст</i>\nпоста & ' * BODY_HTML_CACHE_MIN_LENGTH
+
+TEXTS = (
+    '',
+    'Одна строка',
+    'Первая\nвторая\r\nтретья\rчетвёртая\n\n',
+    '<script>alert("x")</script> & \'кавычки\' <b>жирный</b>',
+    '&amp; уже экранировано &lt;br&gt;\n',
+    '  пробелы\t\tи табы  \n\n\n',
+    'эмодзи 🙂 и неразрывный пробел разделитель',
+)
+
+
+@pytest.mark.parametrize('text', TEXTS)
+def test_body_html_matches_linebreaksbr(text):
+    cache.clear()
+    # Дополняем текст до длины, с которой HTML кешируется.
+    text += ' ' * BODY_HTML_CACHE_MIN_LENGTH
+    expected = linebreaksbr(text, autoescape=True)
+    assert body_html(text) == expected, (
+        'Убедитесь, что HTML текста совпадает с выводом фильтра '
+        '`linebreaksbr`.'
+    )
+    assert cache.get(body_key(text)) == expected, (
+        'Убедитесь, что HTML длинного текста сохраняется в кеш.'
+    )
+    assert body_html(text) == expected, (
+        'Убедитесь, что HTML текста из кеша совпадает с выводом фильтра '
+        '`linebreaksbr`.'
+    )
+
+
+@pytest.mark.django_db
+def test_long_body_html_cached_on_write(
+        user_client, mixer, user, published_category, published_location
+):
+    cache.clear()
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location, pub_date=user.date_joined,
+        text=LONG_TEXT,
+    )
+    comment = mixer.blend(
+        'blog.Comment', post=post, author=user, text='Комментарий\n& ещё',
+    )
+    assert cache.get(body_key(post.text)) == linebreaksbr(post.text), (
+        'Убедитесь, что HTML длинного текста поста сохраняется в кеш при '
+        'записи.'
+    )
+    assert cache.get(body_key(comment.text)) is None, (
+        'Убедитесь, что короткие тексты, например комментарии, не '
+        'кешируются: их быстрее отрендерить, чем получить из кеша.'
+    )
+    long_comment = mixer.blend(
+        'blog.Comment', post=post, author=user, text=LONG_TEXT[::-1],
+    )
+    assert cache.get(body_key(long_comment.text)) == linebreaksbr(
+        long_comment.text), (
+        'Убедитесь, что HTML длинного комментария сохраняется в кеш при '
+        'записи.'
+    )
+    content = user_client.get(f'/posts/{post.pk}/').content.decode()
+    for text in (post.text, comment.text, long_comment.text):
+        assert str(linebreaksbr(text)) in content, (
+            'Убедитесь, что на странице поста текст поста и комментариев '
+            'выводится так же, как фильтром `linebreaksbr`.'
+        )
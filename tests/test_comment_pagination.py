@@ -0,0 +1,77 @@
+import re
+
+import pytest
+
+from blog.constants import COMMENTS_PER_PAGE
+from blog.models import Comment
+from fixtures.queries import record_queries
+
+LOAD_MORE = re.compile(r'data-load-more="([^"]+)"')
+COMMENT_ID = re.compile(r'name="comment_(\d+)"')
+
+
+@pytest.fixture
+def post(mixer, user, published_category, published_location):
+    return mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location, pub_date=user.date_joined,
+        is_published=True,
+    )
+
+
+def add_comments(post, author, count):
+    # Одинаковое время создания: порядок задаёт первичный ключ.
+    Comment.objects.bulk_create(
+        Comment(text=f'Комментарий {index}', post=post, author=author)
+        for index in range(count)
+    )
+
+
+@pytest.mark.django_db
+def test_comments_loaded_by_pages(user_client, user, post):
+    add_comments(post, user, COMMENTS_PER_PAGE * 2 + 5)
+    content = user_client.get(f'/posts/{post.pk}/').content.decode()
+    shown = COMMENT_ID.findall(content)
+    assert len(shown) == COMMENTS_PER_PAGE, (
+        'Убедитесь, что на странице поста выводится только первая '
+        'страница комментариев.'
+    )
+    while LOAD_MORE.search(content):
+        url = LOAD_MORE.search(content).group(1).replace('&amp;', '&')
+        response = user_client.get(url)
+        assert response.status_code == 200
+        content = response.content.decode()
+        assert '<html' not in content, (
+            'Убедитесь, что следующая страница комментариев возвращается '
+            'без шаблона страницы.'
+        )
+        shown += COMMENT_ID.findall(content)
+    expected = [str(pk) for pk in post.comments.order_by(
+        'created_at', 'pk').values_list('pk', flat=True)]
+    assert shown == expected, (
+        'Убедитесь, что кнопка «Показать ещё» по очереди загружает все '
+        'комментарии без повторов и пропусков.'
+    )
+
+
+@pytest.mark.django_db
+def test_detail_queries_independent_of_comments(user_client, user, post):
+    add_comments(post, user, 3)
+    # Состояния страниц заполняются в кеше первым запросом.
+    user_client.get(f'/posts/{post.pk}/')
+    _, few = record_queries(user_client, f'/posts/{post.pk}/')
+    add_comments(post, user, COMMENTS_PER_PAGE * 10)
+    _, many = record_queries(user_client, f'/posts/{post.pk}/')
+    assert len(few.queries) == len(many.queries), (
+        'Убедитесь, что число SQL-запросов страницы поста не зависит от '
+        'количества комментариев.'
+    )
+
+
+@pytest.mark.django_db
+def test_invalid_comments_cursor(user_client, post):
+    response = user_client.get(f'/posts/{post.pk}/comments/?after=broken')
+    assert response.status_code == 404, (
+        'Убедитесь, что для неверного курсора комментариев возвращается '
+        'ошибка 404.'
+    )
@@ -0,0 +1,153 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.http import http_date
+
+from blog import models
+from blog.models import Post
+from core.admin import chunked_update
+from fixtures.queries import record_queries
+
+
+@pytest.fixture
+def post(mixer, user, published_category, published_location):
+    cache.clear()
+    return mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location, pub_date=user.date_joined,
+        is_published=True,
+    )
+
+
+def revalidate(client, url, response):
+    return client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url, queries', [
+    ('/', 0), ('/category/{category}/', 0), ('/profile/{username}/', 0),
+    # Видимость поста проверяется до сравнения валидаторов.
+    ('/posts/{post}/', 1),
+])
+def test_unchanged_page_not_modified(
+        client, user, published_category, post, url, queries
+):
+    url = url.format(category=published_category.slug,
+                     username=user.username, post=post.pk)
+    response = client.get(url)
+    assert response.has_header('ETag') and response.has_header(
+        'Last-Modified'), (
+        f'Убедитесь, что страница `{url}` возвращает заголовки `ETag` и '
+        '`Last-Modified`.'
+    )
+    revalidated, recorder = record_queries(
+        client, url, HTTP_IF_NONE_MATCH=response['ETag'])
+    assert revalidated.status_code == 304, (
+        f'Убедитесь, что неизменившаяся страница `{url}` возвращает '
+        'ответ 304.'
+    )
+    assert len(recorder.queries) == queries, (
+        'Убедитесь, что ответ 304 формируется без запросов к базе данных.'
+    )
+    modified_since = client.get(
+        url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+    assert modified_since.status_code == 304, (
+        'Убедитесь, что страница поддерживает заголовок '
+        '`If-Modified-Since`.'
+    )
+
+
+@pytest.mark.django_db
+def test_changes_invalidate_etag(client, user, mixer, post):
+    url = f'/posts/{post.pk}/'
+    response = client.get(url)
+    post.title = 'Новый заголовок'
+    post.save()
+    response = revalidate(client, url, response)
+    assert response.status_code == 200, (
+        'Убедитесь, что после изменения поста страница отдаётся заново.'
+    )
+    comment = mixer.blend('blog.Comment', post=post, author=user)
+    response = revalidate(client, url, response)
+    assert response.status_code == 200, (
+        'Убедитесь, что после добавления комментария страница отдаётся '
+        'заново.'
+    )
+    comment.delete()
+    response = revalidate(client, url, response)
+    assert response.status_code == 200, (
+        'Убедитесь, что после удаления комментария страница отдаётся '
+        'заново.'
+    )
+    chunked_update(Post.objects.all(), 10, is_published=True)
+    assert revalidate(client, url, response).status_code == 200, (
+        'Убедитесь, что массовое обновление постов меняет `ETag`.'
+    )
+
+
+@pytest.mark.django_db
+def test_etag_differs_per_user(client, user_client, post):
+    url = f'/posts/{post.pk}/'
+    response = client.get(url)
+    assert revalidate(user_client, url, response).status_code == 200, (
+        'Убедитесь, что `ETag` страницы зависит от пользователя.'
+    )
+
+
+@pytest.mark.django_db
+def test_unpublished_post_not_revalidated_by_others(
+        user_client, another_user_client, post, settings
+):
+    settings.HOLE_PUNCHING = True
+    post.is_published = False
+    post.save()
+    url = f'/posts/{post.pk}/'
+    response = user_client.get(url)
+    assert response.status_code == 200
+    for headers in ({'HTTP_IF_NONE_MATCH': response['ETag']},
+                    {'HTTP_IF_MODIFIED_SINCE': response['Last-Modified']}):
+        assert another_user_client.get(url, **headers).status_code == 404, (
+            'Убедитесь, что снятый с публикации пост не отдаётся другим '
+            'пользователям даже с валидаторами страницы автора.'
+        )
+
+
+@pytest.mark.django_db
+def test_updated_at_tracks_changes(post):
+    updated_at = post.updated_at
+    post.save()
+    assert post.updated_at > updated_at, (
+        'Убедитесь, что поле `updated_at` обновляется при сохранении.'
+    )
+    chunked_update(Post.objects.filter(pk=post.pk), 10, is_published=False)
+    post.refresh_from_db()
+    assert post.updated_at > updated_at, (
+        'Убедитесь, что массовое обновление заполняет `updated_at`.'
+    )
+
+
+@pytest.mark.django_db
+def test_scheduled_post_changes_validators(
+        client, user, published_category, post, mixer, monkeypatch
+):
+    pub_date = timezone.now() + timedelta(hours=1)
+    scheduled = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=pub_date, is_published=True, title='Отложенный пост',
+    )
+    response = client.get('/')
+    assert scheduled.title not in response.content.decode()
+    assert revalidate(client, '/', response).status_code == 304
+    later = pub_date + timedelta(minutes=1)
+    monkeypatch.setattr(timezone, 'now', lambda: later)
+    monkeypatch.setattr(models, 'now', lambda: later)
+    response = revalidate(client, '/', response)
+    assert response.status_code == 200, (
+        'Убедитесь, что после наступления даты публикации отложенного '
+        'поста страницы отдаются заново.'
+    )
+    assert scheduled.title in response.content.decode()
+    assert response['Last-Modified'] == http_date(pub_date.timestamp())
+    assert revalidate(client, '/', response).status_code == 304
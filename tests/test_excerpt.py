@@ -0,0 +1,56 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.template.defaultfilters import truncatewords
+
+from blog.models import Post
+from fixtures.queries import record_queries
+
+LONG_TEXT = ' '.join(f'слово{index}' for index in range(1, 31))
+
+
+@pytest.fixture
+def long_post(mixer, user, published_category):
+    return mixer.blend('blog.Post', author=user, text=LONG_TEXT,
+                       category=published_category,
+                       pub_date=user.date_joined)
+
+
+@pytest.mark.django_db
+def test_excerpt_computed_on_save(long_post):
+    assert long_post.excerpt == ' '.join(LONG_TEXT.split()[:10]) + ' …', (
+        'Убедитесь, что при сохранении поста заполняется начало текста.'
+    )
+    assert long_post.excerpt == truncatewords(LONG_TEXT, 10), (
+        'Убедитесь, что начало текста совпадает с выводом фильтра '
+        '`truncatewords`.'
+    )
+    assert long_post.word_count == 30
+    long_post.text = 'Короткий текст'
+    long_post.save(update_fields=['text'])
+    long_post.refresh_from_db()
+    assert (long_post.excerpt, long_post.word_count) == ('Короткий текст', 2)
+
+
+@pytest.mark.django_db
+def test_listings_do_not_load_text(client, long_post, published_category):
+    for url in ('/', f'/category/{published_category.slug}/',
+                f'/profile/{long_post.author.username}/'):
+        response, recorder = record_queries(client, url)
+        assert long_post.excerpt in response.content.decode()
+        assert not any('"blog_post"."text"' in query.sql
+                       for query in recorder.queries), (
+            f'Убедитесь, что страница {url} не загружает полный текст '
+            'постов.'
+        )
+
+
+@pytest.mark.django_db
+def test_backfill_excerpts(long_post):
+    Post.objects.update(excerpt='', word_count=0)
+    call_command('backfill_excerpts', '--batch-size', '1', stdout=StringIO())
+    long_post.refresh_from_db()
+    assert long_post.word_count == 30 and long_post.excerpt, (
+        'Убедитесь, что команда backfill_excerpts заполняет начало текста.'
+    )
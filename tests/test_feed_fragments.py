@@ -0,0 +1,97 @@
+import re
+
+import pytest
+from django.utils import timezone
+
+from blog.constants import PAGINATION_VALUE
+from blog.models import Post
+
+FEED_NEXT = re.compile(r'data-feed-next="([^"]+)"')
+POST_ID = re.compile(r'href="/posts/(\d+)/" class="card-link"')
+
+
+@pytest.fixture
+def posts(mixer, user, published_category, published_location):
+    # Часть постов с одинаковой датой: порядок среди них задаёт id.
+    now = timezone.now()
+    return mixer.cycle(PAGINATION_VALUE * 2 + 5).blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location, is_published=True,
+        pub_date=(now - timezone.timedelta(minutes=index // 3)
+                  for index in range(PAGINATION_VALUE * 2 + 5)),
+    )
+
+
+def scroll(client, url):
+    """Id постов страницы и всех фрагментов, загруженных прокруткой."""
+    content = client.get(url).content.decode()
+    shown = POST_ID.findall(content)
+    while FEED_NEXT.search(content):
+        response = client.get(
+            FEED_NEXT.search(content).group(1).replace('&amp;', '&'))
+        assert response.status_code == 200
+        content = response.content.decode()
+        assert '<html' not in content, (
+            'Убедитесь, что фрагмент ленты содержит только карточки постов '
+            'без шаблона страницы.'
+        )
+        assert ('X-Next-Cursor' in response) == bool(
+            FEED_NEXT.search(content)), (
+            'Убедитесь, что курсор следующего фрагмента ленты передаётся в '
+            'заголовке `X-Next-Cursor`.'
+        )
+        shown += POST_ID.findall(content)
+    return [int(pk) for pk in shown]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url', [
+    '/', '/category/{category}/', '/profile/{username}/',
+])
+def test_feed_scrolled_by_fragments(
+        client, user, published_category, posts, url
+):
+    url = url.format(category=published_category.slug,
+                     username=user.username)
+    expected = list(Post.objects.order_by('-pub_date', '-id')
+                    .values_list('pk', flat=True))
+    assert scroll(client, url) == expected, (
+        'Убедитесь, что прокрутка ленты по фрагментам выводит все посты '
+        'страницы по порядку без повторов и пропусков.'
+    )
+
+
+@pytest.mark.django_db
+def test_profile_feed_shows_unpublished_to_author(
+        user_client, client, user, posts
+):
+    Post.objects.filter(pk=posts[-1].pk).update(is_published=False)
+    url = f'/profile/{user.username}/'
+    assert posts[-1].pk in scroll(user_client, url), (
+        'Убедитесь, что автор видит свои снятые с публикации посты во '
+        'фрагментах ленты профиля.'
+    )
+    assert posts[-1].pk not in scroll(client, url), (
+        'Убедитесь, что другие пользователи не видят снятые с публикации '
+        'посты во фрагментах ленты профиля.'
+    )
+
+
+@pytest.mark.django_db
+def test_feed_fragment_cacheable(client, posts):
+    response = client.get('/feed/')
+    assert 'max-age' in response['Cache-Control'], (
+        'Убедитесь, что фрагменты ленты можно кешировать.'
+    )
+
+
+@pytest.mark.django_db
+def test_feed_fragment_invalid_cursor(client, posts):
+    assert client.get('/feed/?after=broken').status_code == 404, (
+        'Убедитесь, что для неверного курсора ленты возвращается '
+        'ошибка 404.'
+    )
+    assert client.get('/category/missing/feed/').status_code == 404, (
+        'Убедитесь, что фрагмент ленты несуществующей категории '
+        'возвращает ошибку 404.'
+    )
@@ -0,0 +1,53 @@
+import io
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def generate(**options):
+    call_command(
+        "generate_dataset", users=20, categories=3, locations=10,
+        posts=200, comments=1000, batch_size=150, workers=1, images=1,
+        stdout=io.StringIO(), **options
+    )
+
+
+@pytest.mark.django_db
+def test_generate_dataset(PostModel, CommentModel, media_root):
+    generate(future_share=0.5)
+    assert (media_root / "posts/dataset/0.jpg").exists()
+    assert PostModel.objects.count() == 200
+    assert CommentModel.objects.count() == 1000
+    assert PostModel.objects.exclude(
+        pk__in=PostModel.objects.pub_date()
+    ).exists(), "Убедитесь, что генерируются отложенные публикации."
+
+
+@pytest.mark.django_db
+def test_generate_dataset_changes_pages(client):
+    response = client.get("/")
+    generate()
+    assert client.get(
+        "/", HTTP_IF_NONE_MATCH=response["ETag"]
+    ).status_code == 200, (
+        "Убедитесь, что после генерации данных страницы отдаются заново."
+    )
+
+
+@pytest.mark.django_db
+def test_generate_dataset_is_deterministic(PostModel, CommentModel):
+    def snapshot():
+        return list(CommentModel.objects.order_by("pk").values_list(
+            "post__title", "text", "is_published"))
+
+    generate(seed=7)
+    first = snapshot()
+    PostModel.objects.all().delete()
+    generate(seed=7)
+    assert snapshot() == first
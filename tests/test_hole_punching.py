@@ -0,0 +1,74 @@
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture
+def hole_punching(settings):
+    settings.HOLE_PUNCHING = True
+    cache.clear()
+
+
+@pytest.fixture
+def comment(mixer, user, published_category, published_location):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location, pub_date=user.date_joined,
+        is_published=True,
+    )
+    return mixer.blend('blog.Comment', post=post, author=user)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url', [
+    '/', '/category/{category}/', '/posts/{post}/',
+])
+def test_shared_pages_same_for_everyone(
+        hole_punching, client, user_client, published_category, comment, url
+):
+    url = url.format(category=published_category.slug, post=comment.post_id)
+    anonymous = client.get(url)
+    author = user_client.get(url)
+    assert anonymous.content == author.content, (
+        f'Убедитесь, что в режиме HOLE_PUNCHING страница `{url}` '
+        'одинакова для всех пользователей.'
+    )
+    for response in (anonymous, author):
+        assert 'Cookie' not in response.get('Vary', ''), (
+            f'Убедитесь, что в режиме HOLE_PUNCHING страница `{url}` не '
+            'зависит от cookie.'
+        )
+        assert not response.cookies, (
+            f'Убедитесь, что в режиме HOLE_PUNCHING страница `{url}` не '
+            'устанавливает cookie.'
+        )
+    assert anonymous['ETag'] == author['ETag']
+
+
+@pytest.mark.django_db
+def test_holes_rendered_per_user(
+        hole_punching, client, user_client, user, comment
+):
+    content = client.get(f'/posts/{comment.post_id}/').content.decode()
+    keys = ['header-user', f'post-actions:{comment.post_id}',
+            f'comment-form:{comment.post_id}',
+            f'comment-actions:{comment.pk}']
+    for key in keys:
+        assert f'data-hole="{key}"' in content, (
+            f'Убедитесь, что на странице поста есть место для `{key}`.'
+        )
+    query = {'h': keys + ['unknown', 'comment-actions:0']}
+    author = user_client.get('/holes/', query).json()
+    anonymous = client.get('/holes/', query).json()
+    assert set(author) == set(anonymous) == set(keys), (
+        'Убедитесь, что неизвестные места пропускаются.'
+    )
+    assert user.username in author['header-user']
+    assert 'Войти' in anonymous['header-user']
+    assert f'/posts/{comment.post_id}/edit/' in author[keys[1]]
+    assert 'csrfmiddlewaretoken' in author[keys[2]]
+    assert (f'/posts/{comment.post_id}/edit_comment/{comment.pk}/'
+            in author[keys[3]])
+    assert not any(anonymous[key].strip() for key in keys[1:]), (
+        'Убедитесь, что анонимный пользователь не видит форму комментария '
+        'и ссылки редактирования.'
+    )
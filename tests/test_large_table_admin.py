@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+
+import pytest
+from django.core.cache import cache
+from django.core.cache.backends import locmem
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.models import Category, Post
+from core.admin import (BoundedRelatedFieldListFilter,
+                        EstimatedCountPaginator,
+                        indexed_dates_queryset_class)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+def count_queries(paginator):
+    with CaptureQueriesContext(connection) as queries:
+        count = paginator.count
+    return count, len(queries)
+
+
+@pytest.mark.django_db
+def test_estimated_count_is_cached(mixer: Mixer, user, monkeypatch):
+    mixer.cycle(3).blend("blog.Post", author=user)
+    queryset = Post.objects.order_by("pk")
+    assert count_queries(EstimatedCountPaginator(queryset, 10)) == (3, 1)
+    mixer.blend("blog.Post", author=user)
+    assert count_queries(EstimatedCountPaginator(queryset, 10)) == (3, 0), (
+        "Убедитесь, что число записей в списке админки кешируется."
+    )
+    now = locmem.time.time()
+    monkeypatch.setattr(
+        locmem.time, "time",
+        lambda: now + EstimatedCountPaginator.cache_timeout + 1)
+    assert count_queries(EstimatedCountPaginator(queryset, 10)) == (4, 1), (
+        "Убедитесь, что закешированное число записей устаревает через "
+        "`cache_timeout` секунд."
+    )
+
+
+@pytest.mark.django_db
+def test_estimated_count_of_large_table(mixer: Mixer, user, monkeypatch):
+    mixer.cycle(3).blend("blog.Post", author=user, is_published=True)
+    monkeypatch.setattr(EstimatedCountPaginator, "estimate",
+                        staticmethod(lambda queryset: 200_000))
+    paginator = EstimatedCountPaginator(Post.objects.order_by("pk"), 10)
+    assert paginator.count == 200_000, (
+        "Убедитесь, что для большой таблицы без фильтров используется "
+        "оценка числа строк."
+    )
+    paginator = EstimatedCountPaginator(
+        Post.objects.filter(is_published=True).order_by("pk"), 10)
+    assert paginator.count == 3, (
+        "Убедитесь, что для отфильтрованного списка число записей "
+        "считается точно."
+    )
+
+
+@pytest.mark.django_db
+def test_bounded_filter_choices(mixer: Mixer, client, monkeypatch):
+    monkeypatch.setattr(BoundedRelatedFieldListFilter, "choices_limit", 2)
+    mixer.cycle(4).blend("blog.Category")
+    admin_user = mixer.blend("auth.User", is_staff=True, is_superuser=True)
+    client.force_login(admin_user)
+    selected = Category.objects.last()
+    response = client.get("/admin/blog/post/",
+                          {"category__id__exact": selected.pk})
+    spec, = response.context["cl"].filter_specs
+    choices = [pk for pk, _ in spec.lookup_choices]
+    assert len(choices) == 3, (
+        "Убедитесь, что фильтр по категории показывает не больше "
+        "`choices_limit` вариантов и выбранную категорию."
+    )
+    assert selected.pk in choices
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("kind", ["year", "month", "day"])
+@pytest.mark.parametrize("order", ["ASC", "DESC"])
+def test_date_hierarchy_periods(mixer: Mixer, user, kind, order):
+    start = timezone.make_aware(datetime(2022, 12, 30, 23))
+    for days in (0, 1, 3, 40, 400):
+        mixer.blend("blog.Post", author=user,
+                    pub_date=start + timedelta(days=days))
+    queryset = Post.objects.all()
+    indexed = Post.objects.all()
+    indexed.__class__ = indexed_dates_queryset_class(type(queryset))
+    assert indexed.datetimes("pub_date", kind, order) == list(
+        queryset.datetimes("pub_date", kind, order)), (
+        "Убедитесь, что периоды `date_hierarchy` совпадают с "
+        "`QuerySet.datetimes()`, в том числе по порядку."
+    )
@@ -0,0 +1,74 @@
+import logging
+import os
+import tracemalloc
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+
+from core.memory import MAX_SITES, ViewMemory, stats
+
+
+@pytest.fixture
+def memory_stats():
+    stats.reset()
+    yield stats
+    stats.reset()
+    tracemalloc.stop()
+
+
+@pytest.mark.django_db
+def test_memory_profiling_off(client, memory_stats):
+    client.get('/')
+    assert not memory_stats.views, (
+        'Убедитесь, что без MEMORY_PROFILING память не измеряется.'
+    )
+
+
+@pytest.mark.django_db
+@override_settings(MEMORY_PROFILING=True)
+def test_memory_profiling_per_view(client, memory_stats):
+    client.get('/')
+    client.get('/')
+    client.get('/pages/about/')
+    index = memory_stats.views['blog:index']
+    assert index.requests == 2, (
+        'Убедитесь, что память агрегируется по имени URL.'
+    )
+    assert index.peak_max > 0 and index.sites
+    report = memory_stats.report(limit=1)
+    assert 'blog:index' in report or 'pages:about' in report
+    assert len([line for line in report.splitlines()
+                if not line.startswith(' ')]) == 2
+
+
+@pytest.mark.django_db
+def test_memory_report_command(memory_stats):
+    out = StringIO()
+    call_command('memory_report', '/pages/rules/', '--repeat', '1',
+                 stdout=out)
+    assert 'pages:rules' in out.getvalue()
+
+
+@pytest.mark.django_db
+@override_settings(MEMORY_PROFILING=True, MEMORY_REPORT_EVERY=2)
+def test_memory_report_logged_by_worker(client, memory_stats, caplog):
+    with caplog.at_level(logging.INFO, logger='core.middleware'):
+        client.get('/')
+        assert 'memory report' not in caplog.text
+        client.get('/')
+    assert f'memory report of worker {os.getpid()}' in caplog.text
+    assert 'blog:index' in caplog.text, (
+        'Убедитесь, что воркер периодически пишет отчёт о памяти в лог.'
+    )
+
+
+def test_memory_sites_are_capped():
+    view = ViewMemory()
+    for index in range(10 * MAX_SITES):
+        view.record(1, 1, {f'site {index}': index})
+    assert len(view.sites) <= 2 * MAX_SITES, (
+        'Убедитесь, что число хранимых мест выделения памяти ограничено.'
+    )
+    assert f'site {10 * MAX_SITES - 1}' in view.sites
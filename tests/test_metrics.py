@@ -0,0 +1,122 @@
+import re
+import threading
+
+import pytest
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from core import metrics
+from core.middleware import MetricsMiddleware
+
+
+@pytest.fixture
+def metrics_dir(tmp_path):
+    with override_settings(METRICS_DIR=tmp_path):
+        yield tmp_path
+
+
+def sample(content, name, **labels):
+    rendered = ','.join(f'{key}="{value}"' for key, value in labels.items())
+    pattern = re.escape(f'{name}{{{rendered}}}' if labels else name)
+    match = re.search(rf'^{pattern} (\S+)$', content, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint(client, settings, metrics_dir):
+    settings.METRICS_ALLOWED_IPS = ['127.0.0.1']
+    client.get('/')
+    client.get('/')
+    content = client.get('/metrics').content.decode()
+    assert sample(content, 'blogicum_http_requests_total', method='GET',
+                  status='200', view='blog:index') == 2, (
+        'Убедитесь, что `/metrics` считает запросы по имени URL.'
+    )
+    assert sample(content, 'blogicum_http_request_duration_seconds_bucket',
+                  view='blog:index', le='+Inf') == 2
+    assert sample(content, 'blogicum_db_queries_total', alias='default')
+    assert sample(content, 'blogicum_session_lookups_total') == 2
+    assert sample(content, 'blogicum_auth_lookups_total',
+                  result='anonymous') == 2
+
+
+def test_metrics_cache_hit_ratio(metrics_dir):
+    cache.set('cached', 1)
+
+    def view(request):
+        cache.get('cached')
+        cache.get('missing')
+        cache.get_many(['cached', 'missing', 'absent'])
+        return HttpResponse()
+
+    MetricsMiddleware(view)(RequestFactory().get('/'))
+    content = metrics.exposition()
+    assert sample(content, 'blogicum_cache_requests_total',
+                  alias='default', result='hit') == 2, (
+        'Убедитесь, что `/metrics` считает попадания в кеш.'
+    )
+    assert sample(content, 'blogicum_cache_requests_total',
+                  alias='default', result='miss') == 3, (
+        'Убедитесь, что `/metrics` считает промахи кеша.'
+    )
+
+
+def test_metrics_aggregated_across_processes(metrics_dir):
+    key = metrics.make_key('blogicum_db_queries_total', {'alias': 'default'})
+    for pid, amount in ((1, 2), (2, 3)):
+        values = metrics.ValuesFile(metrics_dir / f'metrics_{pid}.db')
+        values.inc(key, amount)
+        values.close()
+    metrics.DB_QUERIES.inc(alias='default')
+    content = metrics.exposition()
+    total = sample(content, 'blogicum_db_queries_total', alias='default')
+    assert total == 6, (
+        'Убедитесь, что значения всех процессов суммируются.'
+    )
+
+
+def test_metrics_written_per_thread(metrics_dir):
+    started = threading.Barrier(4)
+
+    def work():
+        started.wait()
+        for _ in range(1000):
+            metrics.DB_QUERIES.inc(alias='threads')
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    content = metrics.exposition()
+    assert sample(content, 'blogicum_db_queries_total',
+                  alias='threads') == 4000, (
+        'Убедитесь, что значения, записанные из разных потоков, не '
+        'теряются.'
+    )
+    assert len(list(metrics_dir.glob('metrics_*.db'))) > 1, (
+        'Убедитесь, что каждый поток пишет значения в свой файл.'
+    )
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_is_restricted(client, settings, metrics_dir):
+    assert client.get('/metrics').status_code == 403, (
+        'Убедитесь, что по умолчанию `/metrics` недоступен даже с '
+        'локального адреса прокси.'
+    )
+    remote = {'REMOTE_ADDR': '203.0.113.7'}
+    assert client.get('/metrics', **remote).status_code == 403, (
+        'Убедитесь, что `/metrics` недоступен с посторонних адресов.'
+    )
+    settings.METRICS_TOKEN = 'secret'
+    assert client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong',
+                      **remote).status_code == 403
+    assert client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret',
+                      **remote).status_code == 200, (
+        'Убедитесь, что `/metrics` доступен с токеном METRICS_TOKEN.'
+    )
+    settings.METRICS_ALLOWED_IPS = ['203.0.113.7']
+    settings.METRICS_TOKEN = ''
+    assert client.get('/metrics', **remote).status_code == 200
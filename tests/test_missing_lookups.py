@@ -0,0 +1,190 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.db import connection
+
+from blog import cache as blog_cache
+from blog.cache import (build_existence_filters, existence_filter,
+                        existence_filters, lookup_key)
+from blog.constants import LOOKUPS_CACHE
+from blog.models import Category, Post
+from core.admin import chunked_update
+from core.bloom import BloomFilter
+from core.signals import bulk_inserted
+from fixtures.queries import QueryRecorder, record_queries
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    caches[LOOKUPS_CACHE].clear()
+    existence_filters.clear()
+
+
+@pytest.fixture
+def post_factory(mixer, user, published_category, published_location):
+    def make_post(**kwargs):
+        return mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            location=published_location, pub_date=user.date_joined,
+            is_published=True, **kwargs,
+        )
+    return make_post
+
+
+def assert_missing_cached(client, url):
+    response, _ = record_queries(client, url)
+    assert response.status_code == 404
+    response, recorder = record_queries(client, url)
+    assert response.status_code == 404
+    assert not recorder.queries, (
+        f'Убедитесь, что повторный запрос отсутствующей страницы `{url}` '
+        'не обращается к базе данных.'
+    )
+
+
+@pytest.mark.django_db
+def test_missing_post_cached(
+        client, user, published_category, published_location, mixer
+):
+    assert_missing_cached(client, '/posts/777/')
+    mixer.blend(
+        'blog.Post', id=777, author=user, category=published_category,
+        location=published_location, pub_date=user.date_joined,
+        is_published=True,
+    )
+    assert client.get('/posts/777/').status_code == 200, (
+        'Убедитесь, что созданный пост доступен сразу после создания.'
+    )
+
+
+@pytest.mark.django_db
+def test_missing_category_cached(client, mixer):
+    assert_missing_cached(client, '/category/new-category/')
+    category = mixer.blend('blog.Category', slug='new-category',
+                           is_published=False)
+    assert client.get('/category/new-category/').status_code == 404
+    chunked_update(Category.objects.filter(pk=category.pk), 10,
+                   is_published=True)
+    assert client.get('/category/new-category/').status_code == 200, (
+        'Убедитесь, что опубликованная категория доступна сразу после '
+        'публикации.'
+    )
+
+
+@pytest.mark.django_db
+def test_missing_profile_cached(client):
+    assert_missing_cached(client, '/profile/newcomer/')
+    get_user_model().objects.create_user(username='newcomer')
+    assert client.get('/profile/newcomer/').status_code == 200, (
+        'Убедитесь, что профиль нового пользователя доступен сразу после '
+        'регистрации.'
+    )
+
+
+@pytest.mark.django_db
+def test_random_missing_values_not_looked_up(client, user, post_factory):
+    post = post_factory()
+    client.get('/posts/100500/')
+    for url in ('/posts/100501/', '/category/random/', '/profile/random/'):
+        client.get(url)
+    for url in ('/posts/100502/', '/category/other/', '/profile/other/'):
+        response, recorder = record_queries(client, url)
+        assert response.status_code == 404
+        assert not recorder.queries, (
+            f'Убедитесь, что запрос отсутствующей страницы `{url}` со '
+            'случайным адресом не обращается к базе данных.'
+        )
+    assert client.get(f'/posts/{post.pk}/').status_code == 200
+    assert not [key for key in cache._cache if ':lookup:' in key], (
+        'Убедитесь, что отсутствующие объекты запоминаются не в кеше '
+        'по умолчанию.'
+    )
+
+
+@pytest.mark.django_db
+def test_existence_filter_updated_from_log(
+        client, user, post_factory, django_capture_on_commit_callbacks,
+        monkeypatch
+):
+    assert client.get('/posts/777/').status_code == 404
+    monkeypatch.setattr(blog_cache, 'EXISTENCE_LOG_POLL_INTERVAL', 0)
+    with django_capture_on_commit_callbacks(execute=True):
+        post_factory(id=777)
+    # Запись о существовании истекла, другой воркер узнаёт о посте из лога.
+    caches[LOOKUPS_CACHE].delete(lookup_key(Post, 'pk', 777))
+    response, recorder = record_queries(client, '/posts/777/')
+    assert response.status_code == 200, (
+        'Убедитесь, что фильтр существующих объектов пополняется '
+        'сохранёнными значениями.'
+    )
+    assert 'blog_post"."id" FROM' not in ' '.join(
+        query.sql for query in recorder.queries), (
+        'Убедитесь, что фильтр пополняется без повторного чтения таблицы.'
+    )
+
+
+def test_bloom_filter():
+    bloom = BloomFilter(1000, 0.01)
+    for value in range(1000):
+        bloom.add(value)
+    assert all(value in bloom for value in range(1000)), (
+        'Убедитесь, что фильтр Блума находит все добавленные значения.'
+    )
+    errors = sum(value in bloom for value in range(1000, 11000))
+    assert errors < 300
+    assert not bloom.full
+
+
+@pytest.mark.django_db
+def test_existing_lookups_skip_cache(client, post_factory, monkeypatch):
+    post = post_factory()
+    build_existence_filters()
+    reads = []
+    lookups = caches[LOOKUPS_CACHE]
+    for method in ('get', 'get_many'):
+        monkeypatch.setattr(
+            lookups, method,
+            lambda *args, read=getattr(lookups, method), **kwargs:
+                reads.append(args) or read(*args, **kwargs))
+    for url in (f'/posts/{post.pk}/', f'/category/{post.category.slug}/',
+                f'/profile/{post.author.username}/'):
+        assert client.get(url).status_code == 200
+    assert not reads, (
+        'Убедитесь, что поиск существующих объектов не обращается к кешу '
+        'поиска.'
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_inserted_rows_found(client, user, post_factory, monkeypatch):
+    post = post_factory()
+    build_existence_filters()
+    monkeypatch.setattr(blog_cache, 'EXISTENCE_LOG_POLL_INTERVAL', 0)
+    monkeypatch.setattr(blog_cache, 'EXISTENCE_FILTER_REBUILD_INTERVAL', 0)
+    Post.objects.bulk_create([Post(
+        id=post.pk + 1, title='Пост', text='Текст', author=user,
+        category=post.category, location=post.location,
+        pub_date=post.pub_date,
+    )])
+    bulk_inserted.send(sender=Post)
+    assert client.get(f'/posts/{post.pk + 1}/').status_code == 200, (
+        'Убедитесь, что посты, созданные командами массовой загрузки, '
+        'доступны сразу после загрузки.'
+    )
+
+
+@pytest.mark.django_db
+def test_existence_filter_rebuild_throttled(post_factory, monkeypatch):
+    post = post_factory()
+    build_existence_filters()
+    monkeypatch.setattr(blog_cache, 'EXISTENCE_LOG_POLL_INTERVAL', 0)
+    bulk_inserted.send(sender=Post)
+    recorder = QueryRecorder()
+    with connection.execute_wrapper(recorder):
+        for pk in range(post.pk + 1, post.pk + 11):
+            assert pk not in existence_filter(Post, 'pk')
+    assert not recorder.queries, (
+        'Убедитесь, что фильтр существующих объектов строится заново не '
+        'чаще EXISTENCE_FILTER_REBUILD_INTERVAL.'
+    )
@@ -0,0 +1,127 @@
+import pytest
+from django.core.cache import cache, caches
+from django.test.signals import template_rendered
+
+from blogicum import settings_production
+from core.admin import chunked_update
+from core.checks import check_shared_caches
+
+
+@pytest.fixture
+def card_renders():
+    cache.clear()
+    rendered = []
+
+    def on_render(sender, template, context, **kwargs):
+        if template.name == 'includes/post_card.html':
+            rendered.append(context['post'].pk)
+
+    template_rendered.connect(on_render)
+    yield rendered
+    template_rendered.disconnect(on_render)
+
+
+@pytest.fixture
+def post(mixer, user, published_category, published_location):
+    return mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location, pub_date=user.date_joined,
+    )
+
+
+@pytest.mark.django_db
+def test_post_card_reused_across_pages(
+        client, user, post, published_category, card_renders
+):
+    client.get('/')
+    client.get('/')
+    client.get(f'/category/{published_category.slug}/')
+    client.get(f'/profile/{user.username}/')
+    assert card_renders == [post.pk], (
+        'Убедитесь, что карточка поста рендерится один раз и берётся из '
+        'кеша на главной, странице категории и профиле.'
+    )
+
+
+@pytest.mark.django_db
+def test_post_card_shared_by_viewers(
+        client, user_client, post, card_renders
+):
+    client.get('/')
+    user_client.get('/')
+    assert card_renders == [post.pk], (
+        'Убедитесь, что карточка поста одна для автора и читателей.'
+    )
+
+
+@pytest.mark.django_db
+def test_post_cards_read_in_two_batches(
+        client, mixer, user, published_category, card_renders, monkeypatch
+):
+    mixer.cycle(5).blend('blog.Post', author=user,
+                         category=published_category,
+                         pub_date=user.date_joined)
+    client.get('/')
+    backend = caches['default']
+    reads = []
+    nested = []
+    for method in ('get', 'get_many'):
+        original = getattr(backend, method)
+
+        def read(keys, *args, original=original, **kwargs):
+            # LocMemCache.get_many() читает ключи через get().
+            if not nested:
+                reads.append(keys)
+            nested.append(keys)
+            try:
+                return original(keys, *args, **kwargs)
+            finally:
+                nested.pop()
+
+        monkeypatch.setattr(backend, method, read)
+    client.get('/')
+    card_reads = [keys for keys in reads
+                  if 'post_card' in str(keys) or 'version:' in str(keys)]
+    assert len(card_reads) == 2, (
+        'Убедитесь, что версии и карточки всех постов страницы читаются '
+        'из кеша двумя запросами.'
+    )
+
+
+@pytest.mark.django_db
+def test_post_card_invalidated_by_signals(
+        client, post, published_category, published_location, card_renders
+):
+    client.get('/')
+    post.title = 'Новый заголовок'
+    post.save()
+    assert 'Новый заголовок' in client.get('/').content.decode()
+
+    published_location.name = 'Новое место'
+    published_location.save()
+    assert 'Новое место' in client.get('/').content.decode()
+
+    chunked_update(type(published_location).objects.all(), 100,
+                   is_published=False)
+    assert 'Новое место' not in client.get('/').content.decode(), (
+        'Убедитесь, что карточки сбрасываются при массовом обновлении.'
+    )
+
+    post.author.username = 'renamed_author'
+    post.author.save()
+    assert '@renamed_author' in client.get('/').content.decode()
+    assert len(card_renders) == 5
+
+
+def test_production_requires_shared_cache(settings):
+    settings.DEBUG = False
+    assert [error.id for error in check_shared_caches(None)] == [
+        'core.E001', 'core.E001'
+    ], (
+        'Убедитесь, что без DEBUG проверка запрещает кеш, локальный для '
+        'процесса.'
+    )
+    settings.CACHES = settings_production.CACHES
+    assert not check_shared_caches(None), (
+        'Убедитесь, что в production-настройках кеш общий для воркеров.'
+    )
@@ -0,0 +1,88 @@
+import pytest
+from django.core.management import call_command
+from django.http import HttpRequest
+
+from fixtures.queries import record_queries
+from pages.prerendered import REQUESTED_URL
+from pages.views import csrf_failure
+
+
+@pytest.fixture
+def prerendered(settings, tmp_path):
+    call_command('prerender_pages', '--output', str(tmp_path))
+    settings.PRERENDERED_DIR = tmp_path
+    settings.PRERENDERED_PAGES = True
+    return tmp_path
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url, name', [
+    ('/pages/about/', 'about.html'), ('/pages/rules/', 'rules.html'),
+])
+def test_static_pages_served_prerendered(
+        prerendered, user_client, url, name
+):
+    response, recorder = record_queries(user_client, url)
+    assert response.status_code == 200
+    assert response.content == (prerendered / name).read_bytes(), (
+        f'Убедитесь, что страница `{url}` отдаётся из заранее '
+        'сгенерированного файла.'
+    )
+    assert not response.templates, (
+        f'Убедитесь, что для страницы `{url}` не рендерятся шаблоны.'
+    )
+    assert not recorder.queries, (
+        f'Убедитесь, что страница `{url}` не обращается к базе данных.'
+    )
+    assert 'Cookie' not in response.get('Vary', ''), (
+        f'Убедитесь, что страница `{url}` не читает сессию.'
+    )
+    assert 'data-hole="header-user"' in response.content.decode(), (
+        'Убедитесь, что шапка страницы заполняется для пользователя '
+        'через holes.js.'
+    )
+
+
+@pytest.mark.django_db
+def test_error_pages_served_prerendered(prerendered, client):
+    response = client.get('/missing/?a=1&b=2')
+    content = response.content.decode()
+    assert response.status_code == 404
+    assert not response.templates
+    assert REQUESTED_URL not in content
+    assert 'http://testserver/missing/?a=1&amp;b=2' in content, (
+        'Убедитесь, что на заранее сгенерированной странице 404 выводится '
+        'запрошенный адрес.'
+    )
+    response = csrf_failure(HttpRequest())
+    assert response.status_code == 403
+    assert response.content == (prerendered / '403csrf.html').read_bytes()
+
+
+@pytest.mark.django_db
+def test_missing_prerendered_page_rendered(settings, tmp_path, client):
+    settings.PRERENDERED_DIR = tmp_path
+    settings.PRERENDERED_PAGES = True
+    response = client.get('/pages/about/')
+    assert response.status_code == 200
+    assert 'pages/about.html' in [t.name for t in response.templates], (
+        'Убедитесь, что без сгенерированного файла страница рендерится '
+        'из шаблона.'
+    )
+
+
+@pytest.mark.django_db
+def test_rebuilt_prerendered_page_reloaded(settings, tmp_path, client):
+    settings.PRERENDERED_DIR = tmp_path
+    settings.PRERENDERED_PAGES = True
+    assert client.get('/pages/rules/').templates
+    call_command('prerender_pages', '--output', str(tmp_path))
+    response = client.get('/pages/rules/')
+    assert not response.templates, (
+        'Убедитесь, что страница отдаётся из файла сразу после его '
+        'генерации, без перезапуска.'
+    )
+    (tmp_path / 'rules.html').write_text('Новые правила')
+    assert client.get('/pages/rules/').content.decode() == (
+        'Новые правила'
+    ), 'Убедитесь, что изменённый файл страницы читается заново.'
@@ -0,0 +1,43 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+
+
+@pytest.fixture
+def profiles_dir(tmp_path):
+    with override_settings(PROFILES_DIR=tmp_path):
+        yield tmp_path
+
+
+@pytest.mark.django_db
+def test_profiling_staff_only(user, user_client, client, profiles_dir):
+    response = user_client.get('/', HTTP_X_PROFILE='1')
+    assert 'X-Profile-Id' not in response, (
+        'Убедитесь, что профилировать запросы могут только сотрудники.'
+    )
+    assert 'X-Profile-Id' not in client.get('/?_profile=1')
+    assert not list(profiles_dir.iterdir())
+
+
+@pytest.mark.django_db
+def test_profiling_stores_and_diffs(user, user_client, profiles_dir):
+    user.is_staff = True
+    user.save()
+    first = user_client.get('/', HTTP_X_PROFILE='1')['X-Profile-Id']
+    second = user_client.get('/?_profile=1')['X-Profile-Id']
+    assert (profiles_dir / f'{first}.prof').exists(), (
+        'Убедитесь, что профиль запроса сохраняется в PROFILES_DIR.'
+    )
+    assert 'X-Profile-Id' not in user_client.get('/')
+
+    out = StringIO()
+    call_command('profiles', stdout=out)
+    assert first in out.getvalue() and second in out.getvalue()
+    assert 'blog:index' in out.getvalue()
+
+    out = StringIO()
+    call_command('profiles', 'diff', first, second, '--limit', '3',
+                 stdout=out)
+    assert len(out.getvalue().splitlines()) == 4
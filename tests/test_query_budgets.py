@@ -0,0 +1,144 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client
+from django.urls import reverse
+
+from blog.cache import build_existence_filters
+from blog.models import Category, Comment, Location, Post
+
+SMALL_DATASET = 10
+LARGE_DATASET = 1000
+
+# Максимальное число SQL-запросов на страницу; оно не должно зависеть
+# от количества записей в базе.
+QUERY_BUDGETS = {
+    # Первый запрос после очистки кеша читает MAX(updated_at) таблиц.
+    'blog:index': 6,
+    'blog:index_feed': 4,
+    'blog:category_posts': 6,
+    'blog:category_feed': 5,
+    'blog:profile': 7,
+    'blog:profile_feed': 6,
+    'blog:post_detail': 9,
+    'blog:post_comments': 6,
+    'blog:create_post': 2,
+    'blog:edit_post': 7,
+    'blog:delete_post': 5,
+    'blog:edit_comment': 3,
+    'blog:delete_comment': 5,
+    'blog:edit_profile': 4,
+    'pages:about': 2,
+    'pages:rules': 2,
+    'admin:blog_post_changelist': 10,
+    'admin:blog_comment_changelist': 8,
+    'admin:blog_category_changelist': 5,
+    'admin:blog_location_changelist': 5,
+    'admin:auth_user_changelist': 6,
+}
+# Суммарное время SQL-запросов одной страницы на большом наборе данных.
+QUERY_TIME_BUDGET_MS = 250
+
+
+@pytest.fixture
+def author():
+    return get_user_model().objects.create_superuser(
+        username='budget_author', email='budget@example.com',
+        password='password',
+    )
+
+
+@pytest.fixture
+def author_client(author):
+    client = Client()
+    client.force_login(author)
+    return client
+
+
+@pytest.fixture
+def grow_dataset(author):
+    """Дополняет базу до `size` пользователей, постов автора и чужих
+    постов с комментариями."""
+    category = Category.objects.create(
+        title='Категория', description='Описание', slug='budget',
+    )
+    location = Location.objects.create(name='Место')
+    User = get_user_model()
+
+    def grow(size):
+        start = User.objects.count() - 1
+        usernames = [f'budget_user_{index}' for index in range(start, size)]
+        User.objects.bulk_create(
+            User(username=username) for username in usernames
+        )
+        users = list(User.objects.filter(username__in=usernames))
+        Post.objects.bulk_create(
+            Post(
+                title=f'Пост {index}', text='Текст',
+                pub_date=author.date_joined,
+                author=post_author, category=category, location=location,
+            )
+            for index, post_author in enumerate(
+                users + [author] * len(users)
+            )
+        )
+        posts = Post.objects.order_by('-pk')[:len(users) * 2][::-1]
+        Comment.objects.bulk_create(
+            Comment(text='Комментарий', post=post, author=commentator)
+            for post, commentator in zip(
+                posts, [author] * len(users) + users
+            )
+        )
+        # Точное число строк в админке кешируется, сбрасываем его.
+        cache.clear()
+        # Воркер строит фильтры существующих объектов при запуске.
+        build_existence_filters()
+        return Post.objects.filter(author=author).earliest('pk')
+
+    return grow
+
+
+def budget_urls(post, author):
+    comment = Comment.objects.filter(author=author).earliest('pk')
+    post_kwargs = {'post_id': post.pk}
+    comment_kwargs = {'post_id': comment.post_id, 'comment_id': comment.pk}
+    kwargs = {
+        'blog:category_posts': {'category_slug': post.category.slug},
+        'blog:category_feed': {'category_slug': post.category.slug},
+        'blog:profile': {'username': author.username},
+        'blog:profile_feed': {'username': author.username},
+        'blog:post_detail': post_kwargs,
+        'blog:post_comments': post_kwargs,
+        'blog:edit_post': post_kwargs,
+        'blog:delete_post': post_kwargs,
+        'blog:edit_comment': comment_kwargs,
+        'blog:delete_comment': comment_kwargs,
+        'blog:edit_profile': {'username': author.username},
+    }
+    return {
+        name: reverse(name, kwargs=kwargs.get(name))
+        for name in QUERY_BUDGETS
+    }
+
+
+@pytest.mark.django_db
+def test_query_budgets(
+        author, author_client, grow_dataset, assert_query_budget
+):
+    post = grow_dataset(SMALL_DATASET)
+    small_counts = {
+        name: len(assert_query_budget(
+            author_client, url, QUERY_BUDGETS[name]).queries)
+        for name, url in budget_urls(post, author).items()
+    }
+    grow_dataset(LARGE_DATASET)
+    for name, url in budget_urls(post, author).items():
+        recorder = assert_query_budget(
+            author_client, url, QUERY_BUDGETS[name], QUERY_TIME_BUDGET_MS
+        )
+        assert len(recorder.queries) == small_counts[name], (
+            f'Число SQL-запросов страницы `{name}` растёт вместе с'
+            f' количеством записей: {small_counts[name]} при'
+            f' {SMALL_DATASET} и {len(recorder.queries)} при'
+            f' {LARGE_DATASET} записях.'
+        )
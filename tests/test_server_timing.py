@@ -0,0 +1,34 @@
+import logging
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+
+@pytest.mark.django_db
+@override_settings(SERVER_TIMING_SAMPLE_RATE=1)
+def test_server_timing_header(client, caplog):
+    with caplog.at_level(logging.INFO, logger='core.middleware'):
+        response = client.get('/')
+    header = response.get('Server-Timing', '')
+    for metric in ('app;dur=', 'db;dur=', 'tpl;dur=', 'cache;dur=',
+                   'total;dur='):
+        assert metric in header, (
+            f'Убедитесь, что заголовок `Server-Timing` содержит `{metric}`.'
+        )
+    assert any(
+        'view=blog:index' in message and 'queries=' in message
+        for message in caplog.messages
+    ), 'Убедитесь, что для каждого запроса в журнал пишется строка.'
+    assert 'get' not in vars(cache), (
+        'Убедитесь, что после запроса методы кеша восстанавливаются.'
+    )
+
+
+@pytest.mark.django_db
+@override_settings(SERVER_TIMING_SAMPLE_RATE=0)
+def test_server_timing_sampling(client):
+    response = client.get('/')
+    assert 'Server-Timing' not in response, (
+        'Убедитесь, что запросы вне выборки не замеряются.'
+    )
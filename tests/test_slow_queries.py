@@ -0,0 +1,45 @@
+import logging
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+
+
+@pytest.fixture
+def slow_query_log(tmp_path):
+    path = tmp_path / 'slow_queries.log'
+    handler = logging.FileHandler(path, encoding='utf-8')
+    logger = logging.getLogger('core.slow_queries')
+    logger.addHandler(handler)
+    try:
+        yield path
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+
+@pytest.mark.django_db
+@override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+def test_slow_query_log(
+        mixer, user, client, published_category, slow_query_log
+):
+    mixer.blend('blog.Post', author=user, category=published_category,
+                pub_date=user.date_joined)
+    client.get('/pages/about/')
+    assert not slow_query_log.read_text(), (
+        'Убедитесь, что запросы страниц вне SLOW_QUERY_NAMESPACES '
+        'не попадают в журнал медленных запросов.'
+    )
+    client.get(f'/category/{published_category.slug}/')
+    out = StringIO()
+    call_command('slow_queries', '--log', slow_query_log, '--limit', '50',
+                 stdout=out)
+    report = out.getvalue()
+    assert 'blog:category_posts' in report
+    assert 'template: includes/post_feed.html:' in report, (
+        'Убедитесь, что в журнале указана строка шаблона.'
+    )
+    assert 'plan: SEARCH blog_category' in report, (
+        'Убедитесь, что для медленных запросов сохраняется план.'
+    )
@@ -0,0 +1,82 @@
+import json
+import os
+import subprocess
+import sys
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+from core.warmup import populate_resolvers, preload_templates
+
+# Время и число модулей, за которые воркер должен загрузить приложение.
+STARTUP_BUDGET_SECONDS = 2.0
+STARTUP_MODULES_BUDGET = 620
+# Прогрев (WARMUP_ON_BOOT) импортирует все URLconf, включая админку, и
+# библиотеки тегов шаблонов, которые иначе загрузил бы первый запрос, а
+# построение фильтров существующих объектов - клиент Memcached.
+WARM_STARTUP_MODULES_BUDGET = 700
+
+BOOT_CODE = '''
+import json, sys, time
+start = time.perf_counter()
+from django.conf import settings
+settings.WARMUP_ON_BOOT = {warm_up}
+from blogicum.wsgi import application
+print(json.dumps({{
+    'seconds': time.perf_counter() - start,
+    'modules': len(sys.modules),
+    'dev_modules': [name for name in ('debug_toolbar', 'django.test')
+                    if name in sys.modules],
+}}))
+'''
+
+
+def boot(settings_module, warm_up):
+    result = subprocess.run(
+        [sys.executable, '-c', BOOT_CODE.format(warm_up=warm_up)],
+        cwd=Path(settings.BASE_DIR),
+        env={**os.environ, 'DJANGO_SETTINGS_MODULE': settings_module},
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout)
+
+
+@pytest.mark.parametrize('warm_up, modules_budget', [
+    (False, STARTUP_MODULES_BUDGET), (True, WARM_STARTUP_MODULES_BUDGET),
+])
+def test_production_startup_budget(warm_up, modules_budget):
+    startup = boot('blogicum.settings_production', warm_up)
+    assert startup['seconds'] < STARTUP_BUDGET_SECONDS, (
+        f'Приложение загружается {startup["seconds"]:.2f} с, бюджет - '
+        f'{STARTUP_BUDGET_SECONDS} с.'
+    )
+    assert startup['modules'] <= modules_budget, (
+        f'При загрузке приложения импортируется {startup["modules"]} '
+        f'модулей, бюджет - {modules_budget}. Проверьте вывод '
+        '`manage.py importtime`.'
+    )
+    assert not startup['dev_modules'], (
+        'Убедитесь, что в production-настройках не загружаются модули '
+        f'для разработки: {startup["dev_modules"]}.'
+    )
+
+
+def test_importtime_command():
+    out = StringIO()
+    call_command('importtime', '--min-ms', '1', '--depth', '1', stdout=out)
+    lines = out.getvalue().splitlines()
+    assert 'modules imported in' in lines[0]
+    assert any(line.strip().endswith('blogicum.wsgi') for line in lines), (
+        'Убедитесь, что команда importtime выводит дерево импортов.'
+    )
+
+
+def test_warm_up_compiles_project_templates():
+    templates = list((Path(settings.BASE_DIR) / 'templates').rglob('*.html'))
+    assert preload_templates() >= len(templates), (
+        'Убедитесь, что прогрев компилирует все шаблоны проекта.'
+    )
+    assert populate_resolvers() > 1
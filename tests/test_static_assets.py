@@ -0,0 +1,94 @@
+import gzip
+import json
+
+import brotli
+import pytest
+from django.core.management import CommandError, call_command
+from django.test import RequestFactory, override_settings
+
+from core.views import static_file
+
+BOOTSTRAP = 'vendor/bootstrap/css/bootstrap.min.css'
+STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+IMAGES = ('img/logo.png', 'img/fav/favicon.ico',
+          'img/fav/apple-touch-icon.png', 'img/fav/favicon-32x32.png',
+          'img/fav/favicon-16x16.png')
+
+
+@pytest.fixture(scope='module')
+def collected(tmp_path_factory):
+    """Файлы, собранные collectstatic один раз на модуль: сжатие всех
+    файлов админки занимает несколько секунд."""
+    sources = tmp_path_factory.mktemp('sources')
+    root = tmp_path_factory.mktemp('static')
+    for name in IMAGES:
+        (sources / name).parent.mkdir(parents=True, exist_ok=True)
+        (sources / name).write_bytes(b'\x89PNG' + name.encode() * 100)
+    with override_settings(STATICFILES_DIRS=[sources], STATIC_ROOT=root,
+                           STATICFILES_STORAGE=STORAGE):
+        call_command('collectstatic', interactive=False, verbosity=0)
+        manifest = json.loads((root / 'staticfiles.json').read_text())
+        yield root, manifest['paths']
+
+
+@pytest.mark.django_db
+def test_bootstrap_is_self_hosted(client):
+    content = client.get('/').content.decode()
+    assert f'/static/{BOOTSTRAP}' in content
+    assert 'cdn.jsdelivr.net' not in content, (
+        'Убедитесь, что Bootstrap подключается с сайта, а не с CDN.'
+    )
+
+
+def test_collectstatic_precompresses_hashed_files(collected):
+    root, paths = collected
+    hashed = paths[BOOTSTRAP]
+    assert hashed != BOOTSTRAP, (
+        'Убедитесь, что имена собранных статических файлов содержат хеш.'
+    )
+    original = (root / hashed).read_bytes()
+    assert gzip.decompress((root / f'{hashed}.gz').read_bytes()) == original
+    assert brotli.decompress((root / f'{hashed}.br').read_bytes()) == (
+        original
+    ), 'Убедитесь, что для текстовых файлов собираются сжатые версии.'
+    assert not (root / f'{paths["img/logo.png"]}.gz').exists(), (
+        'Убедитесь, что изображения не сжимаются повторно.'
+    )
+
+
+@pytest.mark.parametrize('accept, encoding', [
+    ('gzip, deflate, br', 'br'), ('gzip', 'gzip'), ('', None),
+    ('gzip, br;q=0', 'gzip'), ('br;q=0, gzip;q=0', None),
+    ('br;q=0.5, gzip', 'gzip'), ('*', 'br'), ('*, br;q=0', 'gzip'),
+    ('GZIP;Q=1', 'gzip'), ('gzip;q=broken, br;q=0', None),
+])
+def test_static_file_serves_precompressed(collected, accept, encoding):
+    root, paths = collected
+    request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept)
+    response = static_file(request, paths[BOOTSTRAP])
+    assert response['Content-Type'] == 'text/css'
+    assert response.get('Content-Encoding') == encoding
+    assert 'Accept-Encoding' in response['Vary']
+    assert 'immutable' in response['Cache-Control'], (
+        'Убедитесь, что файлы с хешем в имени кешируются навсегда.'
+    )
+    response = static_file(request, BOOTSTRAP)
+    assert 'immutable' not in response['Cache-Control'], (
+        'Убедитесь, что файлы без хеша в имени не кешируются навсегда.'
+    )
+
+
+def test_prerender_links_hashed_static(collected, tmp_path):
+    call_command('prerender_pages', '--output', str(tmp_path / 'pages'))
+    content = (tmp_path / 'pages' / 'about.html').read_text()
+    assert f'/static/{collected[1][BOOTSTRAP]}' in content, (
+        'Убедитесь, что заранее сгенерированные страницы ссылаются на '
+        'статические файлы с хешем в имени.'
+    )
+
+
+def test_prerender_requires_collected_static(settings, tmp_path):
+    settings.STATIC_ROOT = tmp_path / 'static'
+    settings.STATICFILES_STORAGE = STORAGE
+    with pytest.raises(CommandError):
+        call_command('prerender_pages', '--output', str(tmp_path / 'pages'))
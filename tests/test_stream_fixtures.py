@@ -0,0 +1,97 @@
+import io
+import json
+
+import pytest
+from django.core import serializers
+from django.core.management import CommandError, call_command
+from mixer.backend.django import Mixer
+
+from core.management.commands.stream_loaddata import iter_json_array
+
+
+def test_iter_json_array_small_reads():
+    data = [{"pk": i, "fields": {"text": "[, ] {}" * i}} for i in range(20)]
+    stream = io.StringIO(json.dumps(data, indent=2))
+    assert list(iter_json_array(stream, read_size=7)) == data
+
+
+def test_iter_json_array_malformed():
+    class Stream(io.StringIO):
+        def read(self, size):
+            self.reads = getattr(self, 'reads', 0) + 1
+            return super().read(size)
+
+    stream = Stream('[{"pk": 1}, {"pk": 2,, ' + ' ' * 10_000 + '}]')
+    with pytest.raises(CommandError):
+        list(iter_json_array(stream, read_size=10, max_item_size=100))
+    assert stream.reads < 20, (
+        'Убедитесь, что повреждённая фикстура не читается целиком в '
+        'память до ошибки.'
+    )
+
+
+@pytest.mark.django_db
+def test_stream_dump_and_load_roundtrip(mixer: Mixer, user, tmp_path):
+    posts = mixer.cycle(5).blend("blog.Post", author=user)
+    PostModel = type(posts[0])
+    fixture = tmp_path / "posts.json"
+    call_command(
+        "stream_dumpdata", "blog.Post", "blog.Category", "blog.Location",
+        "auth.User", output=str(fixture), indent=2, batch_size=2,
+    )
+    dumped = json.loads(fixture.read_text(encoding="utf-8"))
+    assert len([obj for obj in dumped if obj["model"] == "blog.post"]) == 5
+
+    def in_millis(value):
+        return value.replace(microsecond=value.microsecond // 1000 * 1000)
+
+    expected = {post.pk: in_millis(post.created_at) for post in posts}
+    PostModel.objects.all().delete()
+    call_command("stream_loaddata", str(fixture), batch_size=2,
+                 stdout=io.StringIO())
+    assert {
+        post.pk: in_millis(post.created_at)
+        for post in PostModel.objects.all()
+    } == expected, (
+        "Убедитесь, что stream_loaddata сохраняет значения полей"
+        " с auto_now_add из фикстуры."
+    )
+
+
+@pytest.mark.django_db
+def test_stream_dump_to_stdout(mixer: Mixer, user):
+    mixer.cycle(2).blend("blog.Post", author=user)
+    out = io.StringIO()
+    call_command("stream_dumpdata", "blog.Post", stdout=out)
+    assert len(json.loads(out.getvalue())) == 2, (
+        "Убедитесь, что stream_dumpdata пишет в stdout команды."
+    )
+
+
+@pytest.mark.django_db
+def test_stream_load_changes_pages(
+        mixer: Mixer, user, client, published_category, tmp_path
+):
+    post = mixer.blend("blog.Post", author=user, category=published_category,
+                       pub_date=user.date_joined, is_published=True)
+    response = client.get("/")
+    post.title = "Загруженный заголовок"
+    fixture = tmp_path / "posts.json"
+    fixture.write_text(serializers.serialize("json", [post]))
+    call_command("stream_loaddata", str(fixture), stdout=io.StringIO())
+    revalidated = client.get("/", HTTP_IF_NONE_MATCH=response["ETag"])
+    assert revalidated.status_code == 200, (
+        "Убедитесь, что после stream_loaddata страницы отдаются заново."
+    )
+    assert "Загруженный заголовок" in revalidated.content.decode(), (
+        "Убедитесь, что stream_loaddata сбрасывает карточки изменённых "
+        "постов."
+    )
+    response = revalidated
+    post.pk += 100
+    fixture.write_text(serializers.serialize("json", [post]))
+    call_command("stream_loaddata", str(fixture), stdout=io.StringIO())
+    assert client.get(
+        "/", HTTP_IF_NONE_MATCH=response["ETag"]).status_code == 200, (
+        "Убедитесь, что добавленные stream_loaddata посты меняют ETag."
+    )